@@ -0,0 +1,130 @@
+# =======================================================================================
+# Deskripsi: API parsing batch (banyak kalimat sekaligus) dengan multiprocessing,
+#            untuk memvalidasi korpus besar memakai seluruh core CPU
+# =======================================================================================
+
+import os
+import multiprocessing
+from itertools import islice
+
+from cyk_parser import compile_grammar
+from grammar_loader import GrammarReloader
+from parser_backends import get_backend
+
+# Backend parser milik proses worker. Diisi SEKALI oleh initializer pool,
+# sehingga grammar tidak ikut dikirim ulang bersama setiap tugas (task).
+_worker_backend = None
+_worker_with_tree = False
+
+
+def _init_worker(grammar, with_tree, backend="cyk", fuzzy=False):
+    """
+    Initializer pool: menyimpan backend parser (beserta grammar terkompilasinya)
+    di proses worker. 'grammar' boleh berupa path artefak grammar, sehingga
+    setiap worker cukup memetakan file artefak alih-alih menerima grammar lewat pickle.
+    """
+    global _worker_backend, _worker_with_tree
+    _worker_backend = get_backend(backend, compile_grammar(grammar), fuzzy=fuzzy)
+    _worker_with_tree = with_tree
+
+
+def _parse_one(sentence, backend, with_tree):
+    """Mem-parse satu kalimat dan mengemasnya sebagai ParseResult."""
+    # Backend CYK default memakai engine sparse: kalimat tidak valid (umum di
+    # korpus mentah) ditolak lebih cepat
+    return backend.parse_sentence(sentence, with_tree=with_tree)
+
+
+def _worker_task(sentence):
+    """Fungsi tugas di proses worker (memakai backend dari initializer)."""
+    return _parse_one(sentence, _worker_backend, _worker_with_tree)
+
+
+def parse_many(sentences, grammar, workers=None, chunksize=64, with_tree=False, backend="cyk",
+               fuzzy=False):
+    """
+    Mem-parse banyak kalimat dan menghasilkan ParseResult satu per satu
+    (generator), dengan urutan yang SAMA seperti urutan input.
+
+    Args:
+        sentences (iterable): Kalimat-kalimat input (list, file, generator, ...).
+        grammar (dict | CompiledGrammar | str | GrammarReloader): Aturan tata bahasa,
+                  path artefak hasil 'compile-grammar' / direktori grammar (dimuat
+                  sendiri oleh tiap worker), atau GrammarReloader agar grammar
+                  yang diperbarui langsung dipakai tanpa menghentikan batch.
+        workers (int | None): Jumlah proses worker. None = jumlah core CPU.
+                              1 = dijalankan langsung di proses ini (tanpa pool).
+        chunksize (int): Jumlah kalimat per paket yang dikirim ke worker.
+        with_tree (bool): Jika True, pohon parse ikut dihitung untuk kalimat valid.
+        backend (str): Backend parser, "cyk" atau "earley" (lihat parser_backends).
+                       Hasil penerimaan dan pohon parse sama; pilih yang tercepat
+                       untuk korpus yang diproses.
+        fuzzy (bool): Token tak dikenal (salah ketik/OCR) diisi kategori kata
+                      lexicon terdekat (lihat CompiledGrammar.recover_word()).
+
+    Input dibaca secara bertahap per jendela (window) berukuran terbatas,
+    sehingga korpus yang jauh lebih besar dari memori tetap bisa diproses.
+
+    Yields:
+        ParseResult: (sentence, tokens, is_accepted, tree, elapsed_us, unknown_tokens)
+                     untuk setiap kalimat.
+    """
+    # GrammarReloader: grammar bisa diganti saat batch berjalan (hot reload)
+    reloader = grammar if isinstance(grammar, GrammarReloader) else None
+    compiled = reloader.grammar if reloader is not None else compile_grammar(grammar)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Mode satu proses: tidak perlu overhead pool sama sekali
+    if workers <= 1:
+        parser = get_backend(backend, compiled, fuzzy=fuzzy)
+        for sentence in sentences:
+            if reloader is not None and reloader.grammar is not parser.compiled:
+                parser = get_backend(backend, reloader.grammar, fuzzy=fuzzy)
+            yield _parse_one(sentence, parser, with_tree)
+        return
+
+    # Pool.imap() menghabiskan iterator input secepat mungkin, jadi input
+    # diberikan per jendela. Jendela berikutnya sudah dikirim ke pool selagi
+    # hasil jendela sekarang dialirkan, sehingga worker tidak menganggur dan
+    # paling banyak dua jendela berada di memori.
+    window = chunksize * workers * 4
+    sentences = iter(sentences)
+
+    # Grammar dikirim ke setiap worker sekali lewat initializer, bukan per tugas.
+    # imap() mengalirkan hasil kembali sesuai urutan input tanpa menunggu
+    # seluruh korpus selesai.
+    initarg = grammar if isinstance(grammar, (str, os.PathLike)) else compiled
+    pool = _start_pool(workers, initarg, with_tree, backend, fuzzy)
+    try:
+        batch = list(islice(sentences, window))
+        pending = pool.imap(_worker_task, batch, chunksize=chunksize) if batch else None
+        while pending is not None:
+            if reloader is not None and reloader.grammar is not compiled:
+                # Grammar berubah: jendela yang sedang berjalan diselesaikan dengan
+                # grammar lama, lalu pool diganti dengan worker ber-grammar baru.
+                for result in pending:
+                    yield result
+                pool.close()
+                pool.join()
+                compiled = reloader.grammar
+                pool = _start_pool(workers, compiled, with_tree, backend, fuzzy)
+                batch = list(islice(sentences, window))
+                pending = pool.imap(_worker_task, batch, chunksize=chunksize) if batch else None
+                continue
+            batch = list(islice(sentences, window))
+            next_pending = pool.imap(_worker_task, batch, chunksize=chunksize) if batch else None
+            for result in pending:
+                yield result
+            pending = next_pending
+    finally:
+        pool.terminate()
+
+
+def _start_pool(workers, grammar, with_tree, backend="cyk", fuzzy=False):
+    """Membuat pool worker yang masing-masing memegang 'grammar' dan backend parsernya."""
+    return multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(grammar, with_tree, backend, fuzzy),
+    )
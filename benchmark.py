@@ -0,0 +1,330 @@
+# =======================================================================================
+# Deskripsi: Benchmark performa parser CYK (latensi & throughput) terhadap panjang
+#            kalimat, memakai kalimat sintetis yang dibangkitkan dari grammar
+# =======================================================================================
+
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+
+from cyk_parser import (
+    get_bali_grammar, compile_grammar, fill_cyk_table, fill_bitset_chart,
+    fill_sparse_chart, get_parse_tree_structure,
+)
+from parser_backends import EarleyBackend
+from parse_profiler import ParseProfiler, summarize
+
+# Backend Earley per grammar (tabel prediksinya cukup dibangun sekali)
+_earley_backends = {}
+
+
+def _earley_recognize(tokens, compiled, leo=True):
+    key = (compiled.fingerprint, leo)
+    backend = _earley_backends.get(key)
+    if backend is None:
+        backend = _earley_backends[key] = EarleyBackend(compiled, leo=leo)
+    return backend.recognize(tokens, with_tree=True)
+
+# Engine pengisian tabel yang bisa diukur (engine CYK menerima argumen observer=)
+ENGINES = {
+    "set": lambda tokens, compiled, **options: fill_cyk_table(tokens, compiled, **options),
+    "bitset": lambda tokens, compiled, **options: fill_bitset_chart(tokens, compiled, **options),
+    "bitset-bp": lambda tokens, compiled, **options: fill_bitset_chart(tokens, compiled, backpointers=True,
+                                                                       **options),
+    "sparse": lambda tokens, compiled, **options: fill_sparse_chart(tokens, compiled, backpointers=True,
+                                                                    **options),
+    "sparse-prune": lambda tokens, compiled, **options: fill_sparse_chart(tokens, compiled, backpointers=True,
+                                                                          prune=True, **options),
+    "earley": lambda tokens, compiled: _earley_recognize(tokens, compiled),
+    "earley-noleo": lambda tokens, compiled: _earley_recognize(tokens, compiled, leo=False),
+}
+# Engine yang mendukung instrumentasi ParseProfiler (--profile)
+PROFILED_ENGINES = ("set", "bitset", "bitset-bp", "sparse", "sparse-prune")
+
+
+class SentenceGenerator:
+    """
+    Pembangkit kalimat sintetis dengan panjang (jumlah token) yang PASTI,
+    diturunkan dari simbol awal grammar.
+
+    Pertama dihitung tabel possible[simbol][panjang] (bisakah simbol menurunkan
+    tepat 'panjang' token), lalu derivasi dipilih acak hanya di antara aturan
+    dan titik potong yang memungkinkan. Tanpa rekursi.
+    """
+
+    def __init__(self, grammar, max_length, seed=0):
+        self.compiled = compile_grammar(grammar)
+        self.max_length = max_length
+        self.random = random.Random(seed)
+
+        # Kata-kata yang bisa diturunkan langsung oleh setiap simbol (A -> 'kata')
+        self.words = {}
+        for word, lhs_set in self.compiled.terminal_index.items():
+            for lhs in lhs_set:
+                self.words.setdefault(lhs, []).append(word)
+        for word_list in self.words.values():
+            word_list.sort()
+
+        symbols = self.compiled.symbols
+        binary_rules = self.compiled.binary_rules
+        unit_rules = self.compiled.unit_rules
+        possible = {sym: [False] * (max_length + 1) for sym in symbols}
+        for length in range(1, max_length + 1):
+            for sym in symbols:
+                if length == 1:
+                    possible[sym][1] = sym in self.words
+                else:
+                    possible[sym][length] = any(
+                        possible[B][m] and possible[C][length - m]
+                        for B, C in binary_rules.get(sym, ())
+                        for m in range(1, length)
+                    )
+            # Aturan unit A -> B: A bisa menurunkan panjang yang sama dengan B
+            changed = True
+            while changed:
+                changed = False
+                for sym in symbols:
+                    if not possible[sym][length] and any(
+                        possible[B][length] for B in unit_rules.get(sym, ())
+                    ):
+                        possible[sym][length] = True
+                        changed = True
+        self.possible = possible
+
+    def can_generate(self, length):
+        return self.possible[self.compiled.start_symbol][length]
+
+    def generate(self, length):
+        """Membangkitkan satu list token dengan panjang tepat 'length'."""
+        if not self.can_generate(length):
+            raise ValueError(f"Grammar tidak dapat menurunkan kalimat dengan {length} token.")
+
+        possible = self.possible
+        tokens = []
+        stack = [(self.compiled.start_symbol, length)]
+        while stack:
+            sym, size = stack.pop()
+            choices = [(B, None, size) for B in self.compiled.unit_rules.get(sym, ()) if possible[B][size]]
+            if size == 1:
+                if sym in self.words:
+                    choices.append((None, None, 1))
+            else:
+                choices += [
+                    (B, C, m)
+                    for B, C in self.compiled.binary_rules.get(sym, ())
+                    for m in range(1, size)
+                    if possible[B][m] and possible[C][size - m]
+                ]
+            B, C, m = self.random.choice(choices)
+            if B is None:
+                tokens.append(self.random.choice(self.words[sym]))
+                continue
+            if C is None:
+                stack.append((B, size))  # Aturan unit: panjang yang sama
+                continue
+            # Anak kanan di-push dulu agar anak kiri diproses (dan ditulis) lebih dulu
+            stack.append((C, size - m))
+            stack.append((B, m))
+        return tokens
+
+
+def measure_sentence(sentence, compiled, fill):
+    """Mengukur satu kalimat per tahap. Mengembalikan (tokenisasi, pengisian, pohon) dalam us."""
+    t0 = time.perf_counter()
+    tokens = compiled.tokenizer.tokenize(sentence)
+    t1 = time.perf_counter()
+    is_accepted, table = fill(tokens, compiled)
+    t2 = time.perf_counter()
+    if is_accepted:
+        get_parse_tree_structure(compiled, table, tokens)
+    t3 = time.perf_counter()
+    return (t1 - t0) * 1e6, (t2 - t1) * 1e6, (t3 - t2) * 1e6
+
+
+def profile_sentences(sentences, compiled, fill):
+    """Satu putaran terinstrumentasi (ParseProfiler) atas kalimat-kalimat ini."""
+    profiler = ParseProfiler()
+    for sentence in sentences:
+        started = time.perf_counter()
+        tokens = compiled.tokenizer.tokenize(sentence)
+        tokenized = time.perf_counter()
+        profiler.on_phase("tokenize", tokenized - started)
+        is_accepted, _ = fill(tokens, compiled, observer=profiler)
+        profiler.on_parse("profile", tokens, is_accepted, time.perf_counter() - started)
+    return profiler.to_dict()
+
+
+def run_benchmark(lengths, samples=30, engine="bitset", seed=0, grammar=None, profile=False):
+    """
+    Menjalankan benchmark untuk setiap panjang kalimat n di 'lengths'.
+    Jika profile=True (hanya engine di PROFILED_ENGINES), setiap hasil juga
+    memuat statistik ParseProfiler dari putaran terpisah di kunci "profile".
+
+    Returns:
+        dict: metadata run + hasil per n (latensi per tahap, throughput,
+              memori puncak), siap ditulis sebagai JSON.
+    """
+    compiled = compile_grammar(grammar if grammar is not None else get_bali_grammar())
+    fill = ENGINES[engine]
+    if profile and engine not in PROFILED_ENGINES:
+        raise ValueError(f"Engine '{engine}' tidak mendukung --profile (pilihan: {', '.join(PROFILED_ENGINES)}).")
+    generator = SentenceGenerator(compiled, max(lengths), seed=seed)
+
+    results = []
+    for n in lengths:
+        if not generator.can_generate(n):
+            results.append({"n": n, "skipped": "grammar tidak dapat menurunkan panjang ini"})
+            continue
+
+        sentences = [" ".join(generator.generate(n)) for _ in range(samples)]
+
+        # Pemanasan: isi cache tokenizer & cache kombinasi mask seperti di produksi
+        measure_sentence(sentences[0], compiled, fill)
+
+        tokenize_us, fill_us, tree_us, total_us = [], [], [], []
+        wall_start = time.perf_counter()
+        for sentence in sentences:
+            tok, chart, tree = measure_sentence(sentence, compiled, fill)
+            tokenize_us.append(tok)
+            fill_us.append(chart)
+            tree_us.append(tree)
+            total_us.append(tok + chart + tree)
+        wall = time.perf_counter() - wall_start
+
+        # Memori puncak diukur pada putaran terpisah (tracemalloc memperlambat eksekusi)
+        peak_bytes = 0
+        for sentence in sentences:
+            tracemalloc.start()
+            measure_sentence(sentence, compiled, fill)
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        result = {
+            "n": n,
+            "samples": samples,
+            "sentences_per_sec": round(samples / wall, 1) if wall > 0 else None,
+            "latency_us": {
+                "tokenize": summarize(tokenize_us),
+                "chart_fill": summarize(fill_us),
+                "tree": summarize(tree_us),
+                "total": summarize(total_us),
+            },
+            "peak_memory_bytes": peak_bytes,
+        }
+        # Instrumentasi juga diukur terpisah agar tidak memengaruhi latensi di atas
+        if profile:
+            result["profile"] = profile_sentences(sentences, compiled, fill)
+        results.append(result)
+
+    return {
+        "engine": engine,
+        "seed": seed,
+        "grammar_fingerprint": compiled.fingerprint,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def find_regressions(current, baseline, threshold=1.2):
+    """
+    Membandingkan p95 latensi total per n terhadap hasil benchmark sebelumnya.
+    Mengembalikan list (n, p95_lama, p95_baru) yang melambat lebih dari 'threshold' kali.
+    """
+    old_by_n = {r["n"]: r for r in baseline.get("results", []) if "latency_us" in r}
+    regressions = []
+    for result in current["results"]:
+        old = old_by_n.get(result["n"])
+        if old is None or "latency_us" not in result:
+            continue
+        old_p95 = old["latency_us"]["total"]["p95"]
+        new_p95 = result["latency_us"]["total"]["p95"]
+        if old_p95 > 0 and new_p95 > old_p95 * threshold:
+            regressions.append((result["n"], old_p95, new_p95))
+    return regressions
+
+
+def print_report(report):
+    """Mencetak ringkasan benchmark dalam bentuk tabel."""
+    print(f"\nBENCHMARK CYK (engine: {report['engine']}, grammar: {report['grammar_fingerprint'][:10]})")
+    print("=" * 96)
+    print(f"| {'n':>4} | {'kalimat/dtk':>11} | {'token p50':>10} | {'tabel p50':>10} | {'pohon p50':>10} "
+          f"| {'total p95':>10} | {'total p99':>10} | {'memori':>8} |")
+    print("=" * 96)
+    for r in report["results"]:
+        if "latency_us" not in r:
+            print(f"| {r['n']:>4} | {'(dilewati: ' + r['skipped'] + ')':<83} |")
+            continue
+        lat = r["latency_us"]
+        print(f"| {r['n']:>4} | {r['sentences_per_sec']:>11} | {lat['tokenize']['p50']:>10} "
+              f"| {lat['chart_fill']['p50']:>10} | {lat['tree']['p50']:>10} | {lat['total']['p95']:>10} "
+              f"| {lat['total']['p99']:>10} | {r['peak_memory_bytes'] // 1024:>6}KB |")
+    print("=" * 96)
+    print("Satuan latensi: mikrodetik (us).")
+
+    profiled = [r for r in report["results"] if "profile" in r]
+    if profiled:
+        print(f"\n| {'n':>4} | {'tokenize':>10} | {'lexicon':>10} | {'fill':>10} | {'potong/kal':>10} "
+              f"| {'cek/kal':>10} | {'sel hidup %':>11} |")
+        for r in profiled:
+            prof = r["profile"]
+            phases = prof["phases"]
+            rows = prof["rows"].values()
+            cells = sum(row["cells"] for row in rows)
+            live = sum(row["live_cells"] for row in rows)
+            print(f"| {r['n']:>4} | {phases['tokenize']['mean_us']:>10} | {phases['lexicon']['mean_us']:>10} "
+                  f"| {phases['fill']['mean_us']:>10} | {prof['splits'] // prof['parses']:>10} "
+                  f"| {prof['rule_checks'] // prof['parses']:>10} | {100 * live / max(cells, 1):>10.1f}% |")
+        print("Waktu tahap: rata-rata mikrodetik per kalimat (putaran terinstrumentasi terpisah).")
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parser CYK bahasa Bali.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[5, 10, 20, 40, 60],
+                        help="Panjang kalimat (jumlah token) yang diuji.")
+    parser.add_argument("--samples", type=int, default=30, help="Jumlah kalimat per panjang.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="bitset")
+    parser.add_argument("--grammar", choices=["cnf", "cfg"], default="cnf",
+                        help="cnf = get_bali_grammar(), cfg = get_bali_cfg() via konversi CNF otomatis.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed pembangkit kalimat.")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON.")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk deteksi regresi.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sertakan statistik instrumentasi per tahap/baris (ParseProfiler) di hasil.")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Batas perlambatan p95 (kali lipat) sebelum dianggap regresi.")
+    args = parser.parse_args()
+
+    grammar = None
+    if args.grammar == "cfg":
+        from cyk_parser import get_bali_cfg
+        from cnf_converter import convert_to_cnf
+        grammar = convert_to_cnf(get_bali_cfg()).compile()
+
+    if args.profile and args.engine not in PROFILED_ENGINES:
+        parser.error(f"--profile hanya untuk engine: {', '.join(PROFILED_ENGINES)}")
+    report = run_benchmark(args.lengths, samples=args.samples, engine=args.engine, seed=args.seed,
+                           grammar=grammar, profile=args.profile)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Hasil disimpan ke '{args.json}'.")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold)
+        for n, old_p95, new_p95 in regressions:
+            print(f"[REGRESI] n={n}: p95 {old_p95}us -> {new_p95}us")
+        if regressions:
+            sys.exit(1)
+        print("[OK] Tidak ada regresi terhadap baseline.")
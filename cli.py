@@ -0,0 +1,212 @@
+# =======================================================================================
+# Deskripsi: Antarmuka baris perintah (CLI) untuk parser CYK bahasa Bali.
+#            Dipanggil lewat: python -m cyk_parser <perintah> [opsi]
+# =======================================================================================
+
+import os
+import sys
+import logging
+import argparse
+
+from cyk_parser import get_bali_grammar, compile_grammar
+from corpus_validator import iter_corpus_lines, validate_corpus
+from parser_backends import BACKENDS
+
+DEFAULT_ARTIFACT = "bali_grammar.cykg"
+DEFAULT_GRAMMAR_DIR = "grammar"
+DEFAULT_PCFG_MODEL = "bali_pcfg.json"
+
+logger = logging.getLogger(__name__)
+
+
+def _positive_int(value):
+    """Tipe argparse untuk bilangan bulat >= 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' bukan bilangan bulat")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"harus >= 1 (diberikan {number})")
+    return number
+
+
+def _cmd_validate(args):
+    """Perintah 'validate': validasi korpus secara streaming ke JSON Lines."""
+    # Dengan --grammar, artefak/direktori grammar dimuat langsung oleh proses ini maupun tiap worker
+    grammar = args.grammar if args.grammar else compile_grammar(get_bali_grammar())
+    if args.grammar and os.path.isfile(args.grammar):
+        # Artefak basi terhadap grammar sumbernya: workers memuat direktori sumber saja
+        from grammar_artifact import stale_artifact_source
+        stale_source = stale_artifact_source(args.grammar, args.source)
+        if stale_source is not None:
+            logger.warning("Artefak '%s' basi terhadap '%s'; grammar sumber dipakai. "
+                           "Jalankan ulang 'compile-grammar'.", args.grammar, stale_source)
+            grammar = stale_source
+    reloader = None
+    if args.watch:
+        from grammar_loader import GrammarReloader
+        if not args.grammar or not os.path.isdir(args.grammar):
+            print("[ERROR] --watch membutuhkan --grammar berupa direktori grammar.", file=sys.stderr)
+            return 2
+        # Grammar yang diubah saat korpus diproses dipakai mulai jendela berikutnya
+        reloader = grammar = GrammarReloader(args.grammar).start()
+    lines = iter_corpus_lines(args.files)
+
+    try:
+        if args.output == "-":
+            total, accepted = validate_corpus(
+                lines, grammar, sys.stdout,
+                workers=args.workers, chunk_size=args.chunk_size, with_tree=args.tree,
+                backend=args.backend, fuzzy=args.fuzzy,
+            )
+        else:
+            with open(args.output, "w", encoding="utf-8") as output:
+                total, accepted = validate_corpus(
+                    lines, grammar, output,
+                    workers=args.workers, chunk_size=args.chunk_size, with_tree=args.tree,
+                    backend=args.backend, fuzzy=args.fuzzy,
+                )
+    finally:
+        # Thread pemantau dihentikan juga saat validasi gagal atau dibatalkan (Ctrl+C)
+        if reloader is not None:
+            reloader.stop()
+    print(f"[OK] {total} kalimat diproses, {accepted} valid.", file=sys.stderr)
+    return 0
+
+
+def _cmd_compile_grammar(args):
+    """Perintah 'compile-grammar': simpan grammar terkompilasi sebagai artefak biner."""
+    from grammar_artifact import write_grammar_artifact, is_artifact_current
+
+    grammar = compile_grammar(args.source if args.source else get_bali_grammar())
+    if args.check:
+        if is_artifact_current(args.output, grammar):
+            print(f"[OK] Artefak '{args.output}' sesuai dengan grammar saat ini.", file=sys.stderr)
+            return 0
+        print(f"[BASI] Artefak '{args.output}' tidak ada atau tidak sesuai grammar saat ini.",
+              file=sys.stderr)
+        return 1
+
+    info = write_grammar_artifact(grammar, args.output, source=args.source)
+    print(f"[OK] Artefak grammar ditulis ke '{args.output}' "
+          f"({info['payload_size']} byte, sidik jari {info['fingerprint'][:12]}).", file=sys.stderr)
+    return 0
+
+
+def _cmd_export_grammar(args):
+    """Perintah 'export-grammar': tulis grammar bawaan ke rules.cnf + lexicon/*.txt."""
+    from grammar_loader import export_grammar
+
+    rules_path = export_grammar(args.directory)
+    print(f"[OK] Grammar bawaan diekspor ke '{rules_path}' (lexicon di '{args.directory}').",
+          file=sys.stderr)
+    return 0
+
+
+def _cmd_train_pcfg(args):
+    """Perintah 'train-pcfg': latih probabilitas aturan dari treebank atau korpus (inside-outside)."""
+    from pcfg import read_treebank, train_from_treebank, train_inside_outside
+
+    grammar = compile_grammar(args.grammar if args.grammar else get_bali_grammar())
+    if args.treebank:
+        model = train_from_treebank(read_treebank(args.treebank), grammar, smoothing=args.smoothing)
+        print(f"[OK] Probabilitas diestimasi dari treebank '{args.treebank}'.", file=sys.stderr)
+    else:
+        model, history = train_inside_outside(
+            iter_corpus_lines(args.files), grammar,
+            iterations=args.iterations, smoothing=args.smoothing,
+        )
+        print(f"[OK] Inside-outside selesai dalam {len(history)} iterasi "
+              f"(log-likelihood {history[-1]:.2f}).", file=sys.stderr)
+    model.save(args.output)
+    print(f"[OK] Model PCFG ditulis ke '{args.output}'.", file=sys.stderr)
+    return 0
+
+
+def build_arg_parser():
+    """Membangun parser argumen beserta seluruh sub-perintah."""
+    parser = argparse.ArgumentParser(
+        prog="python -m cyk_parser",
+        description="Parser CYK kalimat bahasa Bali berpredikat frasa adjektiva.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser(
+        "validate",
+        help="Validasi korpus (file atau stdin) dan tulis hasil sebagai JSON Lines.",
+    )
+    validate.add_argument("files", nargs="*", help="File korpus, satu kalimat per baris ('-' = stdin).")
+    validate.add_argument("-o", "--output", default="-", help="File output JSON Lines (default: stdout).")
+    validate.add_argument("-w", "--workers", type=int, default=1,
+                          help="Jumlah proses worker (0 = semua core CPU, default: 1).")
+    validate.add_argument("--chunk-size", type=int, default=1000,
+                          help="Jumlah kalimat per chunk (membatasi pemakaian memori).")
+    validate.add_argument("--tree", action="store_true", help="Sertakan pohon parse pada output.")
+    validate.add_argument("-g", "--grammar", default=None,
+                          help="Pakai artefak hasil 'compile-grammar' atau direktori grammar "
+                               "(rules.cnf + lexicon/). Artefak dibandingkan dengan --source atau "
+                               "direktori grammar/ di sampingnya; jika basi, grammar sumber dipakai "
+                               "dengan peringatan. Tanpa direktori sumber, artefak basi TIDAK "
+                               "terdeteksi (periksa dengan 'compile-grammar --check').")
+    validate.add_argument("-s", "--source", default=None,
+                          help="Direktori grammar sumber untuk memeriksa artefak -g "
+                               "(default: grammar/ di samping artefak).")
+    validate.add_argument("-b", "--backend", choices=sorted(BACKENDS), default="cyk",
+                          help="Backend parser (hasil sama; earley lebih cepat untuk kalimat panjang).")
+    validate.add_argument("--fuzzy", action="store_true",
+                          help="Kata tak dikenal (salah ketik/OCR) diganti kategori kata lexicon "
+                               "terdekat (jarak edit 1-2).")
+    validate.add_argument("--watch", action="store_true",
+                          help="Muat ulang direktori --grammar otomatis saat file berubah.")
+    validate.set_defaults(func=_cmd_validate)
+
+    compile_cmd = subparsers.add_parser(
+        "compile-grammar",
+        help="Kompilasi grammar ke file artefak biner yang cepat dimuat.",
+    )
+    compile_cmd.add_argument("-o", "--output", default=DEFAULT_ARTIFACT,
+                             help=f"File artefak output (default: {DEFAULT_ARTIFACT}).")
+    compile_cmd.add_argument("-s", "--source", default=None,
+                             help="Direktori grammar sumber (default: grammar bawaan).")
+    compile_cmd.add_argument("--check", action="store_true",
+                             help="Hanya periksa apakah artefak masih sesuai grammar (exit 1 jika basi).")
+    compile_cmd.set_defaults(func=_cmd_compile_grammar)
+
+    export_cmd = subparsers.add_parser(
+        "export-grammar",
+        help="Ekspor grammar bawaan ke file aturan & daftar kata yang bisa diedit.",
+    )
+    export_cmd.add_argument("directory", nargs="?", default=DEFAULT_GRAMMAR_DIR,
+                            help=f"Direktori tujuan (default: {DEFAULT_GRAMMAR_DIR}).")
+    export_cmd.set_defaults(func=_cmd_export_grammar)
+
+    train_cmd = subparsers.add_parser(
+        "train-pcfg",
+        help="Latih probabilitas aturan (PCFG) untuk parsing Viterbi.",
+    )
+    train_cmd.add_argument("files", nargs="*",
+                           help="Korpus kalimat valid untuk inside-outside ('-' = stdin).")
+    train_cmd.add_argument("-t", "--treebank", default=None,
+                           help="Treebank (satu pohon berkurung per baris); menggantikan inside-outside.")
+    train_cmd.add_argument("-o", "--output", default=DEFAULT_PCFG_MODEL,
+                           help=f"File model output (default: {DEFAULT_PCFG_MODEL}).")
+    train_cmd.add_argument("-g", "--grammar", default=None,
+                           help="Artefak atau direktori grammar (default: grammar bawaan).")
+    train_cmd.add_argument("--iterations", type=_positive_int, default=20, help="Iterasi EM maksimum.")
+    train_cmd.add_argument("--smoothing", type=float, default=0.01,
+                           help="Pseudo-count per aturan (menjaga aturan yang tidak terlihat).")
+    train_cmd.set_defaults(func=_cmd_train_pcfg)
+
+    return parser
+
+
+def main(argv=None):
+    """Titik masuk CLI. Mengembalikan exit code."""
+    args = build_arg_parser().parse_args(argv)
+    if getattr(args, "workers", None) == 0:
+        args.workers = None
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+# =======================================================================================
+# Deskripsi: Konversi Context-Free Grammar (CFG) umum ke Chomsky Normal Form (CNF)
+#            untuk engine CYK, beserta pengembalian pohon parse ke label aslinya
+# =======================================================================================
+
+from cyk_parser import CompiledGrammar
+
+# Pemisah nama simbol bantu hasil binarisasi, misal "P+Pel" untuk prefiks (P, Pel).
+# Karakter ini tidak dipakai oleh simbol grammar biasa.
+HELPER_JOIN = "+"
+
+
+def _nullable_symbols(cfg):
+    """Himpunan non-terminal yang dapat menurunkan string kosong (epsilon)."""
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rules in cfg.items():
+            if lhs not in nullable and any(all(sym in nullable for sym in rhs) for rhs in rules):
+                nullable.add(lhs)
+                changed = True
+    return nullable
+
+
+def _drop_nullable(rhs, nullable):
+    """Semua varian 'rhs' dengan simbol nullable dihilangkan (varian asli lebih dulu)."""
+    variants = [[]]
+    for sym in rhs:
+        if sym in nullable:
+            variants = [v + [sym] for v in variants] + [list(v) for v in variants]
+        else:
+            variants = [v + [sym] for v in variants]
+    return [v for v in variants if v]
+
+
+class CNFConversion:
+    """
+    Hasil konversi CFG -> CNF.
+
+    Atribut:
+        grammar (dict): Grammar CNF (format sama dengan get_bali_grammar()).
+        start_symbol (str): Simbol awal.
+        helpers (frozenset): Simbol bantu binarisasi (nama berisi '+').
+        unit_chains (dict): (LHS, RHS CNF) -> tuple simbol yang dilewati aturan
+                            unit, misal ('S', ('NP', 'Noun')) -> ('NP',) karena
+                            aturan itu berasal dari S -> NP dan NP -> NP Noun.
+        stats (dict): Jumlah aturan sebelum/sesudah konversi.
+    """
+
+    def __init__(self, grammar, start_symbol, helpers, unit_chains, stats):
+        self.grammar = grammar
+        self.start_symbol = start_symbol
+        self.helpers = frozenset(helpers)
+        self.unit_chains = unit_chains
+        self.stats = stats
+
+    @property
+    def origin(self):
+        """Data yang dibutuhkan debinarize_tree(), dalam bentuk yang bisa di-marshal."""
+        return {"helpers": self.helpers, "unit_chains": self.unit_chains}
+
+    def compile(self):
+        """CompiledGrammar untuk grammar CNF ini; pohon parse otomatis dikembalikan ke label CFG."""
+        return CompiledGrammar(self.grammar, self.start_symbol, cnf_origin=self.origin)
+
+    def debinarize(self, tree):
+        """Lihat debinarize_tree()."""
+        return debinarize_tree(tree, self.origin)
+
+
+def convert_to_cnf(cfg, start_symbol="K", keep_units=True):
+    """
+    Mengubah CFG umum menjadi CNF yang siap dipakai engine CYK.
+
+    CFG boleh berisi aturan n-ary (A -> B C D), aturan unit (S -> NP),
+    aturan epsilon (A -> []) dan campuran terminal/non-terminal. Simbol yang
+    menjadi key dictionary dianggap non-terminal; simbol lainnya terminal.
+
+    Tahapan:
+        1. Epsilon: varian tanpa simbol nullable ditambahkan, aturan kosong dibuang
+           (kalimat kosong tidak pernah diterima CYK).
+        2. Unit: secara default (keep_units=True) aturan unit dibiarkan apa
+           adanya, karena semua engine (CYK set/bit-vector, Earley, PCFG)
+           menerapkan penutupan unit sendiri; grammar tidak boleh punya siklus
+           unit. Dengan keep_units=False (CNF murni) A -> B diganti aturan
+           non-unit milik B, dan rantai unit dicatat di unit_chains untuk
+           dikembalikan ke pohon parse.
+        3. Terminal di aturan panjang diganti pre-terminal (dipakai ulang jika
+           sudah ada kategori yang hanya menurunkan kata itu).
+        4. Binarisasi kiri dengan prefiks bersama: A -> B C D menjadi
+           A -> B+C D dan B+C -> B C. Aturan lain dengan prefiks (B, C) memakai
+           simbol bantu yang sama.
+        5. Minimisasi: aturan duplikat dibuang, lalu simbol yang tidak produktif
+           atau tidak terjangkau dari simbol awal dihapus.
+    Urutan aturan per LHS dipertahankan karena menentukan pohon parse yang dipilih.
+
+    Pada get_bali_cfg() (340 aturan), keep_units=True menghasilkan 344 aturan:
+    28 aturan biner + 14 aturan unit (25 pasangan (B, C) unik), setara grammar
+    CNF manual. CNF murni (keep_units=False) menyalin aturan milik target unit
+    ke setiap induknya: 880 aturan, 57 aturan biner (25 pasangan), tanpa aturan
+    unit. Penerimaan dan pohon parse kedua varian identik; CNF murni hanya
+    berguna untuk engine yang tidak mengenal aturan unit.
+
+    Returns:
+        CNFConversion
+    """
+    nonterminals = set(cfg)
+    nullable = _nullable_symbols(cfg)
+
+    # --- 1. ELIMINASI EPSILON ---
+    rules = {}
+    for lhs, alternatives in cfg.items():
+        out = []
+        for rhs in alternatives:
+            out.extend(_drop_nullable(list(rhs), nullable))
+        rules[lhs] = out
+
+    # --- 2. ELIMINASI ATURAN UNIT (dengan pencatatan rantai) ---
+    def expand(lhs, visiting):
+        result = []
+        for rhs in rules[lhs]:
+            if not keep_units and len(rhs) == 1 and rhs[0] in nonterminals:
+                target = rhs[0]
+                if target in visiting:
+                    continue  # Siklus unit (A -> B -> A) tidak menambah aturan
+                for sub_rhs, chain in expand(target, visiting | {target}):
+                    result.append((sub_rhs, (target,) + chain))
+            else:
+                result.append((rhs, ()))
+        return result
+
+    expanded = {}
+    chains = {}
+    for lhs in cfg:
+        seen = set()
+        expanded[lhs] = []
+        for rhs, chain in expand(lhs, {lhs}):
+            key = tuple(rhs)
+            if key in seen:
+                continue
+            seen.add(key)
+            expanded[lhs].append(list(rhs))
+            chains[(lhs, key)] = chain
+
+    # --- 3. TERMINAL DI ATURAN PANJANG -> PRE-TERMINAL ---
+    preterminal_of = {}
+    for lhs, alternatives in expanded.items():
+        if len(alternatives) == 1 and len(alternatives[0]) == 1 and alternatives[0][0] not in nonterminals:
+            preterminal_of.setdefault(alternatives[0][0], lhs)
+
+    grammar = {}
+    helpers = set()
+
+    def preterminal(word):
+        sym = preterminal_of.get(word)
+        if sym is None:
+            sym = f"T_{word}"
+            while sym in nonterminals:
+                sym += "_"
+            preterminal_of[word] = sym
+            grammar.setdefault(sym, [[word]])
+        return sym
+
+    # --- 4. BINARISASI DENGAN PREFIKS BERSAMA ---
+    def prefix_symbol(seq):
+        name = HELPER_JOIN.join(seq)
+        if name not in grammar:
+            helpers.add(name)
+            left = seq[0] if len(seq) == 2 else prefix_symbol(seq[:-1])
+            grammar[name] = [[left, seq[-1]]]
+        return name
+
+    unit_chains = {}
+    for lhs, alternatives in expanded.items():
+        out = grammar.setdefault(lhs, [])
+        for rhs in alternatives:
+            chain = chains[(lhs, tuple(rhs))]
+            if len(rhs) == 1:
+                cnf_rhs = rhs
+            else:
+                rhs = [preterminal(sym) if sym not in nonterminals else sym for sym in rhs]
+                cnf_rhs = rhs if len(rhs) == 2 else [prefix_symbol(rhs[:-1]), rhs[-1]]
+            if cnf_rhs in out:
+                continue
+            out.append(list(cnf_rhs))
+            if chain:
+                unit_chains[(lhs, tuple(cnf_rhs))] = chain
+
+    # --- 5. MINIMISASI ---
+    # Buang simbol yang tidak produktif (tidak dapat menurunkan kata apa pun)
+    # beserta semua aturan yang memakainya
+    productive = set()
+    changed = True
+    while changed:
+        changed = False
+        for lhs, alternatives in grammar.items():
+            if lhs not in productive and any(
+                all(sym in productive or sym not in grammar for sym in rhs) for rhs in alternatives
+            ):
+                productive.add(lhs)
+                changed = True
+    grammar = {
+        lhs: [rhs for rhs in alternatives if all(sym in productive or sym not in grammar for sym in rhs)]
+        for lhs, alternatives in grammar.items() if lhs in productive
+    }
+
+    # Buang simbol yang tidak terjangkau dari simbol awal
+    reachable = {start_symbol}
+    stack = [start_symbol]
+    while stack:
+        for rhs in grammar.get(stack.pop(), ()):
+            for sym in rhs:
+                if sym in grammar and sym not in reachable:
+                    reachable.add(sym)
+                    stack.append(sym)
+    grammar = {lhs: alts for lhs, alts in grammar.items() if lhs in reachable}
+    helpers &= reachable
+    unit_chains = {key: chain for key, chain in unit_chains.items() if key[0] in reachable}
+
+    stats = {
+        "cfg_rules": sum(len(alts) for alts in cfg.values()),
+        "cnf_rules": sum(len(alts) for alts in grammar.values()),
+        "binary_rules": sum(1 for alts in grammar.values() for rhs in alts if len(rhs) == 2),
+        "binary_pairs": len({tuple(rhs) for alts in grammar.values() for rhs in alts if len(rhs) == 2}),
+        "unit_rules": sum(1 for alts in grammar.values() for rhs in alts if len(rhs) == 1 and rhs[0] in grammar),
+        "helpers": len(helpers),
+        "removed_symbols": sorted(set(cfg) - reachable),
+    }
+    return CNFConversion(grammar, start_symbol, helpers, unit_chains, stats)
+
+
+def debinarize_tree(tree, origin):
+    """
+    Mengembalikan pohon parse hasil grammar CNF ke bentuk CFG aslinya:
+        - Node simbol bantu binarisasi (misal 'P+Pel') dilebur ke induknya,
+          sehingga K -> P Pel S tampil sebagai satu node dengan tiga anak.
+        - Rantai aturan unit dimunculkan kembali, misal S -> NP Noun yang berasal
+          dari S -> NP menjadi ('S', ('NP', ..., ...)).
+    Dikerjakan secara iteratif agar aman untuk pohon yang dalam.
+
+    Args:
+        tree (tuple): Pohon parse nested tuple dari get_parse_tree_structure().
+        origin (dict): CNFConversion.origin (atau CompiledGrammar.cnf_origin).
+    """
+    if tree is None:
+        return None
+    helpers = origin["helpers"]
+    unit_chains = origin["unit_chains"]
+
+    # Post-order iteratif: setiap node diproses setelah semua anaknya
+    order = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if not isinstance(node[1], str):
+            stack.extend(node[1:])
+
+    built = {}
+    for node in reversed(order):
+        label = node[0]
+        if isinstance(node[1], str):
+            key = (label, (node[1],))
+            children = (node[1],)
+        else:
+            key = (label, tuple(child[0] for child in node[1:]))
+            children = []
+            for child in node[1:]:
+                rebuilt = built[id(child)]
+                if child[0] in helpers:
+                    children.extend(rebuilt[1:])
+                else:
+                    children.append(rebuilt)
+            children = tuple(children)
+
+        chain = unit_chains.get(key, ())
+        if chain:
+            inner = (chain[-1],) + children
+            for sym in reversed(chain[:-1]):
+                inner = (sym, inner)
+            built[id(node)] = (label, inner)
+        else:
+            built[id(node)] = (label,) + children
+    return built[id(tree)]
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    from cyk_parser import get_bali_cfg, get_bali_grammar, compile_grammar
+
+    conversion = convert_to_cnf(get_bali_cfg())
+    original = compile_grammar(get_bali_grammar())
+    original_binary = sum(len(pairs) for pairs in original.binary_rules.values())
+    original_unit = sum(len(targets) for targets in original.unit_rules.values())
+
+    print("=== KONVERSI CFG -> CNF (get_bali_cfg) ===")
+    for name, value in conversion.stats.items():
+        print(f"  {name:<16}: {value}")
+    print(f"  (grammar CNF manual: {original_binary} aturan biner, {original_unit} aturan unit, "
+          f"{len(original.binary_index)} pasangan (B, C) unik)")
+    print("\nSimbol bantu:", ", ".join(sorted(conversion.helpers)))
@@ -0,0 +1,104 @@
+# =======================================================================================
+# Deskripsi: Validasi korpus kalimat bahasa Bali secara streaming (baris demi baris),
+#            dengan hasil ditulis bertahap dalam format JSON Lines
+# =======================================================================================
+
+import sys
+import json
+from itertools import islice
+
+from batch_parser import parse_many
+
+
+def iter_corpus_lines(paths):
+    """
+    Membaca kalimat dari beberapa file (atau stdin jika path adalah '-')
+    secara lazy, satu baris per langkah. Baris kosong dilewati.
+
+    Args:
+        paths (list): Daftar path file. List kosong berarti membaca stdin.
+
+    Yields:
+        str: Kalimat (sudah di-strip) satu per satu.
+    """
+    for path in (paths or ["-"]):
+        if path == "-":
+            stream = sys.stdin
+            should_close = False
+        else:
+            stream = open(path, "r", encoding="utf-8", errors="replace")
+            should_close = True
+        try:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield line
+        finally:
+            if should_close:
+                stream.close()
+
+
+def iter_chunks(iterable, size):
+    """Memecah iterable menjadi list berukuran maksimal 'size' (chunk terakhir bisa lebih kecil)."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def result_to_record(result, with_tree=False):
+    """Mengubah ParseResult menjadi dictionary yang siap ditulis sebagai JSON."""
+    record = {
+        "sentence": result.sentence,
+        "tokens": result.tokens,
+        "accepted": result.is_accepted,
+        "elapsed_us": result.elapsed_us,
+    }
+    if result.unknown_tokens:
+        record["unknown_tokens"] = [
+            {"position": u.position, "token": u.token, "candidates": list(u.candidates)}
+            for u in result.unknown_tokens
+        ]
+    if with_tree:
+        record["tree"] = result.tree
+    return record
+
+
+def validate_corpus(lines, grammar, output, workers=1, chunk_size=1000, with_tree=False,
+                    backend="cyk", fuzzy=False):
+    """
+    Pipeline validasi korpus: baris -> chunk -> parse_many -> JSON Lines.
+
+    Memori yang dipakai dibatasi oleh chunk_size, bukan oleh ukuran korpus:
+    setiap chunk di-parse lalu langsung ditulis (dan di-flush) ke output.
+
+    Args:
+        lines (iterable): Kalimat input (misal dari iter_corpus_lines()).
+        grammar (dict | CompiledGrammar | str): Aturan tata bahasa atau path artefak grammar.
+        output (file): Stream tujuan (misal sys.stdout).
+        workers (int | None): Jumlah proses worker untuk parse_many().
+        chunk_size (int): Jumlah kalimat per chunk.
+        with_tree (bool): Sertakan pohon parse di setiap record.
+        backend (str): Backend parser untuk parse_many() ("cyk" atau "earley").
+        fuzzy (bool): Pulihkan token tak dikenal lewat kata lexicon terdekat.
+
+    Returns:
+        (total, accepted): Jumlah kalimat yang diproses dan yang valid.
+    """
+    total = 0
+    accepted = 0
+    results = parse_many(
+        lines, grammar, workers=workers,
+        chunksize=max(1, chunk_size // 16), with_tree=with_tree, backend=backend,
+        fuzzy=fuzzy,
+    )
+    for chunk in iter_chunks(results, chunk_size):
+        for result in chunk:
+            output.write(json.dumps(result_to_record(result, with_tree), ensure_ascii=False))
+            output.write("\n")
+            total += 1
+            accepted += result.is_accepted
+        output.flush()
+    return total, accepted
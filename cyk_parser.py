@@ -3,17 +3,123 @@
 #            frasa adjektiva (AdjP) menggunakan Algoritma CYK (Cocke-Kasami-Younger)
 # =======================================================================================
 
-def get_bali_grammar():
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+logger = logging.getLogger("cyk_parser")
+
+# Hasil parsing satu kalimat dalam bentuk ringkas (dipakai oleh API batch).
+#   sentence       : kalimat input asli
+#   tokens         : daftar token setelah preprocessing
+#   is_accepted    : True jika kalimat valid
+#   tree           : pohon parse (nested tuple) atau None
+#   elapsed_us     : lama parsing dalam mikrodetik (opsional)
+#   unknown_tokens : tuple UnknownToken untuk token yang tidak ada di lexicon
+ParseResult = namedtuple(
+    "ParseResult",
+    ["sentence", "tokens", "is_accepted", "tree", "elapsed_us", "unknown_tokens"],
+    defaults=(None, ()),
+)
+
+# Diagnosis satu token yang tidak dikenal.
+#   position   : posisi token di daftar token
+#   token      : token itu sendiri
+#   candidates : tuple kata lexicon yang paling mirip (bisa kosong)
+UnknownToken = namedtuple("UnknownToken", ["position", "token", "candidates"])
+
+class ParseCancelled(Exception):
+    """Dilempar ketika parsing dibatalkan lewat argumen 'cancel' (misal dari GUI)."""
+
+
+class RateLimitedWarning:
     """
-    Fungsi ini mengembalikan dictionary yang berisi aturan tata bahasa (grammar)
-    Bahasa Bali dalam bentuk Chomsky Normal Form (CNF).
-    
+    Peringatan lewat logging dengan batas laju: paling banyak 'limit' pesan per
+    'interval' detik. Pesan selebihnya hanya dihitung, lalu jumlahnya disebut
+    pada pesan berikutnya yang lolos. Dengan begitu teks yang penuh kata tak
+    dikenal (misal hasil OCR) tidak membanjiri terminal dan tidak memperlambat
+    parsing karena I/O.
+
+    Args:
+        logger (logging.Logger): Tujuan pesan (level WARNING).
+        limit (int): Jumlah pesan maksimal per jendela waktu.
+        interval (float): Panjang jendela waktu dalam detik.
+    """
+
+    def __init__(self, logger, limit=10, interval=60.0):
+        self.logger = logger
+        self.limit = limit
+        self.interval = interval
+        self.suppressed = 0  # Total pesan yang disembunyikan sejak awal
+        self._lock = threading.Lock()
+        self._window_start = None
+        self._sent = 0
+        self._pending = 0    # Pesan disembunyikan yang belum dilaporkan
+
+    def warning(self, message, *args):
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._window_start is None or now - self._window_start >= self.interval:
+                self._window_start = now
+                self._sent = 0
+            if self._sent >= self.limit:
+                self._pending += 1
+                self.suppressed += 1
+                return
+            self._sent += 1
+            pending, self._pending = self._pending, 0
+        if pending:
+            message += " (%d peringatan serupa sebelumnya disembunyikan)"
+            args += (pending,)
+        self.logger.warning(message, *args)
+
+
+# Peringatan kata tak dikenal dari semua engine parser (satu batas laju bersama)
+unknown_word_warnings = RateLimitedWarning(logger)
+
+
+def warn_unknown_token(word):
+    """Mencatat peringatan (dengan batas laju) untuk kata yang tidak ada di lexicon."""
+    unknown_word_warnings.warning("Kata '%s' tidak ditemukan dalam Lexicon grammar.", word)
+
+
+def diagnose_unknown_tokens(tokens, grammar, max_candidates=3):
+    """
+    Diagnosis terstruktur untuk token yang tidak ada di lexicon.
+
+    Args:
+        tokens (list): Token hasil preprocessing.
+        grammar (dict | CompiledGrammar): Grammar untuk mengenali kata.
+        max_candidates (int): Jumlah maksimal kata lexicon termirip per token
+                              (0 = tanpa kandidat).
+
     Returns:
-        grammar (dict): Dictionary dengan Key = Non-Terminal (LHS/Sisi Kiri Aturan)
-                        dan Value = List of Lists (RHS/Sisi Kanan Aturan).
+        tuple UnknownToken (kosong jika semua token dikenal).
     """
-    
-    # --- 1. DAFTAR KATA (LEXICON) ---
+    compiled = compile_grammar(grammar)
+    return tuple(
+        UnknownToken(i, token, compiled.suggest_words(token, max_candidates) if max_candidates else ())
+        for i, token in enumerate(tokens) if not compiled.is_known_word(token)
+    )
+
+
+def get_bali_lexicon():
+    """
+    Fungsi ini mengembalikan daftar kata (lexicon) Bahasa Bali per kategori
+    sintaksis. Dipakai oleh get_bali_grammar() untuk membentuk aturan terminal,
+    dan oleh grammar_loader.export_grammar() untuk menulis daftar kata ke file.
+
+    Returns:
+        lexicon (dict): Key = nama kategori (misal "adj"), Value = list kata.
+    """
+
+    # --- DAFTAR KATA (LEXICON) ---
     # Mendefinisikan list kata dasar berdasarkan kategori sintaksisnya.
     # Semua kata menggunakan huruf kecil untuk konsistensi pencocokan string.
     
@@ -86,24 +192,58 @@ def get_bali_grammar():
     # Kata Bilangan (Numeral)
     list_num = ["sabilang","molas", "dasa", "akilo", "telu", "limang", "telung", "dua", "duang"]
 
-    # --- 2. LOGIKA FLATTENING (Penyederhanaan Aturan Terminal) ---
-    # CYK mengharuskan aturan dalam bentuk A -> a (Non-Terminal -> Terminal).
-    # Agar aturan produksi lebih ringkas, kita gabungkan beberapa kategori kata
-    # ke dalam variabel terminal gabungan.
+    return {
+        "adj": list_adj,
+        "adv": list_adv,
+        "noun": list_noun,
+        "prop_noun": list_prop_noun,
+        "pronoun": list_pronoun,
+        "det": list_det,
+        "part": list_part,
+        "prep": list_prep,
+        "verb": list_verb,
+        "noun_time": list_noun_time,
+        "adj_time": list_adj_time,
+        "num": list_num,
+    }
+
 
-    # Terminal untuk Frasa Nomina (NP): Gabungan Noun, PropNoun, Pronoun
-    terminals_np = list_noun + list_prop_noun + list_pronoun
+def get_bali_grammar():
+    """
+    Fungsi ini mengembalikan dictionary yang berisi aturan tata bahasa (grammar)
+    Bahasa Bali dalam bentuk Chomsky Normal Form (CNF), ditambah aturan unit
+    (A -> B) yang didukung langsung oleh engine CYK.
     
-    # Terminal untuk Subjek (S): Subjek umumnya diisi oleh NP
-    terminals_s = terminals_np # S -> NP (Flattened)
+    Returns:
+        grammar (dict): Dictionary dengan Key = Non-Terminal (LHS/Sisi Kiri Aturan)
+                        dan Value = List of Lists (RHS/Sisi Kanan Aturan).
+    """
     
-    # Terminal untuk Pelengkap (Pel): Pelengkap bisa berupa NP atau Verb
-    terminals_pel = terminals_np + list_verb
+    # --- 1. DAFTAR KATA (LEXICON) ---
+    # Daftar kata per kategori sintaksis didefinisikan di get_bali_lexicon().
+    lexicon = get_bali_lexicon()
+    list_adj = lexicon["adj"]
+    list_adv = lexicon["adv"]
+    list_noun = lexicon["noun"]
+    list_prop_noun = lexicon["prop_noun"]
+    list_pronoun = lexicon["pronoun"]
+    list_det = lexicon["det"]
+    list_part = lexicon["part"]
+    list_prep = lexicon["prep"]
+    list_verb = lexicon["verb"]
+    list_noun_time = lexicon["noun_time"]
+    list_adj_time = lexicon["adj_time"]
+    list_num = lexicon["num"]
 
-    # --- 3. STRUKTUR GRAMMAR (DICTIONARY) ---
+    # --- 2. STRUKTUR GRAMMAR (DICTIONARY) ---
     # Mendefinisikan aturan produksi utama.
     # Format Key: "Non-Terminal"
-    # Format Value: List of Lists, contoh: [["P", "S"], ["kata"]]
+    # Format Value: List of Lists, contoh: [["P", "S"], ["NP"], ["kata"]]
+    #
+    # Selain aturan biner (A -> B C) dan terminal (A -> 'kata'), grammar memakai
+    # aturan unit A -> B (misal S -> NP). Engine CYK menerapkan penutupan aturan
+    # unit sekali per sel, sehingga aturan NP tidak perlu disalin ke S dan Pel
+    # dan daftar kata tidak perlu digabung (flattening) ke setiap kategori.
 
     grammar = {
         # -- ATURAN UTAMA KALIMAT (K) --
@@ -122,40 +262,36 @@ def get_bali_grammar():
         "X4": [["P", "X2"]],
         
         # -- PREDIKAT (P) & FRASA ADJEKTIVA (AdjP) --
-        # P -> AdjP Adv | AdjP Adj | Terminal (list_adj)
+        # P -> AdjP (aturan unit)
+        # AdjP -> AdjP Adv | AdjP Adj | Terminal (list_adj)
         # Kita gunakan list comprehension [[w] for w in ...] untuk membuat aturan terminal A -> a
-        "P": [["AdjP", "Adv"], ["AdjP", "Adj"]] + [[w] for w in list_adj], # P -> AdjP (Flattened to Adj)
+        "P": [["AdjP"]],
         "AdjP": [["AdjP", "Adv"], ["AdjP", "Adj"]] + [[w] for w in list_adj],
         "Adv": [[w] for w in list_adv],
         "Adj": [[w] for w in list_adj],
         
         # -- SUBJEK (S) --
-        # Aturan S -> Struktur NP | Terminal (terminals_s)
-        "S": [["NP", "Noun"], ["Part", "NP"], ["NP", "Det"], ["NP", "Pronoun"], 
-              ["NP", "PropNoun"], ["NP", "Part"], ["NP", "AdjP"]] + [[w] for w in terminals_s],
+        # Subjek diisi oleh NP
+        "S": [["NP"]],
               
         # -- PELENGKAP (Pel) --
         # Pelengkap sangat fleksibel: bisa NP, VP, atau PP
-        "Pel": [["NP", "Noun"], ["Part", "NP"], ["NP", "Det"], ["NP", "Pronoun"], 
-                ["NP", "PropNoun"], ["NP", "Part"], ["NP", "AdjP"], # NP rules
-                ["VP", "NP"], ["VP", "Verb"], ["Prep", "NP"], 
-                ["Prep", "Adj_time"], ["Prep", "NP_time"], ["PP", "PP"]] + [[w] for w in terminals_pel],
+        "Pel": [["NP"], ["VP"], ["PP"]],
                 
         # -- KETERANGAN (Ket) --
         # Keterangan waktu, tempat, cara
-        "Ket": [["Prep", "NP"], ["Prep", "Adj_time"], ["Prep", "NP_time"], 
-                ["PP", "PP"], ["NP_time", "Noun_time"], ["NP_time", "Det"], 
-                ["NumP", "NP_time"], ["PP", "NP_time"]] + [[w] for w in list_noun_time] + [[w] for w in list_num],
+        "Ket": [["PP"], ["NP_time"], ["NumP"], ["PP", "NP_time"]],
         
         # -- FRASA NOMINA (NP) --
         "NP": [["NP", "Noun"], ["Part", "NP"], ["NP", "Det"], ["NP", "Pronoun"], 
-               ["NP", "PropNoun"], ["NP", "Part"], ["NP", "AdjP"]] + [[w] for w in terminals_np],
+               ["NP", "PropNoun"], ["NP", "Part"], ["NP", "AdjP"],
+               ["Noun"], ["PropNoun"], ["Pronoun"]],
                
        # -- FRASA VERBA (VP), PREPOSISI (PP), & LAINNYA --
-        "VP": [["VP", "NP"], ["VP", "Verb"]] + [[w] for w in list_verb],
+        "VP": [["VP", "NP"], ["VP", "Verb"], ["Verb"]],
         "PP": [["Prep", "NP"], ["Prep", "Adj_time"], ["Prep", "NP_time"], ["PP", "PP"]],
-        "NumP": [["NumP", "NP_time"]] + [[w] for w in list_num],
-        "NP_time": [["NP_time", "Noun_time"], ["NP_time", "Det"]] + [[w] for w in list_noun_time],
+        "NumP": [["NumP", "NP_time"], ["Num"]],
+        "NP_time": [["NP_time", "Noun_time"], ["NP_time", "Det"], ["Noun_time"]],
         
         # -- TERMINAL MURNI (Dasar Leksikon) --
         # Aturan untuk menurunkan kategori leksikal langsung ke kata (misal: Noun -> 'buku')
@@ -173,7 +309,619 @@ def get_bali_grammar():
     
     return grammar
 
-def cyk_parse(sentence, grammar):
+def get_bali_cfg():
+    """
+    Versi ringkas grammar Bahasa Bali sebagai CFG umum: aturan n-ary
+    (K -> P Pel S) diperbolehkan, sehingga variabel bantu X1..X4 tidak perlu
+    ditulis manual.
+    Bahasa yang dikenali sama dengan get_bali_grammar().
+
+    Ubah ke CNF dengan cnf_converter.convert_to_cnf(get_bali_cfg()).compile().
+    """
+    lexicon = get_bali_lexicon()
+
+    def words(category):
+        return [[w] for w in lexicon[category]]
+
+    return {
+        # K -> P S | P Pel S | P S Pel | P Pel S Ket | P S Pel Ket
+        "K": [["P", "S"], ["P", "Pel", "S"], ["P", "S", "Pel"],
+              ["P", "Pel", "S", "Ket"], ["P", "S", "Pel", "Ket"]],
+        "P": [["AdjP"]],
+        "AdjP": [["AdjP", "Adv"], ["AdjP", "Adj"]] + words("adj"),
+        "S": [["NP"]],
+        "Pel": [["NP"], ["VP"], ["PP"]],
+        "Ket": [["PP"], ["NP_time"], ["NumP"], ["PP", "NP_time"]],
+        "NP": [["NP", "Noun"], ["Part", "NP"], ["NP", "Det"], ["NP", "Pronoun"],
+               ["NP", "PropNoun"], ["NP", "Part"], ["NP", "AdjP"],
+               ["Noun"], ["PropNoun"], ["Pronoun"]],
+        "VP": [["VP", "NP"], ["VP", "Verb"], ["Verb"]],
+        "PP": [["Prep", "NP"], ["Prep", "Adj_time"], ["Prep", "NP_time"], ["PP", "PP"]],
+        "NumP": [["NumP", "NP_time"], ["Num"]],
+        "NP_time": [["NP_time", "Noun_time"], ["NP_time", "Det"], ["Noun_time"]],
+        "Adv": words("adv"),
+        "Adj": words("adj"),
+        "Noun": words("noun"),
+        "Verb": words("verb"),
+        "PropNoun": words("prop_noun"),
+        "Pronoun": words("pronoun"),
+        "Det": words("det"),
+        "Part": words("part"),
+        "Prep": words("prep"),
+        "Num": words("num"),
+        "Noun_time": words("noun_time"),
+        "Adj_time": words("adj_time"),
+    }
+
+def grammar_fingerprint(grammar, start_symbol="K", cnf_origin=None):
+    """
+    Menghitung sidik jari (hash SHA-1) dari isi grammar.
+    Urutan aturan ikut dihitung karena memengaruhi pohon parse yang dipilih.
+    Informasi asal CNF (lihat cnf_converter) ikut dihitung jika ada, karena
+    mengubah bentuk pohon parse yang dikembalikan.
+    """
+    parts = (
+        start_symbol,
+        [(lhs, [tuple(rhs) for rhs in rules]) for lhs, rules in grammar.items()],
+    )
+    if cnf_origin is not None:
+        parts += (
+            sorted(cnf_origin["helpers"]),
+            sorted(cnf_origin["unit_chains"].items()),
+        )
+    canonical = repr(parts)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def compute_unary_closure(unit_rules):
+    """
+    Menghitung penutupan aturan unit: X -> frozenset semua A dengan A =>* X
+    (termasuk X sendiri). Siklus unit (A -> B, B -> A) membuat jumlah pohon
+    parse tak hingga, sehingga ditolak.
+    """
+    parents = {}
+    for A, targets in unit_rules.items():
+        for B in targets:
+            parents.setdefault(B, []).append(A)
+
+    closure = {}
+    for sym in unit_rules:
+        seen = {sym}
+        stack = [sym]
+        while stack:
+            for parent in parents.get(stack.pop(), ()):
+                if parent == sym:
+                    raise ValueError(f"Siklus aturan unit melibatkan simbol '{sym}' tidak didukung.")
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        closure[sym] = frozenset(seen)
+    return closure
+
+
+class CompiledGrammar:
+    """
+    Bentuk grammar yang sudah "dikompilasi" (diindeks) agar pencarian aturan
+    pada algoritma CYK cukup O(1), bukan lagi memindai seluruh grammar.
+
+    Dibangun SEKALI dari dictionary hasil get_bali_grammar(), lalu dapat dipakai
+    berulang kali oleh cyk_parse(), get_parse_tree_structure() dan evaluasi.
+
+    Atribut penting:
+        rules (dict): Dictionary grammar asli (Key = LHS, Value = list RHS).
+        start_symbol (str): Simbol awal kalimat ('K').
+        terminal_index (dict): Indeks balik kata -> frozenset LHS (A -> 'kata').
+        binary_index (dict): Indeks (B, C) -> frozenset LHS (A -> B C).
+        binary_by_left (dict): Indeks B -> list (C, frozenset LHS), untuk
+                               mengiterasi hanya simbol yang ada di sel kiri.
+        binary_rules (dict): LHS -> list (B, C) sesuai urutan aturan asli,
+                             dipakai saat menelusuri balik pohon parse.
+        unit_rules (dict): LHS -> list B untuk aturan unit A -> B (RHS tunggal
+                           yang merupakan non-terminal, misal S -> NP).
+        rule_order (dict): LHS -> list aturan non-terminal sesuai urutan asli:
+                           (B, C) untuk aturan biner, (B,) untuk aturan unit.
+        unary_closure (dict): X -> frozenset semua A dengan A =>* X lewat aturan
+                              unit (termasuk X). Dihitung sekali di sini, lalu
+                              diterapkan sekali per sel oleh engine CYK.
+        pronoun_suffixes (list): Daftar akhiran Pronoun untuk preprocessing.
+        tokenizer (Tokenizer): Tokenizer (dengan cache) yang dibangun dari grammar ini.
+        fingerprint (str): Sidik jari (hash SHA-1) isi grammar; berubah jika
+                           aturan atau lexicon berubah. Dipakai sebagai kunci cache.
+        symbols (list): Tabel simbol non-terminal; indeks = posisi bit.
+        symbol_ids (dict): Simbol -> posisi bit (untuk engine bit-vector).
+        terminal_masks (dict): Kata -> bitmask LHS (versi bit dari terminal_index),
+                               sudah termasuk penutupan unit.
+        terminal_rule_masks (dict): Kata -> bitmask LHS aturan terminal langsung saja.
+        cnf_origin (dict | None): Jika grammar hasil cnf_converter.convert_to_cnf(),
+                                  berisi simbol bantu & rantai unit untuk
+                                  mengembalikan pohon parse ke label CFG aslinya.
+
+    Seluruh tabel di atas dapat disimpan ke file artefak biner lewat to_tables()
+    dan dimuat kembali tanpa membangun ulang lewat from_tables()
+    (lihat grammar_artifact.py).
+    """
+
+    # Atribut yang disimpan ke artefak grammar; sisanya (cache, tokenizer) dibangun dari sini
+    TABLE_FIELDS = (
+        "rules", "start_symbol", "fingerprint",
+        "terminal_index", "binary_index", "binary_rules", "binary_by_left",
+        "unit_rules", "rule_order", "unary_closure",
+        "pronoun_suffixes", "symbols", "symbol_ids", "terminal_masks", "terminal_rule_masks",
+        "_pair_masks", "_right_union", "_closure_masks", "rule_ids", "cnf_origin",
+    )
+
+    def __init__(self, grammar, start_symbol="K", cnf_origin=None):
+        self.rules = grammar
+        self.start_symbol = start_symbol
+        self.cnf_origin = cnf_origin
+        self.fingerprint = grammar_fingerprint(grammar, start_symbol, cnf_origin)
+
+        terminal_index = {}
+        binary_index = {}
+        binary_rules = {}
+        unit_rules = {}
+        rule_order = {}
+
+        for lhs, rules in grammar.items():
+            binary_rules[lhs] = []
+            unit_rules[lhs] = []
+            rule_order[lhs] = []
+            for rhs in rules:
+                if len(rhs) == 1 and rhs[0] in grammar:
+                    # Aturan unit A -> B (B adalah non-terminal, misal S -> NP)
+                    unit_rules[lhs].append(rhs[0])
+                    rule_order[lhs].append((rhs[0],))
+                elif len(rhs) == 1:
+                    # Aturan terminal A -> 'kata'
+                    terminal_index.setdefault(rhs[0], set()).add(lhs)
+                elif len(rhs) == 2:
+                    # Aturan biner A -> B C
+                    pair = (rhs[0], rhs[1])
+                    binary_index.setdefault(pair, set()).add(lhs)
+                    binary_rules[lhs].append(pair)
+                    rule_order[lhs].append(pair)
+
+        # Bekukan himpunan agar aman dibagikan antar pemanggilan
+        self.terminal_index = {w: frozenset(s) for w, s in terminal_index.items()}
+        self.binary_index = {pair: frozenset(s) for pair, s in binary_index.items()}
+        self.binary_rules = binary_rules
+        self.unit_rules = unit_rules
+        self.rule_order = rule_order
+        self.unary_closure = compute_unary_closure(unit_rules)
+
+        binary_by_left = {}
+        for (B, C), lhs_set in self.binary_index.items():
+            binary_by_left.setdefault(B, []).append((C, lhs_set))
+        self.binary_by_left = binary_by_left
+
+        self.pronoun_suffixes = [
+            rhs[0] for rhs in grammar.get("Pronoun", []) if len(rhs) == 1 and rhs[0] not in grammar
+        ]
+        self.tokenizer = Tokenizer(self)
+
+        # --- TABEL SIMBOL UNTUK ENGINE BIT-VECTOR ---
+        # Setiap non-terminal dipetakan ke satu posisi bit, sehingga satu sel
+        # tabel CYK cukup disimpan sebagai satu bilangan bulat (int).
+        symbols = list(grammar.keys())
+        for B, C in self.binary_index:
+            for sym in (B, C):
+                if sym not in grammar and sym not in symbols:
+                    symbols.append(sym)
+        self.symbols = symbols
+        self.symbol_ids = {sym: idx for idx, sym in enumerate(symbols)}
+
+        # Penutupan unit versi bit: bit X -> mask semua A dengan A =>* X.
+        # Karena penutupan dari gabungan = gabungan penutupan, mask terminal dan
+        # mask LHS aturan biner di bawah ini langsung disimpan dalam keadaan
+        # tertutup, sehingga engine bit-vector tidak perlu langkah unit per sel.
+        self._closure_masks = [
+            self.encode(self.unary_closure.get(sym, (sym,))) for sym in symbols
+        ]
+
+        self.terminal_rule_masks = {
+            w: self.encode(lhs_set) for w, lhs_set in self.terminal_index.items()
+        }
+        self.terminal_masks = {
+            w: self.close_mask(mask) for w, mask in self.terminal_rule_masks.items()
+        }
+
+        # Per simbol kiri B (posisi bit b): list (bit C, mask LHS) dan gabungan
+        # semua bit C yang mungkin, untuk penolakan cepat saat sel kanan tidak cocok.
+        self._pair_masks = [[] for _ in symbols]
+        self._right_union = [0] * len(symbols)
+        for (B, C), lhs_set in self.binary_index.items():
+            b = self.symbol_ids[B]
+            c_bit = 1 << self.symbol_ids[C]
+            self._pair_masks[b].append((c_bit, self.close_mask(self.encode(lhs_set))))
+            self._right_union[b] |= c_bit
+
+        # Aturan non-terminal per LHS dalam bentuk indeks bit, urut sesuai grammar:
+        # (b, c) untuk aturan biner, (b, -1) untuk aturan unit. Dipakai untuk
+        # mencatat back-pointer dengan prioritas yang sama seperti penelusuran
+        # balik "Greedy Left".
+        self.rule_ids = [
+            [(self.symbol_ids[rule[0]], self.symbol_ids[rule[1]] if len(rule) == 2 else -1)
+             for rule in rule_order.get(sym, ())]
+            for sym in symbols
+        ]
+
+        # Memo hasil kombinasi (mask kiri, mask kanan) dan dekode mask -> nama.
+        # Jumlah kombinasi berbeda pada korpus nyata kecil, jadi hit rate tinggi.
+        self._combine_cache = {}
+        self._decode_cache = {0: frozenset()}
+        self._recover_cache = {}
+
+    def to_tables(self):
+        """
+        Mengembalikan seluruh tabel hasil kompilasi sebagai dictionary berisi
+        tipe dasar saja (dict, list, tuple, frozenset, str, int), sehingga bisa
+        diserialisasi dengan marshal.
+        """
+        tables = {name: getattr(self, name) for name in self.TABLE_FIELDS}
+        tables["rules"] = {lhs: [tuple(rhs) for rhs in rules] for lhs, rules in self.rules.items()}
+        tables["tokenizer"] = self.tokenizer.to_tables()
+        return tables
+
+    @classmethod
+    def from_tables(cls, tables):
+        """
+        Membangun CompiledGrammar langsung dari hasil to_tables() TANPA
+        menurunkan ulang indeks dari aturan grammar.
+        """
+        self = cls.__new__(cls)
+        for name in cls.TABLE_FIELDS:
+            setattr(self, name, tables[name])
+        self.rules = {lhs: [list(rhs) for rhs in rules] for lhs, rules in tables["rules"].items()}
+        self.tokenizer = Tokenizer.from_tables(tables["tokenizer"])
+        self._combine_cache = {}
+        self._decode_cache = {0: frozenset()}
+        self._recover_cache = {}
+        return self
+
+    @property
+    def analysis(self):
+        """GrammarAnalysis untuk grammar ini (dihitung sekali saat pertama dipakai)."""
+        analysis = self.__dict__.get("_analysis")
+        if analysis is None:
+            from grammar_analysis import GrammarAnalysis
+            analysis = GrammarAnalysis(self)
+            self._analysis = analysis
+        return analysis
+
+    @property
+    def has_unit_rules(self):
+        """True jika grammar memiliki aturan unit A -> B."""
+        return any(self.unit_rules.values())
+
+    def close_mask(self, mask):
+        """Menambahkan semua simbol yang dapat diturunkan lewat aturan unit ke bitmask."""
+        closure_masks = self._closure_masks
+        result = mask
+        m = mask
+        while m:
+            low = m & -m
+            m ^= low
+            result |= closure_masks[low.bit_length() - 1]
+        return result
+
+    def close_symbols(self, names):
+        """Versi himpunan dari close_mask(): menambahkan simbol hasil aturan unit (in-place)."""
+        closure = self.unary_closure
+        for name in tuple(names):
+            names.update(closure.get(name, ()))
+        return names
+
+    def encode(self, names):
+        """Mengubah kumpulan nama simbol menjadi bitmask (int)."""
+        mask = 0
+        for name in names:
+            mask |= 1 << self.symbol_ids[name]
+        return mask
+
+    def decode(self, mask):
+        """Mengubah bitmask (int) kembali menjadi frozenset nama simbol."""
+        names = self._decode_cache.get(mask)
+        if names is None:
+            names = frozenset(
+                sym for idx, sym in enumerate(self.symbols) if mask >> idx & 1
+            )
+            self._decode_cache[mask] = names
+        return names
+
+    def combine_masks(self, left, right):
+        """
+        Mengembalikan bitmask semua A dengan aturan A -> B C, di mana B ada di
+        mask 'left' dan C ada di mask 'right'.
+        """
+        key = (left, right)
+        result = self._combine_cache.get(key)
+        if result is not None:
+            return result
+
+        result = 0
+        pair_masks = self._pair_masks
+        right_union = self._right_union
+        m = left
+        while m:
+            low = m & -m
+            b = low.bit_length() - 1
+            m ^= low
+            # Lewati B yang tidak punya pasangan C sama sekali di sel kanan
+            if right & right_union[b]:
+                for c_bit, lhs_mask in pair_masks[b]:
+                    if right & c_bit:
+                        result |= lhs_mask
+
+        if len(self._combine_cache) >= 65536:
+            self._combine_cache.clear()
+        self._combine_cache[key] = result
+        return result
+
+    def lookup_terminal(self, word):
+        """Mengembalikan himpunan LHS yang dapat menurunkan 'word' (kosong jika tidak dikenal)."""
+        return self.terminal_index.get(word, frozenset())
+
+    def lookup_binary(self, B, C):
+        """Mengembalikan himpunan LHS untuk aturan A -> B C (kosong jika tidak ada)."""
+        return self.binary_index.get((B, C), frozenset())
+
+    def is_known_word(self, word):
+        """True jika 'word' muncul sebagai terminal di grammar."""
+        return word in self.terminal_index
+
+    @property
+    def fuzzy_lexicon(self):
+        """FuzzyLexicon (indeks edit-distance) atas semua terminal grammar (dibangun sekali)."""
+        lexicon = self.__dict__.get("_fuzzy_lexicon")
+        if lexicon is None:
+            from fuzzy_lexicon import FuzzyLexicon
+            lexicon = FuzzyLexicon(self.terminal_index)
+            self._fuzzy_lexicon = lexicon
+        return lexicon
+
+    def suggest_words(self, word, limit=3):
+        """
+        Kata lexicon yang paling mirip dengan 'word' (jarak edit maksimal 2,
+        terurut dari yang paling dekat).
+        """
+        return tuple(w for w, _ in self.fuzzy_lexicon.lookup(word)[:limit])
+
+    def recover_word(self, word):
+        """
+        Pemulihan token tak dikenal lewat kata lexicon terdekat (lihat fuzzy_lexicon.py).
+        Semua kandidat pada jarak edit TERKECIL dipakai sekaligus; kandidat yang
+        lebih jauh diabaikan (penalti jarak pada parser boolean).
+
+        Returns:
+            OOVRecovery, atau None jika 'word' dikenal atau tidak ada kandidat.
+        """
+        cache = self._recover_cache
+        if word in cache:
+            return cache[word]
+        recovery = None
+        if word not in self.terminal_index:
+            distance, words = self.fuzzy_lexicon.closest(word)
+            if words:
+                from fuzzy_lexicon import OOVRecovery
+                symbols = frozenset().union(*(self.terminal_index[w] for w in words))
+                rule_mask = self.encode(symbols)
+                recovery = OOVRecovery(distance, words, symbols, rule_mask, self.close_mask(rule_mask))
+        if len(cache) >= 4096:
+            cache.clear()
+        cache[word] = recovery
+        return recovery
+
+    def direct_terminal_symbols(self, word):
+        """
+        LHS aturan terminal langsung untuk 'word'. Untuk kata tak dikenal dipakai
+        hasil recover_word() (dipakai penelusuran balik pohon pada parsing fuzzy).
+        """
+        symbols = self.terminal_index.get(word)
+        if symbols is None:
+            recovery = self.recover_word(word)
+            symbols = recovery.symbols if recovery is not None else frozenset()
+        return symbols
+
+    def direct_terminal_mask(self, word):
+        """Versi bitmask dari direct_terminal_symbols()."""
+        mask = self.terminal_rule_masks.get(word)
+        if mask is None:
+            recovery = self.recover_word(word)
+            mask = recovery.rule_mask if recovery is not None else 0
+        return mask
+
+
+class Tokenizer:
+    """
+    Tokenizer kalimat bahasa Bali yang dibangun dari grammar.
+
+    - Kata yang sudah ada di lexicon dipakai apa adanya.
+    - Kata yang tidak dikenal dicoba dipisah dari akhiran Pronoun
+      (misal: "cunguhne" -> "cunguh" + "ne") memakai trie akhiran.
+      Akhiran TERPANJANG yang cocok selalu dipilih (deterministik).
+    - Hasil pemecahan setiap kata mentah disimpan di cache LRU, sehingga kata
+      yang sering muncul ("punika", "sajan", "tiange") cukup diproses sekali.
+
+    Tokenizer ini bisa dipakai terpisah dari proses parsing.
+    """
+
+    def __init__(self, grammar, cache_size=4096):
+        compiled = compile_grammar(grammar)
+        self.known_words = frozenset(compiled.terminal_index)
+        self.suffixes = list(compiled.pronoun_suffixes)
+        self.cache_size = cache_size
+        self._trie = self._build_suffix_trie(self.suffixes)
+        self._setup_cache()
+
+    def to_tables(self):
+        """Tabel tokenizer (kosakata, akhiran, trie) untuk disimpan ke artefak grammar."""
+        return {
+            "known_words": self.known_words,
+            "suffixes": tuple(self.suffixes),
+            "trie": self._trie,
+            "cache_size": self.cache_size,
+        }
+
+    @classmethod
+    def from_tables(cls, tables):
+        """Membangun Tokenizer dari hasil to_tables() tanpa membangun ulang trie."""
+        self = cls.__new__(cls)
+        self.known_words = tables["known_words"]
+        self.suffixes = list(tables["suffixes"])
+        self.cache_size = tables["cache_size"]
+        self._trie = tables["trie"]
+        self._setup_cache()
+        return self
+
+    @staticmethod
+    def _build_suffix_trie(suffixes):
+        """
+        Membangun trie dari akhiran yang DIBALIK (dibaca dari huruf terakhir),
+        sehingga semua akhiran yang cocok dengan sebuah kata ditemukan dalam
+        satu kali penelusuran dari belakang kata.
+        Penanda akhir akhiran disimpan pada key None.
+        """
+        trie = {}
+        for suffix in suffixes:
+            node = trie
+            for char in reversed(suffix):
+                node = node.setdefault(char, {})
+            node[None] = suffix
+        return trie
+
+    def _setup_cache(self):
+        self.split_word = lru_cache(maxsize=self.cache_size)(self._split_word)
+
+    def __getstate__(self):
+        # Fungsi ber-cache tidak bisa di-pickle (misal saat dikirim ke worker
+        # multiprocessing); cache dibangun ulang di sisi penerima.
+        state = self.__dict__.copy()
+        del state["split_word"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup_cache()
+
+    def longest_suffix(self, word):
+        """
+        Mengembalikan akhiran terpanjang yang cocok dengan 'word' dan masih
+        menyisakan kata dasar (tidak kosong), atau None jika tidak ada.
+        """
+        node = self._trie
+        best = None
+        # Berhenti sebelum huruf pertama: kata dasar minimal 1 huruf
+        for pos in range(len(word) - 1, 0, -1):
+            node = node.get(word[pos])
+            if node is None:
+                break
+            if None in node:
+                best = node[None]
+        return best
+
+    def _split_word(self, word):
+        """Memecah satu kata mentah (huruf kecil) menjadi tuple token."""
+        # Jika kata sudah dikenali (misal: "ipune" ada di lexicon), JANGAN dipisah.
+        if word in self.known_words:
+            return (word,)
+
+        suffix = self.longest_suffix(word)
+        if suffix is not None:
+            # Kata dasar dan akhiran sebagai token terpisah (misal: cunguh + ne)
+            return (word[:-len(suffix)], suffix)
+
+        # Tidak ada akhiran yang cocok: pakai kata aslinya (meski tidak dikenal)
+        return (word,)
+
+    def tokenize(self, sentence):
+        """Mengubah kalimat menjadi list token (huruf kecil, dipisah spasi, akhiran dipisah)."""
+        tokens = []
+        split_word = self.split_word
+        for word in sentence.lower().split():
+            tokens.extend(split_word(word))
+        return tokens
+
+    def cache_info(self):
+        """Statistik cache LRU (hits, misses, maxsize, currsize)."""
+        return self.split_word.cache_info()
+
+
+def compile_grammar(grammar):
+    """
+    Mengembalikan CompiledGrammar dari grammar yang diberikan.
+    Jika grammar sudah berupa CompiledGrammar, objek yang sama dikembalikan.
+    Jika grammar berupa path (str / os.PathLike), file artefak hasil
+    'compile-grammar' dimuat langsung tanpa kompilasi ulang, sedangkan direktori
+    grammar (rules.cnf + lexicon/) dibaca lalu dikompilasi. Artefak yang basi
+    terhadap direktori grammar/ di sampingnya diganti grammar sumber (dengan
+    peringatan); tanpa direktori itu, artefak basi tidak bisa dideteksi.
+    """
+    if isinstance(grammar, CompiledGrammar):
+        return grammar
+    if isinstance(grammar, (str, os.PathLike)):
+        if os.path.isdir(grammar):
+            from grammar_loader import load_grammar_dir
+            return CompiledGrammar(load_grammar_dir(grammar))
+        # Artefak dibandingkan dengan direktori grammar/ di sampingnya (jika ada)
+        from grammar_artifact import load_current_grammar
+        return load_current_grammar(grammar)
+    return CompiledGrammar(grammar)
+
+# Penanda bahwa pohon parse untuk entri cache belum pernah dihitung
+_TREE_NOT_COMPUTED = object()
+
+
+def _cache_lookup(cache, compiled, engine, tokens, count=True):
+    """
+    Mengambil entri cache untuk token ini (None jika belum ada). Dengan
+    count=False lookup tidak masuk statistik hit/miss (lihat ParseCache.peek()).
+    """
+    key = (engine, tuple(tokens))
+    if count:
+        return cache.get(compiled.fingerprint, key)
+    return cache.peek(compiled.fingerprint, key)
+
+
+def _cache_engine(table):
+    """
+    Bagian 'engine' kunci cache untuk tabel hasil parse. Chart dengan
+    back-pointer disimpan terpisah ("+bp"), sehingga permintaan backpointers=True
+    tidak pernah mendapat chart tanpa back-pointer dari cache.
+    """
+    if isinstance(table, BitChart):
+        return table.engine + ("+bp" if table.backpointers is not None else "")
+    if isinstance(table, CYKTable):
+        return table.engine
+    return "set"
+
+
+def _cache_store(cache, compiled, engine, tokens, result, cells):
+    """
+    Menyimpan hasil parse ke cache. 'cells' (isi tabel, termasuk back-pointer
+    jika ikut disimpan) dipakai untuk memperkirakan ukuran entri.
+    """
+    from parse_cache import estimate_size
+    entry = {"result": result, "tree": _TREE_NOT_COMPUTED, "cells": cells}
+    size = estimate_size((tokens, cells))
+    cache.put(compiled.fingerprint, (engine, tuple(tokens)), entry, size=size)
+
+
+def preprocess_sentence(sentence, grammar):
+    """
+    Preprocessing kalimat menjadi daftar token: huruf kecil, dipisah spasi,
+    lalu kata yang tidak dikenal dicoba dipisah dari akhiran Pronoun-nya.
+    Pekerjaan sebenarnya dilakukan oleh Tokenizer milik grammar terkompilasi.
+
+    Args:
+        sentence (str): Kalimat input.
+        grammar (dict | CompiledGrammar): Grammar untuk mengenali kata.
+
+    Returns:
+        tokens (list): Daftar token hasil preprocessing.
+    """
+    return compile_grammar(grammar).tokenizer.tokenize(sentence)
+
+def cyk_parse(sentence, grammar, cache=None, observer=None, fuzzy=False):
     """
     Implementasi algoritma CYK:
     1. Preprocessing: Memecah kalimat menjadi token/kata.
@@ -182,90 +930,103 @@ def cyk_parse(sentence, grammar):
 
     Args:
         sentence (str): Kalimat input (misal: "Jegeg sajan Putu").
-        grammar (dict): Aturan tata bahasa dari get_bali_grammar().
+        grammar (dict | CompiledGrammar): Aturan tata bahasa dari get_bali_grammar(),
+                        atau hasil compile_grammar() agar indeks tidak dibangun ulang.
 
     Returns:
         is_accepted (bool): True jika kalimat valid, False jika tidak.
         table (list): Tabel segitiga (piramida) hasil parsing.
         tokens (list): Daftar token setelah preprocessing.
+
+    Args opsional:
+        cache (ParseCache): Jika diberikan, hasil untuk token yang sama diambil
+                            dari cache (tabel yang dikembalikan dipakai bersama,
+                            jangan diubah).
+        observer (ParseObserver): Penerima data instrumentasi (waktu per tahap,
+                                  statistik per baris, token tak dikenal); lihat
+                                  parse_profiler.py. None = tanpa pengukuran.
+        fuzzy (bool): Token tak dikenal (salah ketik/OCR) diisi dengan kategori
+                      kata lexicon terdekat dalam jarak edit 1-2 (lihat
+                      CompiledGrammar.recover_word()) alih-alih sel kosong.
     """
 
     # 1. Preprocessing Input
-    # Mengubah ke huruf kecil dan memisahkan kata berdasarkan spasi (tokenisasi)
-    raw_words = sentence.lower().split()
-
-    # Daftar akhiran yang dianggap sebagai Pronoun
-    pronoun_suffixes = [x[0] for x in grammar.get("Pronoun", [])]
-    tokens = []
-
-    # --- Preprocessing: Penanganan Akhiran (Suffix) ---
-    # Contoh: "cunguhne" -> "cunguh" + "ne"
-    for word in raw_words:
-        # --- LOGIKA 1: Cek apakah kata sudah ada di Grammar? ---
-        word_is_known = False
-        for lhs, rules in grammar.items():
-            for rhs in rules:
-                # Cek jika rule berbentuk terminal (panjang 1) dan katanya cocok
-                if len(rhs) == 1 and rhs[0] == word:
-                    word_is_known = True
-                    break
-            if word_is_known:
-                break
+    # Grammar terkompilasi: indeks kata dan aturan biner untuk pencarian O(1)
+    compiled = compile_grammar(grammar)
+    started = time.perf_counter() if observer is not None else None
+    tokens = preprocess_sentence(sentence, compiled)
+    if observer is not None:
+        observer.on_phase("tokenize", time.perf_counter() - started)
 
-        # Jika kata sudah dikenali (misal: "ipune" ada di lexicon), JANGAN dipisah.
-        if word_is_known:
-            tokens.append(word)
-            continue # Lanjut ke kata berikutnya
-
-        # --- LOGIKA 2: Jika tidak dikenal, Coba Pisahkan Akhiran ---
-        split_found = False
-        for s in pronoun_suffixes:
-            # Cek apakah kata diakhiri suffix DAN kata tersebut bukan suffix itu sendiri
-            if word.endswith(s) and word != s:
-                stem = word[:-len(s)] # Ambil kata dasar (misal: cunguh)
-
-                # Masukkan kata dasar dan akhiran sebagai token terpisah
-                tokens.append(stem)
-                tokens.append(s)
-                split_found = True
-                break # Stop jika sudah ketemu akhiran terpanjang
-
-        # Jika tidak ada akhiran yang cocok, masukkan kata aslinya (meski tidak dikenal)
-        if not split_found:
-            tokens.append(word)
+    engine = "set+fuzzy" if fuzzy else "set"
+
+    if cache is not None:
+        entry = _cache_lookup(cache, compiled, engine, tokens)
+        if entry is not None:
+            if observer is not None:
+                observer.on_parse(engine, tokens, entry["result"][0], time.perf_counter() - started, cached=True)
+            return entry["result"]
+
+    is_accepted, table = fill_cyk_table(tokens, compiled, observer=observer, fuzzy=fuzzy)
 
+    if cache is not None and tokens:
+        _cache_store(cache, compiled, engine, tokens, (is_accepted, table, tokens), table)
+
+    if observer is not None:
+        observer.on_parse(engine, tokens, is_accepted, time.perf_counter() - started, cached=False)
+    return is_accepted, table, tokens
+
+def fill_cyk_table(tokens, grammar, observer=None, fuzzy=False):
+    """
+    Mengisi tabel CYK (versi himpunan/set) untuk token yang SUDAH dipreprocessing.
+    Dipisah dari cyk_parse() agar tahap pengisian tabel bisa dipakai (dan diukur)
+    tanpa tahap tokenisasi. 'observer' dan 'fuzzy' sama seperti pada cyk_parse().
+
+    Returns:
+        is_accepted (bool), table (CYKTable: list n x n berisi set).
+    """
+    compiled = compile_grammar(grammar)
     n = len(tokens)
+    engine = "set+fuzzy" if fuzzy else "set"
 
     # Jika input kosong, langsung return False
     if n == 0:
-        return False, [], []
+        return False, CYKTable([], engine)
 
     # 2. Inisialisasi Tabel CYK
     # Membuat matriks n x n berisi himpunan kosong (set) di setiap selnya.
     # Sel table[i][j] akan menyimpan variabel non-terminal yang bisa menurunkan
     # substring dari indeks i sampai j.
-    table = [[set() for _ in range(n)] for _ in range(n)]
+    table = CYKTable(([set() for _ in range(n)] for _ in range(n)), engine)
+    started = time.perf_counter() if observer is not None else None
 
     # --- TAHAP 1: MENGISI TERMINAL (DIAGONAL UTAMA) ---
     # Mengisi sel table[i][i] (panjang substring = 1).
     # Mencari aturan A -> 'kata' yang cocok dengan token di posisi i.
     for i in range(n):
         word = tokens[i]
-        found = False
-        for lhs, rules in grammar.items():
-            for rhs in rules:
-                # Cek jika aturan sisi kanan hanya berisi 1 elemen (terminal)
-                # dan elemen tersebut sama dengan kata token.
-                if len(rhs) == 1 and rhs[0] == word:
-                    table[i][i].add(lhs)
-                    found = True
-        # Peringatan jika kata tidak dikenal (tidak ada di lexicon)
-        if not found:
-            print(f"Peringatan: Kata '{word}' tidak ditemukan dalam Lexicon grammar.")
+        # Indeks balik kata -> himpunan LHS (semua aturan A -> 'kata')
+        lhs_set = compiled.lookup_terminal(word)
+        # Kata tidak dikenal (tidak ada di lexicon): coba kata lexicon terdekat,
+        # peringatan hanya jika tetap tidak ada kategori yang bisa dipakai
+        if not lhs_set:
+            recovery = compiled.recover_word(word) if fuzzy else None
+            if recovery is not None:
+                lhs_set = recovery.symbols
+            else:
+                warn_unknown_token(word)
+            if observer is not None:
+                observer.on_unknown_token(i, word)
+        table[i][i].update(lhs_set)
+        # Aturan unit (misal S -> NP) diterapkan sekali per sel lewat penutupan unit
+        compiled.close_symbols(table[i][i])
+    if observer is not None:
+        started = _observe_row(observer, 1, [table[i][i] for i in range(n)], len, 0, 0, started, "lexicon")
 
     # --- TAHAP 2: MENGISI KOMBINASI (BOTTOM-UP) ---
     # Mengisi tabel untuk panjang substring mulai dari 2 sampai n.
     for length in range(2, n + 1):
+        rule_checks = 0
         # Iterasi posisi awal substring (i)
         for i in range(n - length + 1):
             # Menentukan posisi akhir substring (j)
@@ -277,70 +1038,690 @@ def cyk_parse(sentence, grammar):
                 # Ambil himpunan variabel dari sel kiri (B) dan sel kanan (C)
                 left_cell = table[i][k]         # Variabel untuk bagian pertama
                 right_cell = table[k + 1][j]    # Variabel untuk bagian kedua
+                if not left_cell or not right_cell:
+                    continue
 
-                # Cek setiap aturan produksi A -> BC di grammar
-                for lhs, rules in grammar.items():
-                    for rhs in rules:
-                        # Pastikan aturan memiliki 2 non-terminal di sisi kanan
-                        if len(rhs) == 2:
-                            B, C = rhs[0], rhs[1]
-                            # Jika B ada di sel kiri DAN C ada di sel kanan,
-                            # maka A (lhs) bisa ditambahkan ke sel gabungan saat ini.
-                            if B in left_cell and C in right_cell:
-                                table[i][j].add(lhs)
+                # Hanya aturan A -> B C dengan B yang memang ada di sel kiri
+                # yang diperiksa (lewat indeks binary_by_left).
+                for B in left_cell:
+                    candidates = compiled.binary_by_left.get(B, ())
+                    rule_checks += len(candidates)
+                    for C, lhs_set in candidates:
+                        # Jika C ada di sel kanan, maka semua A (lhs) bisa
+                        # ditambahkan ke sel gabungan saat ini.
+                        if C in right_cell:
+                            table[i][j].update(lhs_set)
+
+            # Penutupan unit sekali per sel, setelah semua titik potong selesai
+            compiled.close_symbols(table[i][j])
+
+        if observer is not None:
+            row = [table[i][i + length - 1] for i in range(n - length + 1)]
+            # Engine dense mengunjungi semua titik potong: (length - 1) per sel
+            _observe_row(observer, length, row, len, len(row) * (length - 1), rule_checks)
+
+    if observer is not None:
+        observer.on_phase("fill", time.perf_counter() - started)
 
     # --- TAHAP 3: PENGECEKAN FINAL ---
     # Kalimat valid jika simbol awal 'K' (Kalimat) ada di sel puncak table[0][n-1]
-    is_accepted = "K" in table[0][n-1]
+    is_accepted = compiled.start_symbol in table[0][n-1]
+
+    return is_accepted, table
+
+def _observe_row(observer, length, row, size, splits, rule_checks, started=None, phase=None):
+    """
+    Melaporkan statistik satu baris panjang substring ke observer. Jika 'phase'
+    diberikan, waktu sejak 'started' juga dilaporkan sebagai tahap tersebut.
+    Mengembalikan waktu sekarang (awal tahap berikutnya).
+    """
+    sizes = [size(cell) for cell in row]
+    observer.on_row(length, len(row), sum(1 for x in sizes if x), sum(sizes), max(sizes, default=0),
+                    splits, rule_checks)
+    now = time.perf_counter()
+    if phase is not None:
+        observer.on_phase(phase, now - started)
+    return now
+
+
+def _mask_size(mask):
+    """Jumlah simbol dalam bitmask sel."""
+    return bin(mask).count("1")
+
+
+class CYKTable(list):
+    """
+    Tabel CYK versi himpunan hasil fill_cyk_table(): list n x n berisi set,
+    ditambah nama engine ("set" atau "set+fuzzy") seperti BitChart.engine.
+    Nama engine dipakai sebagai bagian kunci ParseCache, sehingga pohon dari
+    parsing fuzzy tidak pernah tersimpan di entri parsing biasa.
+    """
+
+    def __init__(self, rows=(), engine="set"):
+        super().__init__(rows)
+        self.engine = engine
+
+
+class BitChart:
+    """
+    Tabel CYK versi bit-vector: setiap sel adalah satu int (bitmask simbol),
+    dan hanya segitiga atas yang dialokasikan.
+
+    rows[length - 1][i] menyimpan sel untuk substring tokens[i .. i+length-1].
+    Dengan demikian jumlah sel hanya n(n+1)/2, bukan n x n himpunan string.
+
+    Objek ini juga berperan sebagai "view" kompatibel dengan tabel lama:
+    chart[i][j] mengembalikan frozenset nama simbol (kosong untuk j < i),
+    sehingga get_parse_tree_structure() dan get_cyk_table_string() tetap bisa dipakai.
+
+    Jika parsing dijalankan dengan backpointers=True, backpointers[length - 1][i]
+    berisi dictionary {bit simbol A: (k, bit B, bit C)} yang mencatat cara A
+    dibentuk di sel tersebut; pohon parse lalu bisa diambil dalam O(n).
+    Aturan unit A -> B dicatat sebagai (-1, bit B, -1), dan simbol diagonal
+    tanpa entri adalah daun (A -> 'kata').
+    """
+
+    def __init__(self, compiled, tokens, rows, backpointers=None, engine="bitset"):
+        self.compiled = compiled
+        self.tokens = tokens
+        self.rows = rows
+        self.backpointers = backpointers
+        self.engine = engine
+
+    @property
+    def complete(self):
+        """
+        False jika pengisian tabel dihentikan lebih awal (engine sparse yang
+        sudah membuktikan kalimat ditolak); baris yang tidak diisi dianggap kosong.
+        """
+        return len(self.rows) == len(self.tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def mask(self, i, j):
+        """Bitmask sel (i, j); 0 jika di luar segitiga atas atau baris yang tidak diisi."""
+        if j < i or j - i >= len(self.rows):
+            return 0
+        return self.rows[j - i][i]
+
+    def cell(self, i, j):
+        """Isi sel (i, j) sebagai frozenset nama simbol."""
+        return self.compiled.decode(self.mask(i, j))
+
+    def __getitem__(self, i):
+        return _BitChartRow(self, i)
+
+    def to_table(self):
+        """Konversi ke tabel lama: list n x n berisi set nama simbol."""
+        n = len(self.tokens)
+        return [[set(self.cell(i, j)) for j in range(n)] for i in range(n)]
+
+
+class _BitChartRow:
+    """Baris view dari BitChart, agar sintaks chart[i][j] tetap berlaku."""
+
+    def __init__(self, chart, i):
+        self._chart = chart
+        self._i = i
+
+    def __len__(self):
+        return len(self._chart.tokens)
+
+    def __getitem__(self, j):
+        return self._chart.cell(self._i, j)
+
+
+def _record_backpointers(cell_bp, new_mask, left, right, k, rule_ids):
+    """
+    Mencatat back-pointer untuk setiap simbol A di new_mask, yang terbentuk
+    dari sel kiri 'left' dan sel kanan 'right' dengan titik potong k.
+
+    Prioritas sama dengan penelusuran balik lama: aturan yang lebih awal di
+    grammar menang; untuk aturan yang sama, k terbesar (dicoba lebih dulu
+    karena k diiterasi mundur) dipertahankan. Aturan unit (c = -1) dilewati
+    di sini dan dicatat oleh _record_unit_backpointers() setelah sel selesai.
+    """
+    m = new_mask
+    while m:
+        low = m & -m
+        a = low.bit_length() - 1
+        m ^= low
+        current = cell_bp.get(a)
+        for rank, (b, c) in enumerate(rule_ids[a]):
+            if current is not None and rank >= current[0]:
+                break
+            if c >= 0 and left >> b & 1 and right >> c & 1:
+                cell_bp[a] = (rank, k, b, c)
+                break
+
+
+def _record_unit_backpointers(cell_bp, mask, rule_ids):
+    """
+    Mencatat back-pointer aturan unit A -> B (disimpan sebagai (-1, b, -1))
+    untuk simbol A di sel final 'mask' yang anak unitnya B juga ada di sel,
+    jika aturan unit itu lebih awal di grammar daripada aturan biner yang
+    sudah tercatat.
+    """
+    m = mask
+    while m:
+        low = m & -m
+        a = low.bit_length() - 1
+        m ^= low
+        current = cell_bp.get(a)
+        for rank, (b, c) in enumerate(rule_ids[a]):
+            if current is not None and rank >= current[0]:
+                break
+            if c < 0 and mask >> b & 1:
+                cell_bp[a] = (rank, -1, b, -1)
+                break
+
+
+def _diagonal_backpointers(compiled, tokens, diagonal):
+    """
+    Back-pointer baris diagonal: simbol yang hanya muncul lewat aturan unit
+    (bukan aturan terminal langsung) menunjuk ke anak unit pertamanya.
+    Simbol tanpa entri adalah daun (A -> 'kata').
+    """
+    terminal_rule_masks = compiled.terminal_rule_masks
+    rule_ids = compiled.rule_ids
+    bp_row = []
+    for word, mask in zip(tokens, diagonal):
+        cell_bp = {}
+        direct = terminal_rule_masks.get(word)
+        if direct is None:
+            # Token tak dikenal yang terisi lewat parsing fuzzy
+            direct = compiled.direct_terminal_mask(word) if mask else 0
+        m = mask & ~direct
+        while m:
+            low = m & -m
+            a = low.bit_length() - 1
+            m ^= low
+            for b, c in rule_ids[a]:
+                if c < 0 and mask >> b & 1:
+                    cell_bp[a] = (-1, b, -1)
+                    break
+        bp_row.append(cell_bp)
+    return bp_row
+
+
+def cyk_parse_bitset(sentence, grammar, cache=None, backpointers=False,
+                     progress=None, cancel=None, sparse=False, prune=False, observer=None,
+                     fuzzy=False):
+    """
+    Engine CYK alternatif berbasis bit-vector.
+
+    Setiap non-terminal dipetakan ke satu bit (lihat CompiledGrammar.symbols),
+    sel tabel disimpan sebagai int, dan penggabungan sel kiri/kanan memakai
+    mask per simbol kiri yang sudah dihitung sebelumnya (combine_masks).
+
+    Args:
+        sentence (str): Kalimat input.
+        grammar (dict | CompiledGrammar): Aturan tata bahasa.
+
+    Returns:
+        is_accepted (bool): True jika kalimat valid, False jika tidak.
+        table (BitChart): Tabel bit-vector; bisa diakses seperti tabel lama (table[i][j]).
+        tokens (list): Daftar token setelah preprocessing.
+
+    Args opsional:
+        cache (ParseCache): Cache hasil parse, sama seperti pada cyk_parse().
+        backpointers (bool): Jika True, cara terbentuknya setiap simbol dicatat
+                             saat tabel diisi, sehingga extract_parse_tree()
+                             tidak perlu menguji ulang aturan dan titik potong.
+        progress (callable): Dipanggil sebagai progress(baris_selesai, total_baris)
+                             setiap satu baris panjang substring selesai diisi.
+        cancel (threading.Event): Jika is_set() bernilai True, parsing dihentikan
+                                  di akhir baris berjalan dengan ParseCancelled.
+        sparse (bool): Pakai engine sparse (lihat fill_sparse_chart()) yang hanya
+                       mengiterasi pasangan sel tidak kosong dan berhenti lebih awal
+                       begitu kalimat terbukti ditolak.
+        prune (bool): Buang dari setiap sel simbol yang mustahil ikut membentuk 'K'
+                      di span penuh (lihat GrammarAnalysis.prune_cell()). Sel jadi
+                      lebih kecil, tetapi tabel tidak lagi memuat semua kategori.
+        observer (ParseObserver): Penerima data instrumentasi, sama seperti pada cyk_parse().
+        fuzzy (bool): Pemulihan token tak dikenal, sama seperti pada cyk_parse().
+    """
+    compiled = compile_grammar(grammar)
+    started = time.perf_counter() if observer is not None else None
+    tokens = preprocess_sentence(sentence, compiled)
+    if observer is not None:
+        observer.on_phase("tokenize", time.perf_counter() - started)
+    engine = _engine_name(sparse, prune, fuzzy)
+    # Harus sama dengan _cache_engine() untuk chart yang dihasilkan
+    cache_engine = engine + "+bp" if backpointers else engine
+
+    if cache is not None:
+        entry = _cache_lookup(cache, compiled, cache_engine, tokens)
+        if entry is not None:
+            if observer is not None:
+                observer.on_parse(engine, tokens, entry["result"][0], time.perf_counter() - started, cached=True)
+            return entry["result"]
+
+    fill = fill_sparse_chart if sparse else fill_bitset_chart
+    is_accepted, chart = fill(
+        tokens, compiled, backpointers=backpointers, progress=progress, cancel=cancel,
+        prune=prune, observer=observer, fuzzy=fuzzy,
+    )
+
+    if cache is not None and tokens:
+        # Tabel back-pointer ikut disimpan, jadi ikut dihitung untuk batas max_bytes
+        cells = (chart.rows, chart.backpointers) if chart.backpointers is not None else chart.rows
+        _cache_store(cache, compiled, cache_engine, tokens, (is_accepted, chart, tokens), cells)
+
+    if observer is not None:
+        observer.on_parse(engine, tokens, is_accepted, time.perf_counter() - started, cached=False)
+    return is_accepted, chart, tokens
+
+def _engine_name(sparse, prune, fuzzy=False):
+    """Nama engine bit-vector (dipakai sebagai bagian kunci cache)."""
+    return ("sparse" if sparse else "bitset") + ("+prune" if prune else "") + ("+fuzzy" if fuzzy else "")
 
-    return is_accepted, table, tokens
 
-def get_parse_tree_structure(grammar, table, tokens):
+def fill_bitset_chart(tokens, grammar, backpointers=False, progress=None, cancel=None,
+                      prune=False, observer=None, fuzzy=False):
     """
-    Mengubah Tabel CYK menjadi struktur data Pohon (Nested Tuple) secara rekursif.
+    Mengisi tabel CYK bit-vector untuk token yang SUDAH dipreprocessing.
+    Argumen opsional sama seperti cyk_parse_bitset().
+
+    Returns:
+        is_accepted (bool), chart (BitChart).
+    """
+    compiled = compile_grammar(grammar)
+    engine = _engine_name(False, prune, fuzzy)
+    n = len(tokens)
+    if n == 0:
+        return False, BitChart(compiled, tokens, [], engine=engine)
+    started = time.perf_counter() if observer is not None else None
+
+    # --- TAHAP 1: DIAGONAL (panjang substring = 1) ---
+    terminal_masks = compiled.terminal_masks
+    diagonal = []
+    for i, word in enumerate(tokens):
+        mask = terminal_masks.get(word, 0)
+        if not mask:
+            recovery = compiled.recover_word(word) if fuzzy else None
+            if recovery is not None:
+                mask = recovery.mask
+            else:
+                warn_unknown_token(word)
+            if observer is not None:
+                observer.on_unknown_token(i, word)
+        diagonal.append(mask)
+    rows = [diagonal]
+
+    # Pemangkasan top-down (opsional): konteks diambil dari diagonal asli
+    prune_cell = compiled.analysis.prune_cell if prune else None
+    if prune:
+        rows[0] = [prune_cell(mask, i, i, n, diagonal) for i, mask in enumerate(diagonal)]
+    if observer is not None:
+        started = _observe_row(observer, 1, rows[0], _mask_size, 0, 0, started, "lexicon")
+
+    # --- TAHAP 2: KOMBINASI BOTTOM-UP ---
+    # Mask hasil combine_masks sudah tertutup terhadap aturan unit, sehingga
+    # di sini aturan unit hanya perlu diurus untuk back-pointer.
+    combine = compiled.combine_masks
+    has_units = compiled.has_unit_rules
+    bp_rows = [_diagonal_backpointers(compiled, tokens, rows[0])] if backpointers else None
+    for length in range(2, n + 1):
+        row = []
+        bp_row = [] if backpointers else None
+        rule_checks = 0  # Jumlah pasangan (kiri, kanan) tidak kosong yang digabungkan
+        for i in range(n - length + 1):
+            j = i + length - 1
+            acc = 0
+            if backpointers:
+                # Titik potong diiterasi mundur agar k terbesar tercatat lebih dulu
+                cell_bp = {}
+                for k in range(j - 1, i - 1, -1):
+                    left = rows[k - i][i]
+                    if not left:
+                        continue
+                    right = rows[j - k - 1][k + 1]
+                    if right:
+                        rule_checks += 1
+                        new_mask = combine(left, right)
+                        if new_mask:
+                            acc |= new_mask
+                            _record_backpointers(cell_bp, new_mask, left, right, k,
+                                                 compiled.rule_ids)
+            else:
+                for k in range(i, j):
+                    left = rows[k - i][i]
+                    if not left:
+                        continue
+                    right = rows[j - k - 1][k + 1]
+                    if right:
+                        rule_checks += 1
+                        acc |= combine(left, right)
+            if prune and acc:
+                acc = prune_cell(acc, i, j, n, diagonal)
+            if backpointers:
+                if has_units:
+                    _record_unit_backpointers(cell_bp, acc, compiled.rule_ids)
+                bp_row.append({a: entry[1:] for a, entry in cell_bp.items() if acc >> a & 1})
+            row.append(acc)
+        rows.append(row)
+        if backpointers:
+            bp_rows.append(bp_row)
+        if observer is not None:
+            _observe_row(observer, length, row, _mask_size, len(row) * (length - 1), rule_checks)
+
+        # Laporan kemajuan & pengecekan pembatalan: sekali per baris, bukan per sel
+        if progress is not None:
+            progress(length, n)
+        if cancel is not None and cancel.is_set():
+            raise ParseCancelled()
+
+    if observer is not None:
+        observer.on_phase("fill", time.perf_counter() - started)
+
+    # --- TAHAP 3: PENGECEKAN FINAL ---
+    start_bit = 1 << compiled.symbol_ids[compiled.start_symbol]
+    is_accepted = bool(rows[n - 1][0] & start_bit)
+    return is_accepted, BitChart(compiled, tokens, rows, bp_rows, engine)
+
+def fill_sparse_chart(tokens, grammar, backpointers=False, progress=None, cancel=None,
+                      prune=False, observer=None, fuzzy=False):
+    """
+    Varian engine bit-vector yang digerakkan oleh sel TIDAK KOSONG saja.
+
+    Untuk setiap posisi awal i disimpan daftar span tidak kosong (akhir, mask),
+    dan untuk setiap posisi akhir j disimpan dictionary awal -> mask. Sel (i, j)
+    hanya menggabungkan pasangan (kiri, kanan) yang keduanya hidup, sehingga
+    kalimat yang tidak gramatikal (sebagian besar sel kosong) jauh lebih murah.
+
+    Pengisian juga dihentikan lebih awal jika simbol awal 'K' terbukti tidak
+    mungkin muncul di puncak tabel:
+        1. Ada token yang tidak dikenal (sel diagonal kosong): tidak ada span
+           yang mencakup token itu yang bisa terbentuk, termasuk span penuh.
+        2. Baris panjang L sampai 2L-1 kosong semua: setiap span yang lebih
+           panjang pasti punya satu bagian dengan panjang di rentang kosong
+           tersebut, jadi seluruh baris berikutnya juga kosong.
+    Pada kasus ini chart.complete bernilai False (baris sisanya dianggap kosong).
+
+    Returns:
+        is_accepted (bool), chart (BitChart).
+    """
+    compiled = compile_grammar(grammar)
+    n = len(tokens)
+    if n == 0:
+        return False, BitChart(compiled, tokens, [], engine=_engine_name(True, prune, fuzzy))
+    started = time.perf_counter() if observer is not None else None
+
+    # --- TAHAP 1: DIAGONAL ---
+    terminal_masks = compiled.terminal_masks
+    diagonal = []
+    for i, word in enumerate(tokens):
+        mask = terminal_masks.get(word, 0)
+        if not mask:
+            recovery = compiled.recover_word(word) if fuzzy else None
+            if recovery is not None:
+                mask = recovery.mask
+            else:
+                warn_unknown_token(word)
+            if observer is not None:
+                observer.on_unknown_token(i, word)
+        diagonal.append(mask)
+    rows = [diagonal]
+
+    engine = _engine_name(True, prune, fuzzy)
+
+    if not all(diagonal):
+        # Bukti 1: ada token tak dikenal, 'K' mustahil di puncak
+        if observer is not None:
+            _observe_row(observer, 1, diagonal, _mask_size, 0, 0, started, "lexicon")
+        bp_rows = [_diagonal_backpointers(compiled, tokens, diagonal)] if backpointers else None
+        return False, BitChart(compiled, tokens, rows, bp_rows, engine)
+
+    # Pemangkasan top-down (opsional): konteks diambil dari diagonal asli
+    prune_cell = compiled.analysis.prune_cell if prune else None
+    if prune:
+        rows[0] = [prune_cell(mask, i, i, n, diagonal) for i, mask in enumerate(diagonal)]
+    if observer is not None:
+        started = _observe_row(observer, 1, rows[0], _mask_size, 0, 0, started, "lexicon")
+    bp_rows = [_diagonal_backpointers(compiled, tokens, rows[0])] if backpointers else None
+
+    # Span hidup per posisi awal (urut panjang naik) dan per posisi akhir
+    live_by_start = [[(i, mask)] if mask else [] for i, mask in enumerate(rows[0])]
+    live_by_end = [{j: mask} if mask else {} for j, mask in enumerate(rows[0])]
+
+    combine = compiled.combine_masks
+    has_units = compiled.has_unit_rules
+    empty_run_start = None
+
+    # --- TAHAP 2: KOMBINASI, hanya pasangan sel yang hidup ---
+    for length in range(2, n + 1):
+        row = []
+        bp_row = [] if backpointers else None
+        row_has_content = False
+        splits = rule_checks = 0
+        for i in range(n - length + 1):
+            j = i + length - 1
+            ends_at_j = live_by_end[j]
+            splits += len(live_by_start[i])
+            acc = 0
+            if backpointers:
+                cell_bp = {}
+                # Titik potong mundur (k terbesar dulu), sama seperti engine dense
+                for k, left in reversed(live_by_start[i]):
+                    right = ends_at_j.get(k + 1)
+                    if right:
+                        rule_checks += 1
+                        new_mask = combine(left, right)
+                        if new_mask:
+                            acc |= new_mask
+                            _record_backpointers(cell_bp, new_mask, left, right, k,
+                                                 compiled.rule_ids)
+            else:
+                for k, left in live_by_start[i]:
+                    # Daftar urut berdasarkan k; span yang melewati j belum ada
+                    # karena baris diisi dari panjang kecil ke besar.
+                    right = ends_at_j.get(k + 1)
+                    if right:
+                        rule_checks += 1
+                        acc |= combine(left, right)
+            if prune and acc:
+                acc = prune_cell(acc, i, j, n, diagonal)
+            if backpointers:
+                if has_units:
+                    _record_unit_backpointers(cell_bp, acc, compiled.rule_ids)
+                bp_row.append({a: entry[1:] for a, entry in cell_bp.items() if acc >> a & 1})
+            row.append(acc)
+            if acc:
+                row_has_content = True
+        # Span baru baru didaftarkan setelah satu baris selesai, agar span
+        # sepanjang 'length' tidak ikut dipakai sebagai bagian di baris ini.
+        for i, acc in enumerate(row):
+            if acc:
+                j = i + length - 1
+                live_by_start[i].append((j, acc))
+                live_by_end[j][i] = acc
+        rows.append(row)
+        if backpointers:
+            bp_rows.append(bp_row)
+        if observer is not None:
+            _observe_row(observer, length, row, _mask_size, splits, rule_checks)
+
+        if progress is not None:
+            progress(length, n)
+        if cancel is not None and cancel.is_set():
+            raise ParseCancelled()
+
+        # Bukti 2: baris L .. 2L-1 kosong semua
+        if row_has_content:
+            empty_run_start = None
+        else:
+            if empty_run_start is None:
+                empty_run_start = length
+            if length >= 2 * empty_run_start - 1 and length < n:
+                if observer is not None:
+                    observer.on_phase("fill", time.perf_counter() - started)
+                return False, BitChart(compiled, tokens, rows, bp_rows, engine)
+
+    if observer is not None:
+        observer.on_phase("fill", time.perf_counter() - started)
+
+    # --- TAHAP 3: PENGECEKAN FINAL ---
+    start_bit = 1 << compiled.symbol_ids[compiled.start_symbol]
+    is_accepted = bool(rows[n - 1][0] & start_bit)
+
+    return is_accepted, BitChart(compiled, tokens, rows, bp_rows, engine)
+
+def get_parse_tree_structure(grammar, table, tokens, cache=None):
+    """
+    Mengubah Tabel CYK menjadi struktur data Pohon (Nested Tuple).
+    Penelusuran dilakukan secara iteratif dan memakai back-pointer jika tabel
+    berasal dari cyk_parse_bitset(..., backpointers=True).
     Output contoh: ('K', ('P', 'jegeg'), ('S', 'tiang'))
+
+    Argumen grammar boleh berupa dictionary atau CompiledGrammar.
+    Jika 'cache' (ParseCache) diberikan, pohon disimpan bersama entri hasil
+    parse kalimat yang sama dan tidak dihitung ulang.
     """
     n = len(tokens)
+    compiled = compile_grammar(grammar)
+
+    entry = None
+    if cache is not None and n > 0:
+        engine = _cache_engine(table)
+        # Melengkapi entri hasil parse yang sudah ada: bukan lookup baru untuk statistik
+        entry = _cache_lookup(cache, compiled, engine, tokens, count=False)
+        if entry is not None and entry["tree"] is not _TREE_NOT_COMPUTED:
+            return entry["tree"]
+
+    tree = _build_parse_tree(compiled, table, tokens)
+    if compiled.cnf_origin is not None:
+        # Grammar hasil konversi CFG -> CNF: tampilkan label CFG aslinya
+        from cnf_converter import debinarize_tree
+        tree = debinarize_tree(tree, compiled.cnf_origin)
 
-    # Fungsi pembantu rekursif di dalam (nested function)
-    def backtrack(simbol, i, j):
-        # 1. BASIS (Kondisi Berhenti): Jika i == j, berarti kita ada di level kata (Daun)
-        #    Ini terjadi ketika panjang substring adalah 1.
-        if i == j:
-            # Kembalikan tuple (Simbol, Kata_Asli)
-            # Contoh: ('Noun', 'buku')
-            return (simbol, tokens[i])
-
-        # 2. REKURSI: Cari aturan mana yang membentuk simbol ini
-        if simbol in grammar:
-            # Cek semua aturan produksi untuk simbol ini (misal K -> P S)
-            for rhs in grammar[simbol]:
-
-                # Kita hanya perhatikan aturan biner A -> B C (2 non-terminal di RHS) karena ini CNF
-                if len(rhs) == 2:
-                    B, C = rhs[0], rhs[1]
-
-                    # Kita harus mencari titik potong 'k' yang valid.
-                    # Loop dari KANAN ke KIRI (range mundur).
-                    # Ini memprioritaskan "Anak Kiri Besar" (Greedy Left).
-                    # Dengan loop mundur, kita cek k di posisi paling kanan dulu.
-                    for k in range(j - 1, i - 1, -1):
-                        if B in table[i][k] and C in table[k+1][j]:
-
-                            # Jika ya, berarti kita menemukan jalurnya!
-                            # Lakukan rekursi ke anak kiri (B) dan anak kanan (C)
-                            left_node = backtrack(B, i, k)
-                            right_node = backtrack(C, k+1, j)
-
-                            # Jika kedua anak berhasil mengembalikan node (tidak None)
-                            if left_node and right_node:
-                                # Kembalikan struktur pohon: (Induk, AnakKiri, AnakKanan)
-                                return (simbol, left_node, right_node)
-        return None # Jika tidak ada jalur yang valid
+    if entry is not None:
+        from parse_cache import estimate_size
+        entry["tree"] = tree
+        key = (engine, tuple(tokens))
+        cache.resize(compiled.fingerprint, key, estimate_size((tokens, entry["cells"], tree)))
+
+    return tree
+
+
+def _assemble_tree(root, children, tokens, label=None):
+    """
+    Menyusun nested tuple pohon parse secara ITERATIF (tanpa rekursi),
+    sehingga kalimat panjang tidak terkena batas rekursi Python.
+
+    Args:
+        root (tuple): Node akar (simbol, i, j).
+        children (callable): Fungsi node -> tuple node anak: (kiri, kanan) untuk
+                             aturan biner, (anak,) untuk aturan unit, dan ()
+                             untuk daun (A -> 'kata').
+        tokens (list): Daftar token (daun pohon).
+        label (callable): Opsional, mengubah simbol node menjadi nama tampilan.
+    """
+    # Urutan pre-order lewat stack eksplisit, lalu dibangun dari belakang
+    # (anak selalu selesai dibangun sebelum induknya).
+    order = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(reversed(children(node)))
+
+    built = {}
+    for node in reversed(order):
+        simbol, i, j = node
+        if label is not None:
+            simbol = label(simbol)
+        kids = children(node)
+        if not kids:
+            # Daun: (Simbol, Kata_Asli), contoh: ('Noun', 'buku')
+            built[node] = (simbol, tokens[i])
+        else:
+            # Struktur pohon: (Induk, AnakKiri, AnakKanan), atau (Induk, Anak)
+            # untuk aturan unit, contoh: ('S', ('NP', ...))
+            built[node] = (simbol,) + tuple(built[child] for child in kids)
+    return built[root]
+
+
+def extract_parse_tree(chart, symbol=None):
+    """
+    Mengambil pohon parse langsung dari back-pointer BitChart dalam O(n).
+    chart harus hasil cyk_parse_bitset(..., backpointers=True).
+
+    Returns:
+        Nested tuple pohon parse, atau None jika simbol tidak ada di puncak tabel.
+    """
+    compiled = chart.compiled
+    tokens = chart.tokens
+    n = len(tokens)
+    if n == 0:
+        return None
+
+    start = compiled.symbol_ids[symbol or compiled.start_symbol]
+    if not chart.rows[n - 1][0] >> start & 1:
+        return None
+
+    names = compiled.symbols
+    bp_rows = chart.backpointers
+
+    def children(node):
+        a, i, j = node
+        entry = bp_rows[j - i][i].get(a)
+        if entry is None:
+            return ()  # Daun
+        k, b, c = entry
+        if c < 0:
+            return ((b, i, j),)  # Aturan unit A -> B
+        return (b, i, k), (c, k + 1, j)
+
+    # Node disimpan sebagai indeks bit; label mengubahnya ke nama simbol
+    return _assemble_tree((start, 0, n - 1), children, tokens, label=names.__getitem__)
+
+
+def _build_parse_tree(compiled, table, tokens):
+    """Penelusuran balik tabel CYK menjadi pohon parse (dipakai get_parse_tree_structure)."""
+    n = len(tokens)
+    if n == 0:
+        return None
+
+    # Jalur cepat: back-pointer sudah dicatat saat tabel diisi
+    if isinstance(table, BitChart) and table.backpointers is not None:
+        return extract_parse_tree(table)
+
+    # Jalur umum: cari aturan pembentuk setiap node dari isi tabel.
+    # Hasil pilihan di-memo per (simbol, i, j) agar tidak dicari ulang.
+    memo = {}
+
+    def children(node):
+        if node in memo:
+            return memo[node]
+        simbol, i, j = node
+        # Sel diagonal: aturan terminal langsung (A -> 'kata') didahulukan
+        if i == j and simbol in compiled.direct_terminal_symbols(tokens[i]):
+            memo[node] = ()
+            return memo[node]
+        # Cek aturan A -> B C dan A -> B untuk simbol ini (misal K -> P S, S -> NP),
+        # sesuai urutan aturan di grammar (sudah diindeks di rule_order).
+        for rule in compiled.rule_order.get(simbol, ()):
+            if len(rule) == 1:
+                # Aturan unit: anak mencakup span yang sama
+                if rule[0] in table[i][j]:
+                    memo[node] = ((rule[0], i, j),)
+                    return memo[node]
+                continue
+            B, C = rule
+            # Loop titik potong k dari KANAN ke KIRI (range mundur).
+            # Ini memprioritaskan "Anak Kiri Besar" (Greedy Left).
+            for k in range(j - 1, i - 1, -1):
+                if B in table[i][k] and C in table[k+1][j]:
+                    memo[node] = ((B, i, k), (C, k + 1, j))
+                    return memo[node]
+        raise ValueError(f"Simbol '{simbol}' pada sel ({i}, {j}) tidak memiliki aturan pembentuk.")
 
     # Mulai proses dari simbol awal 'K' (Kalimat) yang ada di puncak tabel (0, n-1)
-    if 'K' in table[0][n-1]:
-        return backtrack('K', 0, n-1)
+    start = compiled.start_symbol
+    if start in table[0][n-1]:
+        return _assemble_tree((start, 0, n - 1), children, tokens)
 
     return None # Jika simbol K tidak ada di puncak, berarti kalimat tidak valid
 
@@ -419,8 +1800,16 @@ def get_cyk_table_string(table, tokens):
 # BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
 # ==========================================
 if __name__ == "__main__":
-    # 1. Memuat Grammar
-    my_grammar = get_bali_grammar()
+    import sys
+
+    # Jika diberi sub-perintah (misal: python -m cyk_parser validate korpus.txt),
+    # serahkan ke CLI. Tanpa argumen, jalankan mode interaktif seperti biasa.
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+
+    # 1. Memuat Grammar (dikompilasi sekali agar pencarian aturan O(1))
+    my_grammar = compile_grammar(get_bali_grammar())
 
     # 2. Input Pengguna
     kalimat_input = input("Inputkan kalimat bahasa Bali: ").strip()
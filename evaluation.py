@@ -3,16 +3,24 @@
 #            dan dataset_negatif.txt menggunakan Algoritma CYK (Cocke-Kasami-Younger)
 # =======================================================================================
 
-from cyk_parser import get_bali_grammar, cyk_parse
+from cyk_parser import get_bali_grammar, compile_grammar
+from batch_parser import parse_many
 
 ###
 
-def run_full_evaluation(positive_sentences, negative_sentences, grammar):
+def run_full_evaluation(positive_sentences, negative_sentences, grammar, workers=1):
     """
     Fungsi untuk menjalankan skenario evaluasi lengkap dengan Confusion Matrix.
+    Argumen grammar boleh berupa dictionary atau CompiledGrammar; grammar
+    dikompilasi sekali di awal lalu dipakai untuk seluruh kalimat.
+
+    Parsing dilakukan lewat parse_many(); gunakan workers > 1 (atau None untuk
+    semua core CPU) agar dataset besar di-parse secara paralel.
     """
     import time
 
+    grammar = compile_grammar(grammar)
+
     # Inisialisasi Counter
     TP = 0  # True Positive (Data Positif, Terdeteksi Valid)
     FN = 0  # False Negative (Data Positif, Terdeteksi Invalid/Salah)
@@ -26,12 +34,11 @@ def run_full_evaluation(positive_sentences, negative_sentences, grammar):
     counter = 1
     
     # --- TAHAP 1: PENGUJIAN DATA POSITIF (Harapannya VALID) ---
-    for kalimat in positive_sentences:
-        kalimat_bersih = kalimat.strip().lower()
-        
-        # Jalankan CYK
-        is_valid, _, tokens_baru = cyk_parse(kalimat_bersih, grammar)
-        kalimat_display = ' '.join(tokens_baru)
+    kalimat_positif = (kalimat.strip().lower() for kalimat in positive_sentences)
+    for hasil in parse_many(kalimat_positif, grammar, workers=workers):
+        # Hasil CYK (sudah di-parse oleh parse_many)
+        is_valid = hasil.is_accepted
+        kalimat_display = ' '.join(hasil.tokens)
 
         if is_valid:
             prediksi = "VALID"
@@ -46,12 +53,11 @@ def run_full_evaluation(positive_sentences, negative_sentences, grammar):
         counter += 1
 
     # --- TAHAP 2: PENGUJIAN DATA NEGATIF (Harapannya INVALID) ---
-    for kalimat in negative_sentences:
-        kalimat_bersih = kalimat.strip().lower()
-        
-        # Jalankan CYK
-        is_valid, _, tokens_baru = cyk_parse(kalimat_bersih, grammar)
-        kalimat_display = ' '.join(tokens_baru)
+    kalimat_negatif = (kalimat.strip().lower() for kalimat in negative_sentences)
+    for hasil in parse_many(kalimat_negatif, grammar, workers=workers):
+        # Hasil CYK (sudah di-parse oleh parse_many)
+        is_valid = hasil.is_accepted
+        kalimat_display = ' '.join(hasil.tokens)
 
         if not is_valid:  # Jika sistem menolak, itu bagus!
             prediksi = "INVALID"
@@ -91,8 +97,8 @@ def run_full_evaluation(positive_sentences, negative_sentences, grammar):
 # BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
 # ==========================================
 if __name__ == "__main__":
-    # 1. Memuat Grammar
-    my_grammar = get_bali_grammar()
+    # 1. Memuat Grammar (dikompilasi sekali untuk seluruh dataset)
+    my_grammar = compile_grammar(get_bali_grammar())
     
     # Nama File
     file_positif = 'dataset_positif.txt' # Ubah nama file Anda yang berisi 50 kalimat disini
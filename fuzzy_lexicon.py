@@ -0,0 +1,181 @@
+# =======================================================================================
+# Deskripsi: Indeks edit-distance (deletion dictionary ala SymSpell) untuk mencari kata
+#            lexicon terdekat dari token yang tidak dikenal (salah ketik / hasil OCR)
+# =======================================================================================
+
+from collections import namedtuple
+
+# Hasil pemulihan satu token tak dikenal lewat kata lexicon terdekat.
+#   distance    : jarak edit ke kandidat (1 .. max_distance)
+#   words       : tuple kandidat pada jarak tersebut (urut alfabet)
+#   symbols     : frozenset LHS aturan terminal langsung semua kandidat
+#   rule_mask   : versi bitmask dari 'symbols'
+#   mask        : rule_mask setelah penutupan unit (isi sel diagonal)
+OOVRecovery = namedtuple("OOVRecovery", ["distance", "words", "symbols", "rule_mask", "mask"])
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Jarak Damerau-Levenshtein terbatas (optimal string alignment: sisip, hapus,
+    ganti, tukar dua huruf bersebelahan). Mengembalikan max_distance + 1 jika
+    jaraknya melebihi max_distance.
+    """
+    # Awalan & akhiran yang sama tidak mengubah jarak; kata mirip biasanya
+    # hanya berbeda di satu-dua huruf, jadi matriks DP menjadi sangat kecil
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        distance = len(a) + len(b)
+        return distance if distance <= max_distance else max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        current = [i] * (len(b) + 1)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            value = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (previous2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1]
+                    and previous2[j - 2] + 1 < value):
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    distance = previous[-1]
+    return distance if distance <= max_distance else max_distance + 1
+
+
+def _deletes(word, max_distance):
+    """Semua varian 'word' yang diperoleh dengan menghapus 0 .. max_distance huruf."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class FuzzyLexicon:
+    """
+    Indeks kata lexicon untuk pencarian "kata mirip" dalam jarak edit 1..max_distance.
+
+    Setiap kata lexicon didaftarkan di bawah semua varian hasil menghapus
+    0..max_distance hurufnya (deletion dictionary, teknik SymSpell). Kata query
+    cukup dihapus hurufnya dengan cara yang sama: kandidat adalah kata-kata yang
+    berbagi varian dengan query, lalu diverifikasi dengan jarak edit sebenarnya.
+    Tidak ada pemindaian seluruh lexicon, sehingga satu pencarian hanya butuh
+    beberapa mikrodetik (dan hasilnya di-cache per kata).
+
+    Indeks dibangun SEKALI per grammar (lihat CompiledGrammar.fuzzy_lexicon).
+
+    Args:
+        words (iterable): Kata-kata lexicon (terminal grammar).
+        max_distance (int): Jarak edit maksimal yang dicari.
+    """
+
+    def __init__(self, words, max_distance=2):
+        self.max_distance = max_distance
+        self.words = frozenset(words)
+        index = {}
+        for word in self.words:
+            for variant in _deletes(word, max_distance):
+                index.setdefault(variant, []).append(word)
+        self._index = {variant: tuple(sorted(found)) for variant, found in index.items()}
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.words)
+
+    def lookup(self, word, max_distance=None):
+        """
+        Kata lexicon dalam jarak edit 'max_distance' (default: batas indeks) dari 'word'.
+
+        Returns:
+            list (kata, jarak), urut dari jarak terkecil lalu alfabet.
+        """
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        key = (word, limit)
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        if word in self.words:
+            found = {word: 0}
+        else:
+            found = {}
+            index = self._index
+            for variant in _deletes(word, limit):
+                for candidate in index.get(variant, ()):
+                    if candidate not in found:
+                        found[candidate] = edit_distance(word, candidate, limit)
+        result = sorted(((w, d) for w, d in found.items() if d <= limit), key=lambda item: (item[1], item[0]))
+
+        if len(self._cache) >= 65536:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+    def closest(self, word):
+        """
+        Kandidat terdekat saja: (jarak, tuple kata) untuk jarak edit terkecil yang
+        ditemukan, atau (None, ()) jika tidak ada kata dalam batas jarak.
+        """
+        matches = self.lookup(word)
+        if not matches:
+            return None, ()
+        best = matches[0][1]
+        return best, tuple(w for w, d in matches if d == best)
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    import time
+    from cyk_parser import get_bali_grammar, compile_grammar, cyk_parse, cyk_parse_bitset, get_parse_tree_structure
+    from parse_cache import ParseCache
+
+    my_grammar = compile_grammar(get_bali_grammar())
+    started = time.perf_counter()
+    lexicon = FuzzyLexicon(my_grammar.terminal_index)
+    print(f"Indeks {len(lexicon)} kata dibangun dalam {(time.perf_counter() - started) * 1000:.1f} ms "
+          f"({len(lexicon._index)} varian).")
+
+    for kata in ["jegheg", "jegeg", "cnik", "umha", "wicaksanx", "xyzzy"]:
+        started = time.perf_counter()
+        hasil = lexicon.lookup(kata)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        print(f"  {kata:<10} -> {hasil[:4]}  ({elapsed_us:.1f} us)")
+
+    # Parsing dengan pemulihan kata salah ketik
+    kalimat = "Jegheg sajan Putu"
+    for fuzzy in (False, True):
+        is_accepted, chart, tokens = cyk_parse_bitset(kalimat, my_grammar, sparse=True, fuzzy=fuzzy)
+        print(f"\n'{kalimat}' fuzzy={fuzzy}: {'VALID' if is_accepted else 'TIDAK VALID'}")
+        if is_accepted:
+            print("  ", get_parse_tree_structure(my_grammar, chart, tokens))
+
+    # Pohon hasil parsing fuzzy tidak boleh menjawab lookup parsing biasa di cache
+    cache = ParseCache()
+    for parse in (cyk_parse, cyk_parse_bitset):
+        for fuzzy in (False, True, False):
+            is_accepted, chart, tokens = parse(kalimat, my_grammar, cache=cache, fuzzy=fuzzy)
+            tree = get_parse_tree_structure(my_grammar, chart, tokens, cache=cache)
+            assert is_accepted == fuzzy and (tree is not None) == fuzzy, (parse.__name__, fuzzy, tree)
+    print("\nCache: pohon fuzzy dan non-fuzzy tersimpan terpisah.")
@@ -0,0 +1,168 @@
+# =======================================================================================
+# Deskripsi: Analisis grammar (keterjangkauan simbol & konteks kiri/kanan) untuk
+#            memangkas simbol yang mustahil ikut membentuk 'K' dari sel tabel CYK
+# =======================================================================================
+
+from cyk_parser import compile_grammar
+
+
+def _closure(seeds, step):
+    """Titik tetap (fixpoint): mulai dari 'seeds', tambahkan step(x) sampai tidak bertambah."""
+    result = set(seeds)
+    stack = list(seeds)
+    while stack:
+        sym = stack.pop()
+        for nxt in step(sym):
+            if nxt not in result:
+                result.add(nxt)
+                stack.append(nxt)
+    return result
+
+
+class GrammarAnalysis:
+    """
+    Hasil analisis statis grammar terhadap simbol awal (default 'K').
+
+    Atribut:
+        parents_as_left (dict): X -> {A: set(C)} untuk aturan A -> X C.
+        parents_as_right (dict): X -> {A: set(B)} untuk aturan A -> B X.
+        reachable (set): Simbol yang dapat muncul dalam derivasi dari 'K'.
+        left_edge (set): Simbol yang dapat menempati span yang DIMULAI di posisi 0.
+        right_edge (set): Simbol yang dapat menempati span yang BERAKHIR di posisi n-1.
+        left_corner (dict): X -> simbol yang dapat menjadi keturunan paling kiri X
+                            (termasuk X sendiri).
+        right_corner (dict): X -> simbol yang dapat menjadi keturunan paling kanan X.
+
+    Pemangkasan (prune_cell) memakai fakta berikut untuk simbol X di sel (i, j)
+    yang bukan span penuh:
+        - Jika X menjadi anak KIRI dari A -> X C, maka C dimulai di token j+1,
+          sehingga sel diagonal j+1 harus berisi salah satu left_corner[C].
+        - Jika X menjadi anak KANAN dari A -> B X, maka B berakhir di token i-1,
+          sehingga sel diagonal i-1 harus berisi salah satu right_corner[B].
+        - Span di posisi 0 hanya bisa menjadi anak kiri (dengan induk di left_edge),
+          span yang berakhir di n-1 hanya bisa menjadi anak kanan (induk di right_edge).
+        - Span penuh (0, n-1) hanya perlu menyimpan simbol awal (dan simbol yang
+          diturunkan darinya lewat aturan unit).
+        - Aturan unit A -> X: X boleh memakai peran apa pun milik A, karena A
+          berada di sel yang sama (penutupan unit).
+    Jika tidak ada peran yang mungkin, X dibuang dari sel. Pemangkasan ini aman:
+    simbol yang dibuang tidak mungkin menjadi bagian dari derivasi 'K'.
+    """
+
+    def __init__(self, grammar, start_symbol=None):
+        compiled = compile_grammar(grammar)
+        self.compiled = compiled
+        start = start_symbol or compiled.start_symbol
+        self.start_symbol = start
+
+        symbols = compiled.symbols
+        parents_as_left = {sym: {} for sym in symbols}
+        parents_as_right = {sym: {} for sym in symbols}
+        # children[A]: pasangan (anak paling kiri, anak paling kanan) per aturan;
+        # aturan unit A -> B ditulis (B, B) karena B sekaligus kiri dan kanan
+        children = {sym: [] for sym in symbols}
+        for A, pairs in compiled.binary_rules.items():
+            for B, C in pairs:
+                parents_as_left[B].setdefault(A, set()).add(C)
+                parents_as_right[C].setdefault(A, set()).add(B)
+                children[A].append((B, C))
+        for A, targets in compiled.unit_rules.items():
+            children[A].extend((B, B) for B in targets)
+        self.parents_as_left = parents_as_left
+        self.parents_as_right = parents_as_right
+
+        self.reachable = _closure([start], lambda A: [s for pair in children[A] for s in pair])
+        self.left_edge = _closure([start], lambda A: [B for B, _ in children[A]])
+        self.right_edge = _closure([start], lambda A: [C for _, C in children[A]])
+        self.left_corner = {
+            sym: _closure([sym], lambda A: [B for B, _ in children[A]]) for sym in symbols
+        }
+        self.right_corner = {
+            sym: _closure([sym], lambda A: [C for _, C in children[A]]) for sym in symbols
+        }
+
+        # --- Versi bitmask untuk dipakai di dalam pengisian tabel ---
+        encode = compiled.encode
+        left_corner_mask = {sym: encode(s) for sym, s in self.left_corner.items()}
+        right_corner_mask = {sym: encode(s) for sym, s in self.right_corner.items()}
+
+        closure = compiled.unary_closure
+
+        def context_mask(parents_of, corner_mask, allowed, sym):
+            # Peran X sendiri ditambah peran semua A dengan A =>* X lewat aturan unit
+            mask = 0
+            for ancestor in closure.get(sym, (sym,)):
+                for A, siblings in parents_of[ancestor].items():
+                    if A in allowed:
+                        for sibling in siblings:
+                            mask |= corner_mask[sibling]
+            return mask
+
+        # Per bit simbol X: mask diagonal yang harus "bertemu" token sesudah/sebelum span
+        self._next_interior = [context_mask(parents_as_left, left_corner_mask, self.reachable, s) for s in symbols]
+        self._next_edge = [context_mask(parents_as_left, left_corner_mask, self.left_edge, s) for s in symbols]
+        self._prev_interior = [context_mask(parents_as_right, right_corner_mask, self.reachable, s) for s in symbols]
+        self._prev_edge = [context_mask(parents_as_right, right_corner_mask, self.right_edge, s) for s in symbols]
+
+        # Span penuh: simbol awal beserta rantai unit di bawahnya (misal K -> S -> NP)
+        self.start_mask = encode([s for s in symbols if start in closure.get(s, (s,))])
+        self._prune_cache = {}
+
+    def prune_cell(self, mask, i, j, n, diagonal):
+        """
+        Membuang simbol yang mustahil ikut derivasi 'K' dari bitmask sel (i, j).
+
+        Args:
+            mask (int): Bitmask sel sebelum dipangkas.
+            i, j (int): Posisi awal dan akhir span.
+            n (int): Jumlah token kalimat.
+            diagonal (list): Bitmask diagonal (sel panjang 1) SEBELUM dipangkas.
+        """
+        if not mask:
+            return 0
+        if i == 0 and j == n - 1:
+            return mask & self.start_mask
+
+        next_diag = diagonal[j + 1] if j < n - 1 else None
+        prev_diag = diagonal[i - 1] if i > 0 else None
+        key = (mask, i == 0, j == n - 1, next_diag, prev_diag)
+        cached = self._prune_cache.get(key)
+        if cached is not None:
+            return cached
+
+        next_masks = self._next_edge if i == 0 else self._next_interior
+        prev_masks = self._prev_edge if j == n - 1 else self._prev_interior
+        keep = 0
+        m = mask
+        while m:
+            low = m & -m
+            x = low.bit_length() - 1
+            m ^= low
+            if next_diag is not None and next_diag & next_masks[x]:
+                keep |= low
+            elif prev_diag is not None and prev_diag & prev_masks[x]:
+                keep |= low
+
+        if len(self._prune_cache) >= 65536:
+            self._prune_cache.clear()
+        self._prune_cache[key] = keep
+        return keep
+
+    def unreachable_symbols(self):
+        """Simbol yang tidak pernah bisa muncul dalam derivasi dari simbol awal."""
+        return [sym for sym in self.compiled.symbols if sym not in self.reachable]
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    from cyk_parser import get_bali_grammar
+
+    analysis = GrammarAnalysis(get_bali_grammar())
+    print(f"Simbol tak terjangkau dari '{analysis.start_symbol}': {analysis.unreachable_symbols()}")
+    print(f"Simbol di tepi kiri  : {sorted(analysis.left_edge)}")
+    print(f"Simbol di tepi kanan : {sorted(analysis.right_edge)}")
+    for sym in analysis.compiled.symbols:
+        parents = sorted(set(analysis.parents_as_left[sym]) | set(analysis.parents_as_right[sym]))
+        print(f"  {sym:<10} -> induk: {', '.join(parents) if parents else '-'}")
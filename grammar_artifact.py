@@ -0,0 +1,262 @@
+# =======================================================================================
+# Deskripsi: Artefak grammar terkompilasi di disk (format biner berversi) agar proses
+#            worker dapat memuat tabel CYK tanpa membangun ulang grammar dan indeksnya
+# =======================================================================================
+
+import os
+import sys
+import mmap
+import struct
+import marshal
+import hashlib
+import logging
+
+from cyk_parser import CompiledGrammar, compile_grammar, grammar_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Tata letak file artefak:
+#   [header tetap] [payload marshal]
+# Header (little-endian):
+#   magic (4 byte)           : b"CYKG"
+#   format_version (uint16)  : versi tata letak payload (lihat FORMAT_VERSION)
+#   python (2 x uint8)       : versi mayor/minor Python penulis (format marshal
+#                              hanya dijamin sama untuk versi Python yang sama)
+#   marshal_version (uint32) : marshal.version milik Python penulis
+#   checksum (32 byte)       : SHA-256 dari payload
+#   fingerprint (40 byte)    : sidik jari grammar sumber (CompiledGrammar.fingerprint)
+#   source_signature (32 byte): SHA-256 dari (nama, mtime, ukuran) file direktori grammar
+#                              sumber saat artefak ditulis; nol jika sumbernya tidak diketahui
+#   payload_size (uint64)    : panjang payload dalam byte
+MAGIC = b"CYKG"
+FORMAT_VERSION = 4
+_HEADER = struct.Struct("<4sHBBI32s40s32sQ")
+_NO_SOURCE = bytes(32)
+
+
+class GrammarArtifactError(ValueError):
+    """File artefak grammar rusak, tidak cocok versinya, atau sudah basi (stale)."""
+
+
+def _source_signature(directory):
+    """Ringkasan 32 byte dari nama, mtime, dan ukuran file direktori grammar (tanpa membaca isinya)."""
+    from grammar_loader import directory_signature
+
+    signature = directory_signature(os.path.abspath(directory))
+    return hashlib.sha256(repr(signature).encode("utf-8")).digest()
+
+
+def write_grammar_artifact(grammar, path, source=None):
+    """
+    Menyimpan grammar terkompilasi (tabel simbol, indeks terminal, indeks aturan
+    biner, trie akhiran) ke file artefak biner.
+
+    File ditulis ke file sementara lalu diganti secara atomik, sehingga pembaca
+    lain tidak pernah melihat artefak yang setengah tertulis.
+
+    Args:
+        grammar (dict | CompiledGrammar | str): Aturan tata bahasa atau direktori grammar.
+        path (str): Lokasi file artefak.
+        source (str | None): Direktori grammar sumber (default: 'grammar' jika berupa
+            direktori). Tanda tangan file-nya disimpan di header sehingga
+            stale_artifact_source() tidak perlu mem-parse ulang sumber yang tidak berubah.
+
+    Returns:
+        dict: Informasi header artefak yang ditulis (lihat read_artifact_header()).
+    """
+    if source is None and isinstance(grammar, str):
+        source = grammar
+    signature = _source_signature(source) if source is not None and os.path.isdir(source) else _NO_SOURCE
+    compiled = compile_grammar(grammar)
+    payload = marshal.dumps(compiled.to_tables())
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, sys.version_info[0], sys.version_info[1], marshal.version,
+        hashlib.sha256(payload).digest(), compiled.fingerprint.encode("ascii"), signature,
+        len(payload),
+    )
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return _unpack_header(header, path)
+
+
+def _unpack_header(raw, path):
+    """Mengurai dan memvalidasi header artefak (tanpa memeriksa payload)."""
+    if len(raw) < _HEADER.size:
+        raise GrammarArtifactError(f"Artefak grammar '{path}' terlalu pendek (bukan artefak CYK).")
+    magic, version, py_major, py_minor, marshal_version, checksum, fingerprint, signature, size = (
+        _HEADER.unpack_from(raw)
+    )
+    if magic != MAGIC:
+        raise GrammarArtifactError(f"File '{path}' bukan artefak grammar CYK.")
+    if version != FORMAT_VERSION:
+        raise GrammarArtifactError(
+            f"Versi artefak '{path}' adalah {version}, versi yang didukung {FORMAT_VERSION}. "
+            "Jalankan ulang 'compile-grammar'."
+        )
+    return {
+        "format_version": version,
+        "python": (py_major, py_minor),
+        "marshal_version": marshal_version,
+        "checksum": checksum.hex(),
+        "fingerprint": fingerprint.decode("ascii"),
+        "source_signature": signature.hex() if signature != _NO_SOURCE else None,
+        "payload_size": size,
+    }
+
+
+def read_artifact_header(path):
+    """Membaca header artefak saja (murah; payload tidak dimuat)."""
+    with open(path, "rb") as f:
+        return _unpack_header(f.read(_HEADER.size), path)
+
+
+def load_grammar_artifact(path, expected_fingerprint=None, verify=True):
+    """
+    Memuat CompiledGrammar dari file artefak tanpa membangun ulang tabelnya.
+
+    File dipetakan ke memori (mmap) dan payload dibaca langsung dari peta
+    tersebut, tanpa salinan perantara.
+
+    Args:
+        path (str): Lokasi file artefak hasil write_grammar_artifact().
+        expected_fingerprint (str | None): Jika diberikan, artefak ditolak bila
+            dibangun dari grammar yang berbeda (artefak basi).
+        verify (bool): Periksa checksum SHA-256 payload sebelum dimuat.
+
+    Raises:
+        GrammarArtifactError: Jika artefak rusak, versinya berbeda, atau basi.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise GrammarArtifactError(f"Artefak grammar '{path}' terlalu pendek (bukan artefak CYK).")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mapped:
+        header = _unpack_header(mapped[:_HEADER.size], path)
+        if header["python"] != sys.version_info[:2] or header["marshal_version"] != marshal.version:
+            raise GrammarArtifactError(
+                f"Artefak '{path}' dibuat dengan Python {header['python'][0]}.{header['python'][1]}; "
+                "jalankan ulang 'compile-grammar' dengan Python yang sedang dipakai."
+            )
+        if expected_fingerprint is not None and header["fingerprint"] != expected_fingerprint:
+            raise GrammarArtifactError(
+                f"Artefak '{path}' basi: grammar sumber sudah berubah. Jalankan ulang 'compile-grammar'."
+            )
+
+        end = _HEADER.size + header["payload_size"]
+        if len(mapped) != end:
+            raise GrammarArtifactError(f"Ukuran payload artefak '{path}' tidak sesuai header.")
+
+        payload = memoryview(mapped)[_HEADER.size:end]
+        try:
+            if verify and hashlib.sha256(payload).hexdigest() != header["checksum"]:
+                raise GrammarArtifactError(f"Checksum artefak '{path}' tidak cocok (file rusak).")
+            tables = marshal.loads(payload)
+        finally:
+            # mmap tidak bisa ditutup selama masih ada memoryview yang aktif
+            payload.release()
+
+    compiled = CompiledGrammar.from_tables(tables)
+    if compiled.fingerprint != header["fingerprint"]:
+        raise GrammarArtifactError(f"Isi artefak '{path}' tidak sesuai sidik jari pada header.")
+    return compiled
+
+
+def is_artifact_current(path, grammar):
+    """True jika artefak di 'path' ada, valid, dan dibangun dari 'grammar' yang sama."""
+    try:
+        header = read_artifact_header(path)
+    except (OSError, GrammarArtifactError):
+        return False
+    return (
+        header["fingerprint"] == compile_grammar(grammar).fingerprint
+        and header["python"] == sys.version_info[:2]
+        and header["marshal_version"] == marshal.version
+    )
+
+
+def find_grammar_source(path):
+    """Direktori grammar sumber di samping artefak ('grammar/' di direktori yang sama), atau None."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), "grammar")
+    return directory if os.path.isdir(directory) else None
+
+
+def stale_artifact_source(path, source=None):
+    """
+    Memeriksa artefak terhadap direktori grammar sumbernya.
+
+    Sidik jari di header artefak hanya bisa dibandingkan dengan isi file itu
+    sendiri; artefak basi baru terdeteksi jika grammar sumbernya diketahui.
+    Sumber yang dipakai adalah 'source', atau direktori grammar/ di samping
+    artefak (lihat find_grammar_source()).
+
+    Jika tanda tangan file sumber (nama, mtime, ukuran) masih sama dengan yang
+    tercatat di header, artefak dianggap sesuai tanpa membaca sumbernya. Sumber
+    hanya di-parse dan dibandingkan sidik jarinya jika tanda tangan berbeda
+    (atau tidak tercatat), sehingga pemeriksaan di setiap worker tetap murah.
+
+    Returns:
+        Direktori sumber jika artefak BASI terhadapnya; None jika artefak
+        sesuai, tidak ada direktori sumber, atau header tidak bisa dibaca
+        (kesalahan itu dilaporkan saat artefak dimuat).
+    """
+    from grammar_loader import load_grammar_dir
+
+    source = source or find_grammar_source(path)
+    if source is None:
+        return None
+    try:
+        header = read_artifact_header(path)
+    except (OSError, GrammarArtifactError):
+        return None
+    if header["source_signature"] == _source_signature(source).hex():
+        return None
+    if header["fingerprint"] == grammar_fingerprint(load_grammar_dir(source)):
+        return None
+    return source
+
+
+def load_current_grammar(path, source=None):
+    """
+    Memuat artefak seperti load_grammar_artifact(), tetapi jika artefak basi
+    terhadap direktori grammar sumbernya (lihat stale_artifact_source()),
+    grammar dikompilasi ulang dari sumber dengan peringatan lewat logging.
+    Dipakai oleh compile_grammar(path) dan perintah 'validate -g'.
+    """
+    stale_source = stale_artifact_source(path, source)
+    if stale_source is not None:
+        logger.warning(
+            "Artefak '%s' basi: grammar di '%s' sudah berubah. Grammar sumber dipakai; "
+            "jalankan ulang 'compile-grammar' agar artefak bisa dipakai lagi.", path, stale_source,
+        )
+        return compile_grammar(stale_source)
+    return load_grammar_artifact(path)
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    import time
+    import tempfile
+    from cyk_parser import get_bali_grammar
+
+    path = os.path.join(tempfile.gettempdir(), "bali_grammar.cykg")
+
+    started = time.perf_counter()
+    compiled = compile_grammar(get_bali_grammar())
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    info = write_grammar_artifact(compiled, path)
+
+    started = time.perf_counter()
+    loaded = load_grammar_artifact(path, expected_fingerprint=compiled.fingerprint)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    print(f"Artefak    : {path} ({info['payload_size']} byte payload)")
+    print(f"Sidik jari : {info['fingerprint']}")
+    print(f"Kompilasi  : {compile_ms:.2f} ms")
+    print(f"Muat (mmap): {load_ms:.2f} ms")
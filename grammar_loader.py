@@ -0,0 +1,295 @@
+# =======================================================================================
+# Deskripsi: Memuat grammar CNF dan lexicon dari file eksternal, mengekspor grammar
+#            bawaan ke file, dan memuat ulang grammar otomatis saat file berubah
+# =======================================================================================
+
+import os
+import logging
+import threading
+
+from cyk_parser import CompiledGrammar, get_bali_grammar, get_bali_lexicon, compute_unary_closure
+
+logger = logging.getLogger(__name__)
+
+# Tata letak direktori grammar:
+#   <dir>/rules.cnf          : aturan produksi CNF
+#   <dir>/lexicon/<kat>.txt  : daftar kata untuk kategori <kat>, satu kata per baris
+RULES_FILE = "rules.cnf"
+LEXICON_DIR = "lexicon"
+
+_RULES_HEADER = """\
+# Aturan produksi grammar Bahasa Bali (Chomsky Normal Form + aturan unit).
+#
+# Format satu baris:  LHS -> alternatif | alternatif | ...
+#   B C       : aturan biner A -> B C (B dan C adalah non-terminal)
+#   B         : aturan unit A -> B (B adalah non-terminal, tanpa siklus)
+#   @kategori : A -> kata, untuk SETIAP kata di lexicon/<kategori>.txt
+#   "kata"    : aturan terminal tunggal A -> kata
+# LHS yang sama boleh ditulis di beberapa baris; urutan alternatif dipertahankan
+# karena menentukan pohon parse yang dipilih. Baris yang diawali '#' diabaikan.
+"""
+
+
+class GrammarFileError(ValueError):
+    """Isi file grammar/lexicon tidak valid (disertai nama file dan nomor baris)."""
+
+
+def read_word_list(path):
+    """Membaca satu file daftar kata: satu kata per baris, '#' untuk komentar."""
+    words = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word = line.split("#", 1)[0].strip().lower()
+            if word:
+                words.append(word)
+    return words
+
+
+def load_lexicon(directory):
+    """Membaca semua <kategori>.txt di 'directory' menjadi dict kategori -> list kata."""
+    lexicon = {}
+    for name in sorted(os.listdir(directory)):
+        category, ext = os.path.splitext(name)
+        if ext == ".txt":
+            lexicon[category] = read_word_list(os.path.join(directory, name))
+    return lexicon
+
+
+def parse_rules(text, lexicon, source="<rules>"):
+    """
+    Mengubah teks aturan (format rules.cnf) menjadi dictionary grammar yang
+    sama bentuknya dengan hasil get_bali_grammar().
+
+    Raises:
+        GrammarFileError: Jika ada baris yang tidak sesuai format CNF, kategori
+                          lexicon tidak ditemukan, simbol tanpa aturan, atau
+                          siklus aturan unit.
+    """
+    grammar = {}
+    used_symbols = {}
+
+    for line_no, raw in enumerate(text.splitlines(), start=1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        where = f"{source}:{line_no}"
+        if "->" not in line:
+            raise GrammarFileError(f"{where}: baris aturan harus berbentuk 'LHS -> RHS'.")
+
+        lhs, rhs_text = (part.strip() for part in line.split("->", 1))
+        if not lhs or len(lhs.split()) != 1:
+            raise GrammarFileError(f"{where}: LHS harus berupa satu simbol non-terminal.")
+        rules = grammar.setdefault(lhs, [])
+
+        for alternative in rhs_text.split("|"):
+            symbols = alternative.split()
+            if len(symbols) == 2:
+                for sym in symbols:
+                    if sym.startswith(("@", '"')):
+                        raise GrammarFileError(f"{where}: aturan biner hanya boleh berisi non-terminal.")
+                    used_symbols.setdefault(sym, where)
+                rules.append(symbols)
+            elif len(symbols) == 1 and symbols[0].startswith("@"):
+                category = symbols[0][1:]
+                if category not in lexicon:
+                    raise GrammarFileError(f"{where}: kategori lexicon '{category}' tidak ditemukan.")
+                rules.extend([w] for w in lexicon[category])
+            elif len(symbols) == 1 and len(symbols[0]) > 2 and symbols[0][0] == symbols[0][-1] == '"':
+                rules.append([symbols[0][1:-1].lower()])
+            elif len(symbols) == 1 and not symbols[0].startswith(("@", '"')):
+                # Aturan unit A -> B; B harus didefinisikan sebagai non-terminal
+                used_symbols.setdefault(symbols[0], where)
+                rules.append(symbols)
+            else:
+                raise GrammarFileError(
+                    f"{where}: alternatif '{alternative.strip()}' bukan bentuk CNF "
+                    "(B C, B, @kategori, atau \"kata\")."
+                )
+
+    for sym, where in used_symbols.items():
+        if sym not in grammar:
+            raise GrammarFileError(f"{where}: simbol '{sym}' dipakai tetapi tidak punya aturan.")
+    try:
+        compute_unary_closure({lhs: [rhs[0] for rhs in rules if len(rhs) == 1 and rhs[0] in grammar]
+                        for lhs, rules in grammar.items()})
+    except ValueError as exc:
+        raise GrammarFileError(f"{source}: {exc}") from None
+    return grammar
+
+
+def load_grammar_dir(directory):
+    """Memuat grammar dari direktori berisi rules.cnf dan lexicon/*.txt."""
+    lexicon = load_lexicon(os.path.join(directory, LEXICON_DIR))
+    rules_path = os.path.join(directory, RULES_FILE)
+    with open(rules_path, "r", encoding="utf-8") as f:
+        return parse_rules(f.read(), lexicon, source=rules_path)
+
+
+def _format_terminals(words, lexicon):
+    """
+    Meringkas deretan terminal satu LHS menjadi referensi @kategori.
+    Di setiap posisi dipilih kategori terpanjang yang isinya cocok berurutan;
+    kata yang tidak tercakup kategori mana pun ditulis sebagai "kata".
+    """
+    parts = []
+    pos = 0
+    while pos < len(words):
+        best = None
+        for category, entries in lexicon.items():
+            if entries and words[pos:pos + len(entries)] == entries:
+                if best is None or len(entries) > len(lexicon[best]):
+                    best = category
+        if best is None:
+            parts.append(f'"{words[pos]}"')
+            pos += 1
+        else:
+            parts.append(f"@{best}")
+            pos += len(lexicon[best])
+    return parts
+
+
+def export_grammar(directory, grammar=None, lexicon=None):
+    """
+    Menulis grammar (default: grammar bawaan) ke 'directory' dalam format yang
+    dibaca load_grammar_dir(). Hasil ekspor dimuat kembali menjadi grammar yang
+    identik (sidik jari sama).
+
+    Returns:
+        str: Path file rules.cnf yang ditulis.
+    """
+    if grammar is None:
+        grammar = get_bali_grammar()
+    if lexicon is None:
+        lexicon = get_bali_lexicon()
+
+    lexicon_dir = os.path.join(directory, LEXICON_DIR)
+    os.makedirs(lexicon_dir, exist_ok=True)
+    for category, words in lexicon.items():
+        with open(os.path.join(lexicon_dir, f"{category}.txt"), "w", encoding="utf-8") as f:
+            f.writelines(f"{word}\n" for word in words)
+
+    lines = [_RULES_HEADER, "\n"]
+    for lhs, rules in grammar.items():
+        # Aturan biner & unit (urutan asli dipertahankan), lalu aturan terminal
+        nonterminal = [" ".join(rhs) for rhs in rules if len(rhs) == 2 or rhs[0] in grammar]
+        terminals = [rhs[0] for rhs in rules if len(rhs) == 1 and rhs[0] not in grammar]
+        lines.append(f"{lhs} -> {' | '.join(nonterminal + _format_terminals(terminals, lexicon))}\n")
+
+    rules_path = os.path.join(directory, RULES_FILE)
+    with open(rules_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    return rules_path
+
+
+def directory_signature(directory):
+    """Ringkasan (nama, mtime, ukuran) semua file grammar, untuk mendeteksi perubahan."""
+    paths = [os.path.join(directory, RULES_FILE)]
+    lexicon_dir = os.path.join(directory, LEXICON_DIR)
+    if os.path.isdir(lexicon_dir):
+        paths += [os.path.join(lexicon_dir, name) for name in sorted(os.listdir(lexicon_dir))]
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+class GrammarReloader:
+    """
+    Menyimpan grammar terkompilasi dari sebuah direktori grammar dan
+    menggantinya secara otomatis ketika file aturan/lexicon berubah.
+
+    Grammar baru dikompilasi di thread latar belakang, lalu dipasang dengan satu
+    penggantian referensi (atribut 'grammar'). Parsing yang sedang berjalan tetap
+    memakai objek grammar lama yang sudah dipegangnya, sehingga tidak ada parse
+    yang terputus; parse berikutnya otomatis memakai grammar baru.
+
+    Jika file baru tidak valid, grammar lama tetap dipakai dan kesalahannya
+    disimpan di 'last_error'.
+
+    Pemakaian:
+        reloader = GrammarReloader("grammar").start()
+        cyk_parse_bitset(kalimat, reloader.grammar)
+    """
+
+    def __init__(self, directory, interval=2.0, on_reload=None):
+        self.directory = directory
+        self.interval = interval
+        self.on_reload = on_reload
+        self.last_error = None
+        self.reload_count = 0
+        self._signature = directory_signature(directory)
+        self.grammar = CompiledGrammar(load_grammar_dir(directory))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """
+        Memeriksa perubahan file sekali (tanpa thread) dan memuat ulang jika perlu.
+        Mengembalikan True jika grammar baru dipasang.
+        """
+        signature = directory_signature(self.directory)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            compiled = CompiledGrammar(load_grammar_dir(self.directory))
+        except (OSError, GrammarFileError) as exc:
+            self.last_error = exc
+            logger.warning("Grammar di '%s' gagal dimuat ulang: %s", self.directory, exc)
+            return False
+
+        self.last_error = None
+        if compiled.fingerprint == self.grammar.fingerprint:
+            return False
+        self.grammar = compiled
+        self.reload_count += 1
+        if self.on_reload is not None:
+            self.on_reload(compiled)
+        return True
+
+    def _watch(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """Menjalankan thread pemantau (daemon). Mengembalikan self."""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._watch, name="grammar-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Menghentikan thread pemantau."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    import tempfile
+    from cyk_parser import compile_grammar
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_path = export_grammar(tmp)
+        loaded = compile_grammar(load_grammar_dir(tmp))
+        builtin = compile_grammar(get_bali_grammar())
+        print(f"Diekspor ke       : {rules_path}")
+        print(f"Sidik jari bawaan : {builtin.fingerprint}")
+        print(f"Sidik jari file   : {loaded.fingerprint}")
+        print(f"Identik           : {loaded.fingerprint == builtin.fingerprint}")
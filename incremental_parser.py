@@ -0,0 +1,112 @@
+# =======================================================================================
+# Deskripsi: Parser CYK inkremental (per token) untuk validasi langsung saat mengetik.
+#            Menambah/menghapus satu token hanya menghitung ulang satu kolom tabel
+# =======================================================================================
+
+from cyk_parser import compile_grammar, BitChart
+
+
+class IncrementalParser:
+    """
+    Parser CYK yang dibangun kolom demi kolom.
+
+    Sel (i, j) hanya bergantung pada token[i..j], sehingga semua sel yang
+    berakhir di posisi j (satu "kolom") bisa dihitung begitu token ke-j
+    diketahui, tanpa menyentuh kolom sebelumnya:
+        - push(token): menambah satu kolom, O(n^2) kombinasi sel.
+        - pop(): membuang kolom terakhir, O(1).
+    Bandingkan dengan cyk_parse() yang selalu O(n^3) dari awal.
+
+    Sel disimpan sebagai bitmask (int), sama seperti engine bit-vector.
+    columns[j][i] adalah bitmask sel (i, j).
+    """
+
+    def __init__(self, grammar):
+        self.compiled = compile_grammar(grammar)
+        self.tokens = []
+        self.columns = []
+        self._start_bit = 1 << self.compiled.symbol_ids[self.compiled.start_symbol]
+
+    def __len__(self):
+        return len(self.tokens)
+
+    @property
+    def is_accepted(self):
+        """True jika token yang sudah dimasukkan membentuk kalimat valid ('K' di puncak)."""
+        if not self.columns:
+            return False
+        return bool(self.columns[-1][0] & self._start_bit)
+
+    @property
+    def unknown_tokens(self):
+        """Daftar (posisi, token) yang tidak ada di lexicon."""
+        return [(j, token) for j, token in enumerate(self.tokens) if not self.columns[j][j]]
+
+    def push(self, token):
+        """
+        Menambahkan satu token di akhir dan menghitung kolom barunya.
+        Mengembalikan status penerimaan kalimat setelah token ditambahkan.
+        """
+        compiled = self.compiled
+        combine = compiled.combine_masks
+        columns = self.columns
+        j = len(self.tokens)
+
+        column = [0] * (j + 1)
+        column[j] = compiled.terminal_masks.get(token, 0)
+
+        # Sel (i, j) dihitung dari i = j-1 turun ke 0, karena sel kanan
+        # (k+1, j) dengan k >= i sudah dihitung lebih dulu di kolom yang sama.
+        for i in range(j - 1, -1, -1):
+            acc = 0
+            for k in range(i, j):
+                left = columns[k][i]
+                if not left:
+                    continue
+                right = column[k + 1]
+                if right:
+                    acc |= combine(left, right)
+            column[i] = acc
+
+        self.tokens.append(token)
+        columns.append(column)
+        return self.is_accepted
+
+    def pop(self):
+        """Membuang token terakhir beserta kolomnya. Mengembalikan token tersebut."""
+        self.columns.pop()
+        return self.tokens.pop()
+
+    def reset(self):
+        """Mengosongkan parser."""
+        self.tokens = []
+        self.columns = []
+
+    def sync(self, tokens):
+        """
+        Menyamakan isi parser dengan list token baru: kolom untuk awalan
+        (prefix) yang sama dipertahankan, sisanya di-pop lalu di-push ulang.
+        Mengembalikan status penerimaan.
+        """
+        common = 0
+        limit = min(len(tokens), len(self.tokens))
+        while common < limit and tokens[common] == self.tokens[common]:
+            common += 1
+        while len(self.tokens) > common:
+            self.pop()
+        for token in tokens[common:]:
+            self.push(token)
+        return self.is_accepted
+
+    def feed_text(self, sentence):
+        """Tokenisasi kalimat (dengan tokenizer grammar) lalu sync(). Mengembalikan status penerimaan."""
+        return self.sync(self.compiled.tokenizer.tokenize(sentence))
+
+    def to_chart(self):
+        """Mengubah kolom-kolom menjadi BitChart (view kompatibel table[i][j])."""
+        n = len(self.tokens)
+        rows = [
+            [self.columns[i + length - 1][i] for i in range(n - length + 1)]
+            for length in range(1, n + 1)
+        ]
+        return BitChart(self.compiled, list(self.tokens), rows)
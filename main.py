@@ -1,6 +1,28 @@
+import os
+import queue
+import logging
+import threading
+from bisect import bisect_left, bisect_right
 import customtkinter as ctk
 import tkinter as tk
-from cyk_parser import get_bali_grammar, cyk_parse, get_parse_tree_structure
+from tkinter import messagebox
+from cyk_parser import (
+    get_bali_grammar, compile_grammar, cyk_parse_bitset, get_parse_tree_structure, ParseCancelled
+)
+from parse_cache import ParseCache
+from incremental_parser import IncrementalParser
+from grammar_loader import GrammarReloader, GrammarFileError
+
+logger = logging.getLogger(__name__)
+
+# Editable grammar files (created with: python -m cyk_parser export-grammar).
+# When present they are used instead of the built-in grammar and reloaded on change.
+GRAMMAR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar")
+
+# Live validation runs on the Tk thread: wait for a pause in typing, and leave
+# long inputs (pasted paragraphs) to the background parse started with Enter.
+LIVE_VALIDATION_DELAY_MS = 200
+LIVE_VALIDATION_MAX_TOKENS = 40
 
 # Set appearance mode and default color theme
 ctk.set_appearance_mode("Dark")
@@ -40,6 +62,310 @@ THEME_COLORS = {
     }
 }
 
+
+class CYKPyramidView:
+    """
+    Virtualized renderer for the CYK triangle table.
+
+    Only the cells inside the visible scroll region get canvas items. When the
+    view scrolls, items of cells that left the region are hidden and reused for
+    the cells that entered it, so the item count stays proportional to the
+    viewport instead of n(n+1)/2. Cell labels and column widths are computed
+    once per table.
+
+    Every item is tagged with the THEME_COLORS key of its color, so a theme
+    change recolors the existing items instead of redrawing them.
+    """
+
+    BOX_HEIGHT = 60
+    START_X = 50
+    # Level of detail: very full cells are abbreviated so one column cannot
+    # grow wider than the viewport ("A, B, C, ... (+4)").
+    MAX_LABEL_CHARS = 48
+    BOX_ROLES = ("box_fill", "k_fill")
+    TEXT_ROLES = ("text", "k_text", "empty_text", "token")
+
+    def __init__(self, canvas, theme_mode):
+        self.canvas = canvas
+        self.theme = THEME_COLORS[theme_mode]
+        self.clear()
+
+    def clear(self):
+        """Removes the table and every (visible or pooled) item."""
+        self.canvas.delete("all")
+        self.tokens = []
+        self.labels = {}    # (i, j) -> (label, has_start_symbol); empty cells are absent
+        self.col_x = []     # Left edge of every column, plus the right edge of the last one
+        self.base_y = 0
+        self.visible = {}   # (i, j) -> (rectangle id, text id)
+        self.pool = []      # Hidden (rectangle id, text id) pairs ready for reuse
+
+    def show(self, table, tokens):
+        """Lays out a new table and renders the part that is currently visible."""
+        self.clear()
+        n = len(tokens)
+        if n == 0:
+            return
+        self.tokens = tokens
+
+        # Labels are built once here and reused for sizing, drawing and scrolling
+        col_widths = []
+        for i in range(n):
+            max_char_len = len(tokens[i])
+            for j in range(i, n):
+                if table[i][j]:
+                    label = self._format_label(sorted(table[i][j]))
+                    self.labels[(i, j)] = (label, 'K' in table[i][j])
+                    max_char_len = max(max_char_len, len(label))
+            # Width calculation: Char length * font_estimate + padding
+            col_widths.append(max(80, (max_char_len * 10) + 30))
+
+        total_width = sum(col_widths) + 100
+        total_height = (n * self.BOX_HEIGHT) + 150
+        self.canvas.config(scrollregion=(0, 0, total_width, total_height))
+
+        # Centering logic if the content is smaller than canvas
+        canvas_width = self.canvas.winfo_width()
+        x = self.START_X
+        if total_width < canvas_width:
+            x = (canvas_width - total_width) / 2 + self.START_X
+        self.col_x = [x]
+        for width in col_widths:
+            x += width
+            self.col_x.append(x)
+        # We start drawing from bottom to top
+        self.base_y = 50 + (n * self.BOX_HEIGHT)
+
+        # Tokens at the bottom: only n items, always drawn
+        for i, token in enumerate(tokens):
+            self.canvas.create_text(
+                (self.col_x[i] + self.col_x[i + 1]) / 2, self.base_y + 30,
+                text=token, fill=self.theme["token"], tags=("token",),
+                font=("Roboto", 13, "italic", "bold")
+            )
+        self.refresh()
+
+    def _format_label(self, names):
+        label = ", ".join(names)
+        if len(label) <= self.MAX_LABEL_CHARS:
+            return label
+        shown = []
+        for name in names:
+            if len(", ".join(shown + [name])) > self.MAX_LABEL_CHARS - 10:
+                break
+            shown.append(name)
+        return f"{', '.join(shown)}, ... (+{len(names) - len(shown)})"
+
+    def set_theme(self, theme_mode):
+        """Recolors all existing items through their color tags."""
+        theme = THEME_COLORS[theme_mode]
+        self.theme = theme
+        for role in self.BOX_ROLES:
+            self.canvas.itemconfigure(role, fill=theme[role], outline=theme["box_outline"])
+        for role in self.TEXT_ROLES:
+            self.canvas.itemconfigure(role, fill=theme[role])
+
+    def refresh(self, event=None):
+        """Syncs canvas items with the cells inside the visible scroll region."""
+        n = len(self.tokens)
+        if n == 0:
+            return
+        canvas = self.canvas
+        left, right = canvas.canvasx(0), canvas.canvasx(canvas.winfo_width())
+        top, bottom = canvas.canvasy(0), canvas.canvasy(canvas.winfo_height())
+
+        first_col = min(n - 1, max(0, bisect_right(self.col_x, left) - 1))
+        last_col = min(n - 1, max(0, bisect_left(self.col_x, right) - 1))
+        # Span length L occupies y in [base_y - L*BOX_HEIGHT, base_y - (L-1)*BOX_HEIGHT]
+        min_length = max(1, int((self.base_y - bottom) // self.BOX_HEIGHT))
+        max_length = min(n, int((self.base_y - top) // self.BOX_HEIGHT) + 1)
+
+        needed = set()
+        for i in range(first_col, last_col + 1):
+            for length in range(min_length, min(max_length, n - i) + 1):
+                needed.add((i, i + length - 1))
+
+        # Recycle the items of cells that scrolled out of view
+        for key in [key for key in self.visible if key not in needed]:
+            items = self.visible.pop(key)
+            for item in items:
+                canvas.itemconfigure(item, state="hidden")
+            self.pool.append(items)
+        for key in needed:
+            if key not in self.visible:
+                self.visible[key] = self._place_cell(*key)
+
+    def _place_cell(self, i, j):
+        canvas = self.canvas
+        theme = self.theme
+        x1, x2 = self.col_x[i], self.col_x[i + 1]
+        y2 = self.base_y - ((j - i) * self.BOX_HEIGHT)
+        y1 = y2 - self.BOX_HEIGHT
+
+        # Highlight 'K' (Start Symbol)
+        label, has_k = self.labels.get((i, j), ("-", False))
+        box_role = "k_fill" if has_k else "box_fill"
+        text_role = "k_text" if has_k else ("text" if (i, j) in self.labels else "empty_text")
+        font = ("Roboto", 10 if len(label) > 15 else 12, "bold" if has_k else "normal")
+
+        if self.pool:
+            rect, text = self.pool.pop()
+            canvas.coords(rect, x1, y1, x2, y2)
+            canvas.itemconfigure(rect, fill=theme[box_role], outline=theme["box_outline"],
+                                 tags=(box_role,), state="normal")
+            canvas.coords(text, (x1 + x2) / 2, (y1 + y2) / 2)
+            canvas.itemconfigure(text, text=label, fill=theme[text_role], font=font,
+                                 tags=(text_role,), state="normal")
+        else:
+            rect = canvas.create_rectangle(x1, y1, x2, y2, fill=theme[box_role],
+                                           outline=theme["box_outline"], width=1, tags=(box_role,))
+            text = canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=label,
+                                      fill=theme[text_role], font=font, tags=(text_role,))
+        return rect, text
+
+
+class ParseTreeLayout:
+    """
+    Node coordinates for a parse tree, computed once per tree.
+
+    Leaves are placed left to right at a fixed spacing and every parent is
+    centered over its first and last child, in a single iterative post-order
+    pass (O(number of nodes), no recursion limit for deep trees).
+    Coordinates are relative to the first leaf (x = 0); ParseTreeView adds
+    the horizontal offset used for centering.
+
+    Full Reingold-Tilford contour packing is deliberately not used. Its
+    packing would let a shallow subtree slide under a deeper sibling, so
+    words would no longer appear in sentence order. With the words kept in
+    reading order and X_SPACING apart, the word row already fixes the minimum
+    width. This layout is what Reingold-Tilford gives when every word
+    reserves its column, so a wide, shallow tree stays as wide as its sentence.
+    """
+
+    X_SPACING = 120
+    Y_SPACING = 90
+    START_Y = 60
+    WORD_GAP = 60  # Distance between a preterminal node and its word
+
+    def __init__(self, tree_structure):
+        self.nodes = []   # (label, x, y)
+        self.edges = []   # (x1, y1, x2, y2) from parent to child node
+        self.words = []   # (word, x, y_node, y_word) for the dashed link and the word
+        leaf_count = 0
+        max_y = self.START_Y
+
+        # Explicit stack: (node, y, children_done). Child x positions are pushed
+        # on 'xs' in order, the parent pops them once all children are laid out.
+        xs = []
+        stack = [(tree_structure, self.START_Y, False)]
+        while stack:
+            node, y, children_done = stack.pop()
+            label = node[0]
+            # --- Leaf Node (Word) ---
+            if len(node) == 2 and isinstance(node[1], str):
+                x = leaf_count * self.X_SPACING
+                leaf_count += 1
+                self.words.append((node[1], x, y, y + self.WORD_GAP))
+                self.nodes.append((label, x, y))
+                max_y = max(max_y, y + self.WORD_GAP)
+                xs.append(x)
+            elif not children_done:
+                stack.append((node, y, True))
+                for child in reversed(node[1:]):
+                    stack.append((child, y + self.Y_SPACING, False))
+            # --- Unary or binary (n-ary, from a converted CFG) Branch ---
+            else:
+                child_xs = xs[len(xs) - (len(node) - 1):]
+                del xs[len(xs) - (len(node) - 1):]
+                x = (child_xs[0] + child_xs[-1]) / 2
+                for x_child in child_xs:
+                    self.edges.append((x, y + 20, x_child, y + self.Y_SPACING - 20))
+                self.nodes.append((label, x, y))
+                xs.append(x)
+
+        self.leaf_count = leaf_count
+        self.width = max(800, leaf_count * self.X_SPACING + 100)
+        self.height = max(600, max_y + 100)
+
+
+class ParseTreeView:
+    """
+    Draws a ParseTreeLayout on a canvas and keeps the items around.
+
+    Window resizes only move the existing items (to keep the tree centered)
+    and theme changes recolor them through their tags; nothing is laid out
+    or created again until a new tree is shown.
+    """
+
+    def __init__(self, canvas, theme_mode):
+        self.canvas = canvas
+        self.theme = THEME_COLORS[theme_mode]
+        self.clear()
+
+    def clear(self):
+        self.canvas.delete("all")
+        self.layout = None
+        self.offset_x = 0
+
+    def _center_offset(self):
+        # Center horizontally if small
+        canvas_width = self.canvas.winfo_width()
+        if self.layout.width < canvas_width:
+            return (canvas_width - self.layout.width) / 2 + 50
+        return 50
+
+    def show(self, layout):
+        self.clear()
+        self.layout = layout
+        canvas = self.canvas
+        theme = self.theme
+        canvas.config(scrollregion=(0, 0, layout.width, layout.height))
+        dx = self.offset_x = self._center_offset()
+
+        # Lines first so the node ovals are drawn on top of them
+        for x1, y1, x2, y2 in layout.edges:
+            canvas.create_line(x1 + dx, y1, x2 + dx, y2, fill=theme["line"], width=2, tags=("tree", "line"))
+        for word, x, y_node, y_word in layout.words:
+            canvas.create_line(x + dx, y_node + 20, x + dx, y_word - 15, fill=theme["dash_line"], dash=(2, 2),
+                               tags=("tree", "dash_line"))
+            canvas.create_text(x + dx, y_word, text=word, font=("Roboto", 12, "italic", "bold"),
+                               fill=theme["token"], tags=("tree", "token"))
+        for label, x, y in layout.nodes:
+            radius_x = max(25, (len(label) * 7) + 10)
+            radius_y = 20
+            canvas.create_oval(
+                x + dx - radius_x, y - radius_y, x + dx + radius_x, y + radius_y,
+                fill=theme["node_fill"], outline=theme["node_outline"], width=2, tags=("tree", "node")
+            )
+            canvas.create_text(x + dx, y, text=label, font=("Roboto", 11, "bold"),
+                               fill=theme["node_text"], tags=("tree", "node_text"))
+
+    def show_message(self, text):
+        """Replaces the tree with a centered message."""
+        self.clear()
+        self.canvas.create_text(
+            self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2,
+            text=text, fill=self.theme["empty_text"], font=("Arial", 16), tags=("message", "empty_text")
+        )
+
+    def recenter(self, event=None):
+        """Keeps the content centered after a resize by moving the existing items."""
+        if self.layout is None:
+            self.canvas.coords("message", self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2)
+            return
+        offset = self._center_offset()
+        if offset != self.offset_x:
+            self.canvas.move("tree", offset - self.offset_x, 0)
+            self.offset_x = offset
+
+    def set_theme(self, theme_mode):
+        theme = THEME_COLORS[theme_mode]
+        self.theme = theme
+        for role in ("line", "dash_line", "token", "node_text", "empty_text"):
+            self.canvas.itemconfigure(role, fill=theme[role])
+        self.canvas.itemconfigure("node", fill=theme["node_fill"], outline=theme["node_outline"])
+
+
 class BaliParserApp(ctk.CTk):
     """
     Kelas utama GUI.
@@ -53,13 +379,34 @@ class BaliParserApp(ctk.CTk):
         self.geometry("1100x800")
         self.minsize(800, 600)
 
-        # Initialize grammar
-        self.grammar = get_bali_grammar()
+        # Initialize grammar (external files with hot reload if available, else built-in)
+        self.grammar_reloader = None
+        if os.path.isdir(GRAMMAR_DIR):
+            try:
+                self.grammar_reloader = GrammarReloader(GRAMMAR_DIR).start()
+            except (OSError, GrammarFileError) as exc:
+                logger.warning("Grammar di '%s' tidak dapat dimuat, memakai grammar bawaan: %s", GRAMMAR_DIR, exc)
+        if self.grammar_reloader is not None:
+            self.grammar = self.grammar_reloader.grammar
+        else:
+            self.grammar = compile_grammar(get_bali_grammar())
+        # Cache hasil parse: kalimat latihan yang sama sering dicek berulang kali
+        self.parse_cache = ParseCache(max_entries=256)
+        # Column-by-column parser for live validation while typing
+        self.live_parser = IncrementalParser(self.grammar)
+        self.live_validation_job = None  # Pending after() id of the debounced live validation
+        # Tree layout is cached with the tree it belongs to (computed once per tree)
         self.last_tree_structure = None
-        self.last_table = None
-        self.last_tokens = None
+        self.last_tree_layout = None
         self.current_theme_mode = "Dark" # Default
 
+        # Background parsing state: each submission gets a job id and a cancel event.
+        # Worker threads never touch Tk; they post messages to this queue instead.
+        self.parse_queue = queue.Queue()
+        self.current_job_id = 0
+        self.current_cancel_event = None
+        self.is_polling = False
+
         # Grid configuration
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(2, weight=1) # Tabview expands
@@ -100,6 +447,7 @@ class BaliParserApp(ctk.CTk):
         )
         self.entry_sentence.grid(row=0, column=0, sticky="ew", padx=(0, 10))
         self.entry_sentence.bind('<Return>', lambda event: self.start_parsing())
+        self.entry_sentence.bind('<KeyRelease>', lambda event: self.schedule_live_validation())
 
         self.btn_parse = ctk.CTkButton(
             self.input_frame,
@@ -132,6 +480,21 @@ class BaliParserApp(ctk.CTk):
         )
         self.lbl_status.grid(row=1, column=0, columnspan=3, pady=(5, 0), sticky="w")
 
+        # Live validation hint (updated on every keystroke by the incremental parser)
+        self.lbl_live = ctk.CTkLabel(
+            self.input_frame,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color="gray"
+        )
+        self.lbl_live.grid(row=1, column=0, columnspan=3, pady=(5, 0), padx=(0, 5), sticky="e")
+
+        # Progress bar for long sentences (shown only while a parse is running)
+        self.progress_bar = ctk.CTkProgressBar(self.input_frame, height=8)
+        self.progress_bar.grid(row=2, column=0, columnspan=3, pady=(5, 0), sticky="ew")
+        self.progress_bar.set(0)
+        self.progress_bar.grid_remove()
+
         # --- TABS ---
         self.tabview = ctk.CTkTabview(self, width=1000, height=600)
         self.tabview.grid(row=2, column=0, sticky="nsew", padx=20, pady=(0, 20))
@@ -152,10 +515,14 @@ class BaliParserApp(ctk.CTk):
         self.canvas_table = tk.Canvas(self.tab_table, bg=THEME_COLORS["Dark"]["canvas_bg"], highlightthickness=0)
         self.canvas_table.grid(row=0, column=0, sticky="nsew")
 
+        # Only visible cells are drawn: re-sync on every scroll and resize
+        self.pyramid_view = CYKPyramidView(self.canvas_table, self.current_theme_mode)
+        self.canvas_table.bind("<Configure>", self.pyramid_view.refresh)
+
         # Scrollbars for Table
-        self.scroll_y_table = ctk.CTkScrollbar(self.tab_table, orientation="vertical", command=self.canvas_table.yview)
+        self.scroll_y_table = ctk.CTkScrollbar(self.tab_table, orientation="vertical", command=self.scroll_table_y)
         self.scroll_y_table.grid(row=0, column=1, sticky="ns")
-        self.scroll_x_table = ctk.CTkScrollbar(self.tab_table, orientation="horizontal", command=self.canvas_table.xview)
+        self.scroll_x_table = ctk.CTkScrollbar(self.tab_table, orientation="horizontal", command=self.scroll_table_x)
         self.scroll_x_table.grid(row=1, column=0, sticky="ew")
         self.canvas_table.configure(yscrollcommand=self.scroll_y_table.set, xscrollcommand=self.scroll_x_table.set)
 
@@ -165,6 +532,8 @@ class BaliParserApp(ctk.CTk):
 
         self.canvas_tree = tk.Canvas(self.tab_tree, bg=THEME_COLORS["Dark"]["canvas_bg"], highlightthickness=0)
         self.canvas_tree.grid(row=0, column=0, sticky="nsew")
+        self.tree_view = ParseTreeView(self.canvas_tree, self.current_theme_mode)
+        self.canvas_tree.bind("<Configure>", self.tree_view.recenter)
 
         # Scrollbars for Tree
         self.scroll_y_tree = ctk.CTkScrollbar(self.tab_tree, orientation="vertical", command=self.canvas_tree.yview)
@@ -173,6 +542,14 @@ class BaliParserApp(ctk.CTk):
         self.scroll_x_tree.grid(row=1, column=0, sticky="ew")
         self.canvas_tree.configure(yscrollcommand=self.scroll_y_tree.set, xscrollcommand=self.scroll_x_tree.set)
 
+    def scroll_table_x(self, *args):
+        self.canvas_table.xview(*args)
+        self.pyramid_view.refresh()
+
+    def scroll_table_y(self, *args):
+        self.canvas_table.yview(*args)
+        self.pyramid_view.refresh()
+
     def toggle_theme(self):
         new_mode = self.switch_theme.get() # "Dark" or "Light"
         self.current_theme_mode = new_mode
@@ -185,10 +562,9 @@ class BaliParserApp(ctk.CTk):
         self.canvas_table.configure(bg=new_bg)
         self.canvas_tree.configure(bg=new_bg)
 
-        # 3. Redraw content if available
-        if self.last_tokens:
-            self.draw_cyk_pyramid(self.last_table, self.last_tokens)
-            self.draw_parse_tree(self.last_tree_structure, self.last_tokens)
+        # 3. Recolor the existing canvas items in place
+        self.pyramid_view.set_theme(new_mode)
+        self.tree_view.set_theme(new_mode)
 
         # Update switch text to reflect mode
         self.switch_theme.configure(text=f"{new_mode} Mode")
@@ -199,233 +575,178 @@ class BaliParserApp(ctk.CTk):
             self.lbl_status.configure(text="Mohon masukkan kalimat bahasa Bali.", text_color="orange", font=("Arial", 16))
             return
 
+        # Cancel the in-flight parse (if any); its late messages are ignored by job id
+        self.cancel_parsing()
+
+        self.refresh_grammar()
+        self.current_job_id += 1
+        self.current_cancel_event = threading.Event()
+
         self.lbl_status.configure(text="Memproses...", text_color="gray", font=("Arial", 16))
-        self.update()
+        self.progress_bar.set(0)
+        self.progress_bar.grid()
 
-        # Run CYK Algorithm
-        is_valid, table, tokens = cyk_parse(sentence.lower(), self.grammar)
+        worker = threading.Thread(
+            target=self._parse_worker,
+            args=(self.current_job_id, sentence, self.current_cancel_event),
+            daemon=True,
+        )
+        worker.start()
+        if not self.is_polling:
+            self.is_polling = True
+            self.after(30, self._poll_parse_queue)
+
+    def cancel_parsing(self):
+        """Signals the running worker (if any) to stop at the next chart row."""
+        if self.current_cancel_event is not None:
+            self.current_cancel_event.set()
+            self.current_cancel_event = None
+
+    def _parse_worker(self, job_id, sentence, cancel_event):
+        """
+        Runs in a background thread: parses the sentence and posts progress/result
+        messages to self.parse_queue. Must not call any Tk method.
+        """
+        def report_progress(done_rows, total_rows):
+            self.parse_queue.put(("progress", job_id, done_rows / total_rows))
+
+        # Keep one grammar for the whole job, even if a reload swaps self.grammar meanwhile
+        grammar = self.grammar
+        try:
+            # Run CYK Algorithm (back-pointers recorded so the tree is extracted in O(n))
+            is_valid, table, tokens = cyk_parse_bitset(
+                sentence.lower(), grammar, cache=self.parse_cache, backpointers=True,
+                progress=report_progress, cancel=cancel_event,
+            )
+            tree = get_parse_tree_structure(grammar, table, tokens, cache=self.parse_cache) if is_valid else None
+        except ParseCancelled:
+            self.parse_queue.put(("cancelled", job_id, None))
+            return
+        except Exception as exc:
+            # Report every failure, otherwise the poller would wait for this job forever
+            self.parse_queue.put(("error", job_id, exc))
+            return
+        self.parse_queue.put(("done", job_id, (is_valid, table, tokens, tree)))
+
+    def _poll_parse_queue(self):
+        """Drains worker messages on the Tk thread (scheduled with after())."""
+        finished = False
+        try:
+            while True:
+                kind, job_id, payload = self.parse_queue.get_nowait()
+                if job_id != self.current_job_id:
+                    continue  # Stale message from a cancelled/replaced parse
+                if kind == "progress":
+                    self.progress_bar.set(payload)
+                elif kind == "done":
+                    finished = True
+                    self.current_cancel_event = None
+                    self.progress_bar.grid_remove()
+                    self.show_parse_result(*payload)
+                elif kind == "cancelled":
+                    finished = True
+                elif kind == "error":
+                    finished = True
+                    self.current_cancel_event = None
+                    self.progress_bar.grid_remove()
+                    self.show_parse_error(payload)
+        except queue.Empty:
+            pass
+
+        if not finished and self.current_cancel_event is not None:
+            self.after(30, self._poll_parse_queue)
+        else:
+            self.is_polling = False
 
-        # Store state for theme switching redraws
-        self.last_table = table
-        self.last_tokens = tokens
-        self.last_tree_structure = get_parse_tree_structure(self.grammar, table, tokens) if is_valid else None
+    def show_parse_error(self, exc):
+        """Resets the status after a failed parse and tells the user what went wrong."""
+        self.lbl_status.configure(text="✘ Terjadi kesalahan saat parsing.", text_color="#E74C3C", font=("Arial", 16))
+        messagebox.showerror("Kesalahan Parsing", f"Kalimat tidak dapat diproses:\n{type(exc).__name__}: {exc}")
 
+    def show_parse_result(self, is_valid, table, tokens, tree):
         # Update Visuals
         self.draw_cyk_pyramid(table, tokens)
 
         if is_valid:
             self.lbl_status.configure(text="✔ Kalimat Valid.", text_color="#2CC985", font=("Arial", 16)) # Green
-            self.draw_parse_tree(self.last_tree_structure, tokens)
+            self.draw_parse_tree(tree, tokens)
         else:
             self.lbl_status.configure(text="✘ Kalimat Tidak Valid.", text_color="#E74C3C", font=("Arial", 16)) # Red
-            self.canvas_tree.delete("all")
-            self.canvas_tree.create_text(
-                self.canvas_tree.winfo_width() / 2, self.canvas_tree.winfo_height() / 2,
-                text="Tidak ada pohon parse karena kalimat tidak valid.",
-                fill=THEME_COLORS[self.current_theme_mode]["empty_text"],
-                font=("Arial", 16)
-            )
+            self.tree_view.show_message("Tidak ada pohon parse karena kalimat tidak valid.")
+
+    def refresh_grammar(self):
+        """Picks up a grammar reloaded from the grammar files (Tk thread only)."""
+        if self.grammar_reloader is None or self.grammar_reloader.grammar is self.grammar:
+            return
+        self.grammar = self.grammar_reloader.grammar
+        # The live parser's columns were built with the old grammar: start it over
+        self.live_parser = IncrementalParser(self.grammar)
+
+    def schedule_live_validation(self):
+        """Debounces live validation: it runs once typing pauses for LIVE_VALIDATION_DELAY_MS."""
+        if self.live_validation_job is not None:
+            self.after_cancel(self.live_validation_job)
+        self.live_validation_job = self.after(LIVE_VALIDATION_DELAY_MS, self.update_live_validation)
+
+    def update_live_validation(self):
+        """
+        Re-validates the entry text incrementally: only the tokens after the
+        longest unchanged prefix are re-parsed (one chart column each).
+        Inputs longer than LIVE_VALIDATION_MAX_TOKENS are skipped.
+        """
+        self.live_validation_job = None
+        self.refresh_grammar()
+        text = self.entry_sentence.get()
+        if len(text.split()) > LIVE_VALIDATION_MAX_TOKENS:
+            self.lbl_live.configure(text="● Kalimat panjang: tekan Enter untuk memvalidasi", text_color="gray")
+            return
+        is_valid = self.live_parser.feed_text(text)
+
+        if not self.live_parser.tokens:
+            self.lbl_live.configure(text="")
+        elif is_valid:
+            self.lbl_live.configure(text="● Valid sejauh ini", text_color="#2CC985")
+        elif self.live_parser.unknown_tokens:
+            _, word = self.live_parser.unknown_tokens[0]
+            self.lbl_live.configure(text=f"● Kata '{word}' belum dikenal", text_color="orange")
+        else:
+            self.lbl_live.configure(text="● Belum valid", text_color="gray")
 
     def reset_app(self):
+        self.cancel_parsing()
+        if self.live_validation_job is not None:
+            self.after_cancel(self.live_validation_job)
+            self.live_validation_job = None
+        self.current_job_id += 1
+        self.progress_bar.grid_remove()
         self.entry_sentence.delete(0, 'end')
+        self.live_parser.reset()
+        self.lbl_live.configure(text="")
         self.lbl_status.configure(text="Menunggu input kalimat...", text_color="gray", font=("Arial", 16))
-        self.canvas_table.delete("all")
-        self.canvas_tree.delete("all")
+        self.pyramid_view.clear()
+        self.tree_view.clear()
         self.last_tree_structure = None
-        self.last_table = None
-        self.last_tokens = None
+        self.last_tree_layout = None
 
     def draw_cyk_pyramid(self, table, tokens):
         """
         Draws the CYK triangle table on the canvas.
-        Adapted from the original code but styled for dark mode.
+        Only the visible cells are materialized (see CYKPyramidView).
         """
-        canvas = self.canvas_table
-        canvas.delete("all")
-
-        n = len(tokens)
-        if n == 0: return
-
-        # Get colors based on current theme
-        theme = THEME_COLORS[self.current_theme_mode]
-
-        # Configuration
-        BOX_HEIGHT = 60
-        START_X = 50
-        # Calculate vertical position to center or start with margin
-        # We start drawing from bottom to top
-        BASE_Y = 50 + (n * BOX_HEIGHT)
-
-        # Pre-calculation for column widths
-        col_widths = []
-        for i in range(n):
-            max_char_len = len(tokens[i])
-            for length in range(1, n - i + 1):
-                j = i + length - 1
-                if table[i][j]:
-                    isi = ", ".join(sorted(list(table[i][j])))
-                    max_char_len = max(max_char_len, len(isi))
-
-            # Width calculation: Char length * font_estimate + padding
-            calculated_width = max(80, (max_char_len * 10) + 30)
-            col_widths.append(calculated_width)
-
-        total_width = sum(col_widths) + 100
-        total_height = (n * BOX_HEIGHT) + 150
-        canvas.config(scrollregion=(0, 0, total_width, total_height))
-
-        # Centering logic if the content is smaller than canvas
-        canvas_width = canvas.winfo_width()
-        start_x_offset = START_X
-        if total_width < canvas_width:
-             start_x_offset = (canvas_width - total_width) / 2 + START_X
-
-        current_x = start_x_offset
-
-        for i in range(n):
-            this_col_width = col_widths[i]
-
-            # Draw boxes upwards
-            for length in range(1, n - i + 1):
-                j = i + length - 1
-
-                x1 = current_x
-                x2 = current_x + this_col_width
-
-                y2 = BASE_Y - ((length - 1) * BOX_HEIGHT)
-                y1 = y2 - BOX_HEIGHT
-
-                # Content
-                if table[i][j]:
-                    content_list = sorted(list(table[i][j]))
-                    isi_teks = ", ".join(content_list)
-                    # Highlight 'K' (Start Symbol)
-                    text_color = theme["k_text"] if 'K' in content_list else theme["text"]
-                    box_fill = theme["k_fill"] if 'K' in content_list else theme["box_fill"]
-                else:
-                    isi_teks = "-"
-                    text_color = theme["empty_text"]
-                    box_fill = theme["box_fill"]
-
-                # Draw Rectangle
-                canvas.create_rectangle(x1, y1, x2, y2, fill=box_fill, outline=theme["box_outline"], width=1)
-
-                # Font size logic
-                font_size = 10 if len(isi_teks) > 15 else 12
-
-                canvas.create_text(
-                    (x1 + x2) / 2, (y1 + y2) / 2,
-                    text=isi_teks, fill=text_color,
-                    font=("Roboto", font_size, "bold" if 'K' in isi_teks else "normal")
-                )
-
-            # Draw Token at bottom
-            y_text = BASE_Y + 30
-            x_center = current_x + (this_col_width / 2)
-            canvas.create_text(
-                x_center, y_text,
-                text=tokens[i], fill=theme["token"],
-                font=("Roboto", 13, "italic", "bold")
-            )
-
-            current_x += this_col_width
+        self.pyramid_view.show(table, tokens)
 
     def draw_parse_tree(self, tree_structure, tokens):
         """
         Draws the parse tree on the canvas.
-        Adapted from original recursive_draw logic.
+        The layout is only recomputed when the tree itself changes.
         """
-        canvas = self.canvas_tree
-        canvas.delete("all")
-
         if not tree_structure:
+            self.tree_view.clear()
             return
-
-        # Get colors based on current theme
-        theme = THEME_COLORS[self.current_theme_mode]
-
-        X_SPACING = 120
-        Y_SPACING = 90
-        START_Y = 60
-
-        # Calculate canvas size
-        total_width = max(800, len(tokens) * X_SPACING + 100)
-        total_height = max(600, (len(tokens) * 50) + 200)
-        canvas.config(scrollregion=(0, 0, total_width, total_height))
-
-        # Center horizontally if small
-        canvas_width = self.canvas_tree.winfo_width()
-        start_x_offset = 50
-        if total_width < canvas_width:
-             start_x_offset = (canvas_width - total_width) / 2 + 50
-
-        # Mutable tracker for leaf position
-        leaf_tracker = [0]
-
-        def recursive_draw_node(node, current_y):
-            label = node[0]
-            my_x = 0
-
-            # --- Case 1: Binary Branch ---
-            if len(node) == 3:
-                left_child = node[1]
-                right_child = node[2]
-
-                x_left = recursive_draw_node(left_child, current_y + Y_SPACING)
-                x_right = recursive_draw_node(right_child, current_y + Y_SPACING)
-
-                my_x = (x_left + x_right) / 2
-
-                # Draw lines
-                canvas.create_line(my_x, current_y + 20, x_left, current_y + Y_SPACING - 20, fill=theme["line"], width=2)
-                canvas.create_line(my_x, current_y + 20, x_right, current_y + Y_SPACING - 20, fill=theme["line"], width=2)
-
-            # --- Case 2: Leaf Node (Word) ---
-            elif len(node) == 2 and isinstance(node[1], str):
-                kata = node[1]
-                my_x = start_x_offset + (leaf_tracker[0] * X_SPACING)
-                leaf_tracker[0] += 1
-
-                y_kata = current_y + 60
-                canvas.create_line(my_x, current_y + 20, my_x, y_kata - 15, fill=theme["dash_line"], dash=(2, 2))
-
-                # Draw word
-                canvas.create_text(
-                    my_x, y_kata,
-                    text=kata, font=("Roboto", 12, "italic", "bold"),
-                    fill=theme["token"]
-                )
-
-            # --- Case 3: Unary Branch ---
-            elif len(node) == 2 and isinstance(node[1], tuple):
-                child_node = node[1]
-                x_child = recursive_draw_node(child_node, current_y + Y_SPACING)
-                my_x = x_child
-
-                canvas.create_line(my_x, current_y + 20, x_child, current_y + Y_SPACING - 20, fill=theme["line"], width=2)
-
-            # --- Draw Node Circle/Oval ---
-            text_len = len(label)
-            radius_x = max(25, (text_len * 7) + 10)
-            radius_y = 20
-
-            canvas.create_oval(
-                my_x - radius_x, current_y - radius_y,
-                my_x + radius_x, current_y + radius_y,
-                fill=theme["node_fill"],
-                outline=theme["node_outline"],
-                width=2
-            )
-
-            canvas.create_text(
-                my_x, current_y,
-                text=label, font=("Roboto", 11, "bold"), fill=theme["node_text"]
-            )
-
-            return my_x
-
-        # Start drawing
-        recursive_draw_node(tree_structure, START_Y)
+        if tree_structure is not self.last_tree_structure or self.last_tree_layout is None:
+            self.last_tree_structure = tree_structure
+            self.last_tree_layout = ParseTreeLayout(tree_structure)
+        self.tree_view.show(self.last_tree_layout)
 
 if __name__ == "__main__":
     app = BaliParserApp()
@@ -0,0 +1,155 @@
+# =======================================================================================
+# Deskripsi: Cache hasil parsing kalimat utuh (LRU terbatas) beserta statistik
+#            hit/miss/eviction, agar kalimat yang sering diulang tidak di-parse ulang
+# =======================================================================================
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(obj):
+    """
+    Perkiraan kasar ukuran memori (byte) sebuah objek beserta isinya.
+    Hanya menelusuri tipe bawaan (list, tuple, set, frozenset, dict); objek
+    lain dihitung ukuran dangkalnya saja. Objek yang sama tidak dihitung dua kali.
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+class ParseCache:
+    """
+    Cache LRU untuk hasil parsing kalimat utuh.
+
+    Key cache adalah (fingerprint grammar, nama engine, tuple token), sehingga
+    kalimat dengan penulisan berbeda tetapi token sama ("Jegeg  SAJAN" dan
+    "jegeg sajan") memakai entri yang sama.
+
+    Cache ini mengikuti SATU grammar: begitu fingerprint grammar berubah
+    (misal get_bali_grammar() diubah), seluruh entri lama otomatis dibuang.
+
+    Aman dipakai dari beberapa thread sekaligus (misal thread parsing GUI).
+
+    Args:
+        max_entries (int): Jumlah entri maksimal (None = tidak dibatasi).
+        max_bytes (int): Perkiraan ukuran total maksimal dalam byte (None = tidak dibatasi).
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> [value, size]
+        self._fingerprint = None
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+
+        # Statistik (bisa dibaca langsung atau lewat stats())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_fingerprint(self, fingerprint):
+        """Membuang semua entri jika grammar yang dipakai sudah berubah."""
+        if fingerprint != self._fingerprint:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+                self.total_bytes = 0
+            self._fingerprint = fingerprint
+
+    def get(self, fingerprint, key):
+        """
+        Mengambil nilai untuk (fingerprint, key), atau None jika tidak ada.
+        Entri yang ditemukan dipindah ke posisi "paling baru dipakai".
+        """
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, fingerprint, key):
+        """
+        Seperti get(), tetapi tidak menghitung hit/miss dan tidak mengubah urutan
+        LRU. Dipakai untuk melengkapi entri yang sudah ada (misal menambahkan
+        pohon parse), agar statistik hanya mencerminkan lookup hasil parse.
+        """
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            entry = self._entries.get(key)
+            return None if entry is None else entry[0]
+
+    def put(self, fingerprint, key, value, size=None):
+        """Menyimpan nilai, lalu membuang entri paling lama jika melewati batas."""
+        if size is None:
+            size = estimate_size(value)
+
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = [value, size]
+            self.total_bytes += size
+            self._evict()
+
+    def resize(self, fingerprint, key, size):
+        """Memperbarui perkiraan ukuran entri (misal setelah pohon parse ditambahkan)."""
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                return
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.total_bytes += size - entry[1]
+                entry[1] = size
+                self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Mengosongkan cache (statistik tidak di-reset)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Statistik cache dalam bentuk dictionary (untuk log / metrik)."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
@@ -0,0 +1,260 @@
+# =======================================================================================
+# Deskripsi: Packed parse forest dari tabel CYK, untuk menghitung jumlah derivasi
+#            dan mengambil pohon-pohon parse satu per satu tanpa ledakan memori
+# =======================================================================================
+
+from cyk_parser import compile_grammar, cyk_parse_bitset
+
+
+class ParseForest:
+    """
+    Packed parse forest: setiap node (simbol, i, j) disimpan SEKALI beserta
+    daftar alternatif pembentuknya: (k, B, C) untuk aturan biner, (None, B, None)
+    untuk aturan unit A -> B, dan (None, None, None) untuk aturan terminal
+    A -> 'kata'. Semua pohon parse yang
+    mungkin berbagi node yang sama, sehingga ukuran forest tetap polinomial
+    walaupun jumlah pohonnya eksponensial.
+
+    Alternatif diurutkan seperti penelusuran balik "Greedy Left" (aturan
+    terminal dulu, lalu aturan yang lebih awal di grammar, lalu titik potong
+    k terbesar), sehingga
+    tree_at(0) sama dengan hasil get_parse_tree_structure().
+
+    Args:
+        grammar (dict | CompiledGrammar): Aturan tata bahasa.
+        table: Tabel CYK (list of sets atau BitChart).
+        tokens (list): Daftar token.
+        symbol (str): Simbol akar (default: simbol awal grammar, 'K').
+    """
+
+    def __init__(self, grammar, table, tokens, symbol=None):
+        compiled = compile_grammar(grammar)
+        self.tokens = tokens
+        self.cnf_origin = compiled.cnf_origin
+        self.nodes = {}  # (simbol, i, j) -> list alternatif (k, B, C)
+        self._unit_depth = {}  # (simbol, i, j) -> tinggi rantai unit di bawah node
+        self.root = None
+
+        n = len(tokens)
+        symbol = symbol or compiled.start_symbol
+        if n == 0 or symbol not in table[0][n - 1]:
+            return
+
+        self.root = (symbol, 0, n - 1)
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node in self.nodes:
+                continue
+            simbol, i, j = node
+            alternatives = []
+            if i == j and simbol in compiled.direct_terminal_symbols(tokens[i]):
+                alternatives.append((None, None, None))
+            for rule in compiled.rule_order.get(simbol, ()):
+                if len(rule) == 1:
+                    if rule[0] in table[i][j]:
+                        alternatives.append((None, rule[0], None))
+                        stack.append((rule[0], i, j))
+                    continue
+                B, C = rule
+                for k in range(j - 1, i - 1, -1):
+                    if B in table[i][k] and C in table[k + 1][j]:
+                        alternatives.append((k, B, C))
+                        stack.append((B, i, k))
+                        stack.append((C, k + 1, j))
+            self.nodes[node] = alternatives
+
+        self._counts = None
+
+    def __len__(self):
+        """Jumlah node unik di dalam forest."""
+        return len(self.nodes)
+
+    def _children(self, node, alternative):
+        simbol, i, j = node
+        k, B, C = alternative
+        if B is None:
+            return ()  # Daun: A -> 'kata'
+        if C is None:
+            return ((B, i, j),)  # Aturan unit: anak mencakup span yang sama
+        return (B, i, k), (C, k + 1, j)
+
+    def _depth(self, node):
+        """Tinggi rantai aturan unit di bawah node pada span yang sama (iteratif, di-memo)."""
+        depth = self._unit_depth
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in depth:
+                stack.pop()
+                continue
+            units = [(B, current[1], current[2]) for _, B, C in self.nodes[current]
+                     if B is not None and C is None]
+            pending = [child for child in units if child not in depth]
+            if pending:
+                stack.extend(pending)
+                continue
+            depth[current] = 1 + max((depth[child] for child in units), default=-1)
+            stack.pop()
+        return depth[node]
+
+    def derivation_counts(self):
+        """
+        Jumlah derivasi untuk setiap node, dihitung bottom-up (tanpa rekursi).
+        Anak biner selalu mencakup substring yang lebih pendek dari induknya,
+        sedangkan anak unit mencakup span yang sama tetapi berada lebih rendah
+        di rantai unit (grammar tidak boleh memiliki siklus unit). Jadi cukup
+        memproses node berdasarkan (panjang span, tinggi rantai unit).
+        """
+        if self._counts is None:
+            counts = {}
+            order = sorted(self.nodes, key=lambda nd: (nd[2] - nd[1], self._depth(nd)))
+            for node in order:
+                total = 0
+                for alternative in self.nodes[node]:
+                    size = 1
+                    for child in self._children(node, alternative):
+                        size *= counts[child]
+                    total += size
+                counts[node] = total
+            self._counts = counts
+        return self._counts
+
+    def count_trees(self):
+        """Jumlah total pohon parse (0 jika kalimat tidak valid)."""
+        if self.root is None:
+            return 0
+        return self.derivation_counts()[self.root]
+
+    def tree_at(self, index):
+        """
+        Membangun pohon parse ke-'index' (0 <= index < count_trees()) secara
+        langsung tanpa membangun pohon-pohon sebelumnya (unranking).
+        """
+        total = self.count_trees()
+        if not 0 <= index < total:
+            raise IndexError(f"Indeks pohon {index} di luar jangkauan (0..{total - 1}).")
+
+        counts = self.derivation_counts()
+        tokens = self.tokens
+
+        # Fase 1: tentukan alternatif untuk setiap node (pre-order, stack eksplisit)
+        frames = []  # (node, children_frame_ids atau None)
+        stack = [(self.root, index, None, 0)]  # (node, rank, parent_frame, posisi_anak)
+        while stack:
+            node, rank, parent, slot = stack.pop()
+            frame_id = len(frames)
+            frames.append([node, None])
+            if parent is not None:
+                frames[parent][1][slot] = frame_id
+
+            for alternative in self.nodes[node]:
+                children = self._children(node, alternative)
+                size = 1
+                for child in children:
+                    size *= counts[child]
+                if rank < size:
+                    break
+                rank -= size
+            if not children:
+                continue
+            frames[frame_id][1] = [None] * len(children)
+            # Peringkat dipecah per anak (mixed radix), anak terakhir paling cepat berubah
+            child_ranks = []
+            for child in reversed(children):
+                rank, child_rank = divmod(rank, counts[child])
+                child_ranks.append(child_rank)
+            child_ranks.reverse()
+            for slot in range(len(children) - 1, -1, -1):
+                stack.append((children[slot], child_ranks[slot], frame_id, slot))
+
+        # Fase 2: susun nested tuple dari belakang (anak sebelum induk)
+        built = [None] * len(frames)
+        for frame_id in range(len(frames) - 1, -1, -1):
+            (simbol, i, j), child_ids = frames[frame_id]
+            if child_ids is None:
+                built[frame_id] = (simbol, tokens[i])
+            else:
+                built[frame_id] = (simbol,) + tuple(built[child_id] for child_id in child_ids)
+        if self.cnf_origin is not None:
+            # Binarisasi kiri bersifat deterministik, jadi setiap pohon CNF tetap
+            # menjadi pohon CFG yang berbeda setelah dikembalikan
+            from cnf_converter import debinarize_tree
+            return debinarize_tree(built[0], self.cnf_origin)
+        return built[0]
+
+    def iter_trees(self, limit=None):
+        """
+        Generator pohon parse satu per satu (lazy). Hanya satu pohon berada
+        di memori pada satu waktu. Gunakan 'limit' untuk k pohon pertama.
+        """
+        total = self.count_trees()
+        if limit is not None:
+            total = min(total, limit)
+        for index in range(total):
+            yield self.tree_at(index)
+
+
+def build_forest(sentence, grammar):
+    """Mem-parse kalimat lalu membangun ParseForest-nya. Mengembalikan (forest, tokens)."""
+    compiled = compile_grammar(grammar)
+    _, table, tokens = cyk_parse_bitset(sentence, compiled)
+    return ParseForest(compiled, table, tokens), tokens
+
+
+def ambiguity_stats(sentences, grammar):
+    """
+    Statistik ambiguitas sebuah korpus, dihitung dari forest (tanpa
+    membangun pohon satu per satu).
+
+    Returns:
+        dict: jumlah kalimat, kalimat valid, kalimat ambigu (>1 pohon),
+              total/maks/rata-rata jumlah pohon per kalimat valid,
+              serta histogram {jumlah_pohon: jumlah_kalimat}.
+    """
+    compiled = compile_grammar(grammar)
+    stats = {
+        "sentences": 0,
+        "accepted": 0,
+        "ambiguous": 0,
+        "total_trees": 0,
+        "max_trees": 0,
+        "histogram": {},
+    }
+    for sentence in sentences:
+        stats["sentences"] += 1
+        forest, _ = build_forest(sentence, compiled)
+        count = forest.count_trees()
+        if count == 0:
+            continue
+        stats["accepted"] += 1
+        stats["ambiguous"] += count > 1
+        stats["total_trees"] += count
+        stats["max_trees"] = max(stats["max_trees"], count)
+        stats["histogram"][count] = stats["histogram"].get(count, 0) + 1
+
+    stats["mean_trees"] = stats["total_trees"] / stats["accepted"] if stats["accepted"] else 0.0
+    return stats
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    from cyk_parser import get_bali_grammar
+
+    my_grammar = compile_grammar(get_bali_grammar())
+    with open('dataset_positif.txt', 'r') as f:
+        data_positif = [line.strip() for line in f if line.strip()]
+
+    print(f"| {'KALIMAT INPUT':<60} | {'JUMLAH POHON':>12} |")
+    print("-" * 81)
+    for kalimat in data_positif:
+        forest, _ = build_forest(kalimat, my_grammar)
+        print(f"| {kalimat:<60} | {forest.count_trees():>12} |")
+
+    stats = ambiguity_stats(data_positif, my_grammar)
+    print("-" * 81)
+    print(f"Kalimat valid  : {stats['accepted']} dari {stats['sentences']}")
+    print(f"Kalimat ambigu : {stats['ambiguous']}")
+    print(f"Rata-rata pohon: {stats['mean_trees']:.2f} (maks {stats['max_trees']})")
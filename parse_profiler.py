@@ -0,0 +1,249 @@
+# =======================================================================================
+# Deskripsi: Instrumentasi parser CYK (opsional): waktu per tahap, statistik sel per
+#            baris panjang substring, titik potong & pemeriksaan aturan, token tak dikenal
+# =======================================================================================
+
+import json
+import time
+import threading
+from collections import Counter
+
+PHASES = ("tokenize", "lexicon", "fill")
+
+
+def percentile(sorted_values, fraction):
+    """Persentil dengan interpolasi linear dari list yang sudah terurut."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(values_us):
+    """Ringkasan latensi (mikrodetik): p50, p95, p99, rata-rata, maks."""
+    values = sorted(values_us)
+    return {
+        "p50": round(percentile(values, 0.50), 1),
+        "p95": round(percentile(values, 0.95), 1),
+        "p99": round(percentile(values, 0.99), 1),
+        "mean": round(sum(values) / len(values), 1) if values else 0.0,
+        "max": round(values[-1], 1) if values else 0.0,
+    }
+
+
+class ParseObserver:
+    """
+    Antarmuka observer untuk instrumentasi parser. Semua method tidak melakukan
+    apa-apa; turunkan kelas ini dan timpa method yang diperlukan.
+
+    Observer diteruskan lewat argumen 'observer' pada cyk_parse(),
+    cyk_parse_bitset(), fill_cyk_table(), fill_bitset_chart(),
+    fill_sparse_chart() dan CYKBackend. Tanpa observer (None), parser hanya
+    menambah satu pengecekan 'is None' per tahap dan per baris.
+    """
+
+    def on_phase(self, phase, seconds):
+        """
+        Satu tahap selesai. phase: "tokenize" (preprocessing), "lexicon"
+        (pengisian diagonal) atau "fill" (kombinasi bottom-up).
+        """
+
+    def on_row(self, length, cells, live_cells, symbols, largest_cell, splits, rule_checks):
+        """
+        Satu baris panjang substring selesai diisi.
+
+        Args:
+            length (int): Panjang substring baris ini (1 = diagonal).
+            cells (int): Jumlah sel di baris.
+            live_cells (int): Jumlah sel tidak kosong.
+            symbols (int): Total simbol di semua sel baris (ukuran sel).
+            largest_cell (int): Jumlah simbol di sel terbesar baris ini.
+            splits (int): Jumlah titik potong yang dikunjungi.
+            rule_checks (int): Jumlah pemeriksaan aturan (engine set: pasangan
+                               aturan A -> B C yang diuji; engine bit-vector:
+                               penggabungan mask sel kiri & kanan).
+        """
+
+    def on_unknown_token(self, position, word):
+        """Token di posisi 'position' tidak ada di lexicon."""
+
+    def on_parse(self, engine, tokens, is_accepted, seconds, cached=False):
+        """Satu kalimat selesai diparse (cached=True jika hasil diambil dari ParseCache)."""
+
+
+class ParseProfiler(ParseObserver):
+    """
+    Observer yang mengakumulasi statistik untuk banyak kalimat, siap diekspor
+    ke sistem metrik lewat to_dict() (JSON).
+
+    Bisa dipakai sebagai context manager untuk mencatat waktu total sesi:
+
+        with ParseProfiler() as profiler:
+            for kalimat in korpus:
+                cyk_parse_bitset(kalimat, grammar, observer=profiler)
+        print(profiler.format_report())
+
+    Aman dipakai dari beberapa thread sekaligus.
+
+    Args:
+        keep_latencies (int): Jumlah latensi per kalimat terakhir yang disimpan
+                              untuk perhitungan persentil (p50/p95/p99).
+    """
+
+    def __init__(self, keep_latencies=10000):
+        self.keep_latencies = keep_latencies
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Menghapus semua statistik."""
+        with self._lock:
+            self.parses = 0
+            self.accepted = 0
+            self.cache_hits = 0
+            self.session_seconds = None
+            self.phase_seconds = {}   # tahap -> total detik
+            self.phase_counts = {}    # tahap -> jumlah kejadian
+            self.rows = {}            # panjang -> [sel, sel hidup, simbol, titik potong, cek aturan, maks simbol/sel]
+            self.unknown_tokens = Counter()
+            self.latencies = []       # detik per kalimat (maks keep_latencies terakhir)
+            self.by_engine = Counter()
+
+    # --- Callback observer ---
+
+    def on_phase(self, phase, seconds):
+        with self._lock:
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+            self.phase_counts[phase] = self.phase_counts.get(phase, 0) + 1
+
+    def on_row(self, length, cells, live_cells, symbols, largest_cell, splits, rule_checks):
+        with self._lock:
+            stats = self.rows.get(length)
+            if stats is None:
+                stats = self.rows[length] = [0, 0, 0, 0, 0, 0]
+            stats[0] += cells
+            stats[1] += live_cells
+            stats[2] += symbols
+            stats[3] += splits
+            stats[4] += rule_checks
+            stats[5] = max(stats[5], largest_cell)
+
+    def on_unknown_token(self, position, word):
+        with self._lock:
+            self.unknown_tokens[word] += 1
+
+    def on_parse(self, engine, tokens, is_accepted, seconds, cached=False):
+        with self._lock:
+            self.parses += 1
+            self.by_engine[engine] += 1
+            if is_accepted:
+                self.accepted += 1
+            if cached:
+                self.cache_hits += 1
+            self.latencies.append(seconds)
+            if len(self.latencies) > self.keep_latencies:
+                del self.latencies[:len(self.latencies) - self.keep_latencies]
+
+    # --- Context manager: waktu total sesi ---
+
+    def __enter__(self):
+        self._session_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.session_seconds = time.perf_counter() - self._session_start
+        return False
+
+    # --- Ekspor ---
+
+    @property
+    def total_splits(self):
+        return sum(stats[3] for stats in self.rows.values())
+
+    @property
+    def total_rule_checks(self):
+        return sum(stats[4] for stats in self.rows.values())
+
+    def to_dict(self):
+        """Ringkasan statistik dalam bentuk dictionary (waktu dalam mikrodetik)."""
+        with self._lock:
+            phases = {}
+            for phase in sorted(self.phase_seconds, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+                total = self.phase_seconds[phase]
+                count = self.phase_counts[phase]
+                phases[phase] = {
+                    "total_us": round(total * 1e6, 1),
+                    "mean_us": round(total * 1e6 / count, 1),
+                    "count": count,
+                }
+            rows = {
+                length: {
+                    "cells": cells, "live_cells": live, "symbols": symbols,
+                    "max_symbols_per_cell": max_symbols, "splits": splits, "rule_checks": checks,
+                }
+                for length, (cells, live, symbols, splits, checks, max_symbols) in sorted(self.rows.items())
+            }
+            return {
+                "parses": self.parses,
+                "accepted": self.accepted,
+                "cache_hits": self.cache_hits,
+                "engines": dict(self.by_engine),
+                "session_seconds": self.session_seconds,
+                "latency_us": summarize([s * 1e6 for s in self.latencies]),
+                "phases": phases,
+                "splits": self.total_splits,
+                "rule_checks": self.total_rule_checks,
+                "rows": rows,
+                "unknown_tokens": dict(self.unknown_tokens.most_common()),
+            }
+
+    def save(self, path):
+        """Menulis to_dict() ke file JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def format_report(self, max_rows=10):
+        """Laporan ringkas dalam bentuk teks."""
+        data = self.to_dict()
+        lat = data["latency_us"]
+        lines = [
+            f"Kalimat: {data['parses']} (valid {data['accepted']}, dari cache {data['cache_hits']})",
+            f"Latensi (us): p50 {lat['p50']}, p95 {lat['p95']}, p99 {lat['p99']}, maks {lat['max']}",
+            "Waktu per tahap (us):",
+        ]
+        for phase, stats in data["phases"].items():
+            lines.append(f"  {phase:<9} total {stats['total_us']:>12}  rata-rata {stats['mean_us']:>10}")
+        lines.append(f"Titik potong: {data['splits']}, pemeriksaan aturan: {data['rule_checks']}")
+        lines.append(f"| {'panjang':>7} | {'sel':>7} | {'hidup':>7} | {'simbol':>8} | {'maks/sel':>8} "
+                     f"| {'potong':>9} | {'cek aturan':>10} |")
+        rows = list(data["rows"].items())
+        if len(rows) > max_rows:
+            # Baris terpendek dan terpanjang paling informatif untuk latensi ekor
+            rows = rows[:max_rows // 2] + rows[-(max_rows - max_rows // 2):]
+        for length, r in rows:
+            lines.append(f"| {length:>7} | {r['cells']:>7} | {r['live_cells']:>7} | {r['symbols']:>8} "
+                         f"| {r['max_symbols_per_cell']:>8} | {r['splits']:>9} | {r['rule_checks']:>10} |")
+        if data["unknown_tokens"]:
+            unknown = ", ".join(f"{word} ({count}x)" for word, count in list(data["unknown_tokens"].items())[:10])
+            lines.append(f"Token tak dikenal: {unknown}")
+        return "\n".join(lines)
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    from cyk_parser import get_bali_grammar, compile_grammar, cyk_parse_bitset
+
+    my_grammar = compile_grammar(get_bali_grammar())
+    with open('dataset_positif.txt', 'r') as f:
+        kalimat_list = [line.strip() for line in f if line.strip()]
+    kalimat_list.append("Jegeg sajan komputer i Putu")  # Mengandung kata tak dikenal
+
+    with ParseProfiler() as profiler:
+        for kalimat in kalimat_list:
+            cyk_parse_bitset(kalimat, my_grammar, sparse=True, backpointers=True, observer=profiler)
+    print(profiler.format_report())
@@ -0,0 +1,398 @@
+# =======================================================================================
+# Deskripsi: Antarmuka backend parser yang bisa dipilih saat runtime (CYK atau Earley),
+#            dengan hasil penerimaan dan pohon parse yang identik untuk grammar yang sama
+# =======================================================================================
+
+import time
+
+from cyk_parser import (
+    ParseResult, compile_grammar, diagnose_unknown_tokens, fill_cyk_table, fill_bitset_chart,
+    fill_sparse_chart, get_parse_tree_structure, warn_unknown_token,
+)
+
+
+class ParserBackend:
+    """
+    Antarmuka umum backend parser.
+
+    Setiap backend memegang satu CompiledGrammar dan menyediakan:
+        - recognize(tokens, with_tree): mengisi tabel/chart, mengembalikan
+          (is_accepted, chart). Chart mendukung akses table[i][j] seperti tabel
+          CYK, sehingga get_parse_tree_structure() dan ParseForest bisa dipakai.
+        - parse(tokens): ParseResult lengkap dengan pohon parse dan diagnosis
+          token tak dikenal (posisi + kandidat kata lexicon termirip).
+        - parse_sentence(sentence): tokenisasi + parse.
+
+    Pohon parse selalu dipilih dengan aturan "Greedy Left" yang sama
+    (lihat get_parse_tree_structure()), jadi semua backend menghasilkan pohon
+    yang sama untuk kalimat yang sama.
+
+    Dengan fuzzy=True, token tak dikenal diisi kategori kata lexicon terdekat
+    (jarak edit 1-2, lihat CompiledGrammar.recover_word()). Diagnosis token tak
+    dikenal di ParseResult tetap dilaporkan.
+    """
+
+    name = None
+    # Jumlah kandidat kata lexicon per token tak dikenal di ParseResult (0 = tanpa kandidat)
+    max_candidates = 3
+
+    def __init__(self, grammar, fuzzy=False):
+        self.compiled = compile_grammar(grammar)
+        self.fuzzy = fuzzy
+        if fuzzy:
+            # Indeks fuzzy dibangun sekarang (juga di initializer worker), bukan
+            # saat kata tak dikenal pertama muncul di tengah batch
+            self.compiled.fuzzy_lexicon
+
+    def recognize(self, tokens, with_tree=False):
+        raise NotImplementedError
+
+    def parse(self, tokens, with_tree=True, sentence=None):
+        """
+        Mem-parse token yang SUDAH dipreprocessing.
+
+        Args:
+            tokens (list): Daftar token.
+            with_tree (bool): Jika True, pohon parse dihitung untuk kalimat valid.
+            sentence (str): Kalimat asli untuk ParseResult (default: token digabung spasi).
+        """
+        started = time.perf_counter()
+        is_accepted, chart = self.recognize(tokens, with_tree=with_tree)
+        tree = None
+        if with_tree and is_accepted:
+            tree = get_parse_tree_structure(self.compiled, chart, tokens)
+        elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+        if sentence is None:
+            sentence = " ".join(tokens)
+        unknown = diagnose_unknown_tokens(tokens, self.compiled, self.max_candidates)
+        return ParseResult(sentence, tokens, is_accepted, tree, elapsed_us, unknown)
+
+    def parse_sentence(self, sentence, with_tree=True):
+        """Tokenisasi kalimat dengan tokenizer grammar lalu parse(); waktu tokenisasi ikut diukur."""
+        started = time.perf_counter()
+        tokens = self.compiled.tokenizer.tokenize(sentence)
+        result = self.parse(tokens, with_tree=with_tree, sentence=sentence)
+        elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+        return result._replace(elapsed_us=elapsed_us)
+
+
+class CYKBackend(ParserBackend):
+    """
+    Backend CYK (bottom-up, O(n^3) untuk setiap input).
+
+    Args:
+        grammar (dict | CompiledGrammar): Aturan tata bahasa.
+        engine (str): "set", "bitset", "sparse", "bitset+prune" atau "sparse+prune"
+                      (lihat cyk_parse() dan cyk_parse_bitset()).
+        observer (ParseObserver): Opsional, penerima data instrumentasi untuk
+                                  setiap kalimat (lihat parse_profiler.py).
+        fuzzy (bool): Pulihkan token tak dikenal lewat kata lexicon terdekat.
+    """
+
+    name = "cyk"
+    ENGINES = ("set", "bitset", "sparse", "bitset+prune", "sparse+prune")
+
+    def __init__(self, grammar, engine="sparse", observer=None, fuzzy=False):
+        super().__init__(grammar, fuzzy)
+        if engine not in self.ENGINES:
+            raise ValueError(f"Engine CYK '{engine}' tidak dikenal (pilihan: {', '.join(self.ENGINES)}).")
+        self.engine = engine
+        self.observer = observer
+
+    def recognize(self, tokens, with_tree=False):
+        observer = self.observer
+        started = time.perf_counter() if observer is not None else None
+        if self.engine == "set":
+            is_accepted, chart = fill_cyk_table(tokens, self.compiled, observer=observer, fuzzy=self.fuzzy)
+        else:
+            base, _, prune = self.engine.partition("+")
+            fill = fill_sparse_chart if base == "sparse" else fill_bitset_chart
+            # Back-pointer hanya dicatat jika pohon parse memang akan diambil
+            is_accepted, chart = fill(tokens, self.compiled, backpointers=with_tree, prune=bool(prune),
+                                      observer=observer, fuzzy=self.fuzzy)
+        if observer is not None:
+            observer.on_parse(self.engine, tokens, is_accepted, time.perf_counter() - started)
+        return is_accepted, chart
+
+
+class EarleyChart:
+    """
+    Hasil pengenalan Earley dalam bentuk view tabel CYK.
+
+    completed[e] adalah dictionary awal -> set simbol, berisi semua A yang
+    selesai (A =>* tokens[awal .. e-1]) dan diprediksi di posisi awal.
+    chart[i][j] mengembalikan set simbol untuk span tokens[i .. j], sehingga
+    penelusuran balik CYK bisa dipakai langsung. Untuk simbol-simbol di pohon
+    parse, isi sel ini sama persis dengan tabel CYK: setiap simbol yang ditanyakan
+    oleh penelusuran balik pasti sudah diprediksi di posisi awalnya.
+
+    Item yang dilewati optimasi Leo dicatat di leo_used[e] dan baru dimunculkan
+    (dijalankan ulang rantainya) saat sel yang berakhir di e pertama kali dibaca.
+    """
+
+    def __init__(self, compiled, tokens, completed, leo_used, leo):
+        self.compiled = compiled
+        self.tokens = tokens
+        self.completed = completed
+        self._leo = leo
+        self._leo_used = leo_used
+        self._expanded = set()
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _expand_leo(self, end):
+        """Memunculkan item selesai yang dilewati rantai Leo untuk posisi akhir 'end'."""
+        self._expanded.add(end)
+        by_start = self.completed[end]
+        for symbol, origin in self._leo_used[end]:
+            entry = self._leo[origin][symbol]
+            while entry is not None:
+                lhs, start = entry[0], entry[1]
+                cell = by_start.setdefault(start, set())
+                if lhs in cell:
+                    break  # Sisa rantai sudah dimunculkan oleh rantai lain
+                cell.add(lhs)
+                entry = self._leo[start].get(lhs)
+
+    def cell(self, i, j):
+        """Set simbol yang menurunkan tokens[i .. j] (kosong untuk j < i)."""
+        if j < i:
+            return frozenset()
+        end = j + 1
+        if end not in self._expanded:
+            self._expand_leo(end)
+        return self.completed[end].get(i, frozenset())
+
+    def __getitem__(self, i):
+        return _EarleyChartRow(self, i)
+
+
+class _EarleyChartRow:
+    """Baris view dari EarleyChart, agar sintaks chart[i][j] tetap berlaku."""
+
+    def __init__(self, chart, i):
+        self._chart = chart
+        self._i = i
+
+    def __len__(self):
+        return len(self._chart.tokens)
+
+    def __getitem__(self, j):
+        return self._chart.cell(self._i, j)
+
+
+class EarleyBackend(ParserBackend):
+    """
+    Backend Earley (top-down dengan prediksi) di atas grammar yang sama.
+
+    Hanya simbol yang diprediksi dari kiri yang dikerjakan, jadi kalimat yang
+    sebagian besar bercabang ke kanan (pola umum kalimat Bahasa Bali) diproses
+    mendekati linear. Dengan optimasi Leo (leo=True), rantai penyelesaian
+    rekursi-kanan yang deterministik (A -> B X, X -> C Y, ...) tidak diselesaikan
+    satu per satu: item teratasnya langsung ditambahkan, sehingga rekursi kanan
+    tidak lagi kuadratik.
+
+    Grammar yang didukung sama dengan engine CYK: aturan biner, aturan unit,
+    dan aturan terminal (tanpa aturan epsilon). Item disimpan sebagai
+    (id_aturan, posisi_titik, awal) dan dikelompokkan per simbol sesudah titik.
+
+    Args:
+        grammar (dict | CompiledGrammar): Aturan tata bahasa.
+        leo (bool): Aktifkan optimasi rekursi-kanan Leo.
+        fuzzy (bool): Pulihkan token tak dikenal lewat kata lexicon terdekat.
+    """
+
+    name = "earley"
+
+    def __init__(self, grammar, leo=True, fuzzy=False):
+        super().__init__(grammar, fuzzy)
+        self.leo = leo
+        compiled = self.compiled
+
+        # Aturan non-terminal (biner & unit) dengan id berurutan
+        self.rules = []
+        rules_of = {}
+        for lhs, alternatives in compiled.rule_order.items():
+            for rhs in alternatives:
+                rules_of.setdefault(lhs, []).append(len(self.rules))
+                self.rules.append((lhs, tuple(rhs)))
+
+        # Prediksi X sekaligus memprediksi semua simbol pojok kirinya (left corner)
+        self._predict_closure = {}
+        for sym in compiled.symbols:
+            closure = [sym]
+            seen = {sym}
+            for current in closure:
+                for rule_id in rules_of.get(current, ()):
+                    first = self.rules[rule_id][1][0]
+                    if first not in seen:
+                        seen.add(first)
+                        closure.append(first)
+            self._predict_closure[sym] = [(Y, rules_of.get(Y, ())) for Y in closure]
+
+    def recognize(self, tokens, with_tree=False):
+        compiled = self.compiled
+        rules = self.rules
+        predict_closure = self._predict_closure
+        use_leo = self.leo
+        n = len(tokens)
+        if n == 0:
+            return False, EarleyChart(compiled, tokens, [{}], [[]], [{}])
+
+        # waiting[i][X]: item di set i yang titiknya tepat sebelum X
+        waiting = [{} for _ in range(n + 1)]
+        predicted = [set() for _ in range(n + 1)]
+        completed = [{} for _ in range(n + 1)]
+        leo_used = [[] for _ in range(n + 1)]
+        leo = [{} for _ in range(n + 1)]  # memo item Leo per set: simbol -> entri atau None
+
+        def predict(i, symbol):
+            done = predicted[i]
+            if symbol in done:
+                return
+            items = waiting[i]
+            for Y, rule_ids in predict_closure[symbol]:
+                if Y in done:
+                    continue
+                done.add(Y)
+                for rule_id in rule_ids:
+                    items.setdefault(rules[rule_id][1][0], []).append((rule_id, 0, i))
+
+        predict(0, compiled.start_symbol)
+
+        for i, word in enumerate(tokens):
+            end = i + 1
+            by_start = completed[end]
+            agenda = []
+
+            # --- SCAN: aturan terminal A -> 'kata' untuk A yang diprediksi di i ---
+            lhs_set = compiled.lookup_terminal(word)
+            if not lhs_set:
+                recovery = compiled.recover_word(word) if self.fuzzy else None
+                if recovery is not None:
+                    lhs_set = recovery.symbols
+                else:
+                    warn_unknown_token(word)
+            for A in lhs_set:
+                if A in predicted[i]:
+                    by_start.setdefault(i, set()).add(A)
+                    agenda.append((A, i))
+
+            # --- COMPLETE (+ PREDICT untuk item yang maju) ---
+            items_here = waiting[end]
+            while agenda:
+                symbol, origin = agenda.pop()
+                if use_leo:
+                    entry = self._leo_item(leo, waiting, origin, symbol)
+                    if entry is not None:
+                        # Rantai deterministik: langsung ke item teratas
+                        leo_used[end].append((symbol, origin))
+                        top, top_origin = entry[2], entry[3]
+                        cell = by_start.setdefault(top_origin, set())
+                        if top not in cell:
+                            cell.add(top)
+                            agenda.append((top, top_origin))
+                        continue
+                for rule_id, dot, start in waiting[origin].get(symbol, ()):
+                    lhs, rhs = rules[rule_id]
+                    if dot + 1 == len(rhs):
+                        cell = by_start.setdefault(start, set())
+                        if lhs not in cell:
+                            cell.add(lhs)
+                            agenda.append((lhs, start))
+                    else:
+                        following = rhs[dot + 1]
+                        items_here.setdefault(following, []).append((rule_id, dot + 1, start))
+                        predict(end, following)
+
+            # Prefiks yang benar (correct prefix): jika tidak ada yang diprediksi
+            # di posisi berikutnya, tidak ada kelanjutan yang bisa diterima.
+            if end < n and not predicted[end]:
+                break
+
+        chart = EarleyChart(compiled, tokens, completed, leo_used, leo)
+        is_accepted = compiled.start_symbol in chart.cell(0, n - 1)
+        return is_accepted, chart
+
+    def _leo_item(self, memo_sets, waiting, origin, symbol):
+        """
+        Item Leo untuk 'symbol' di set 'origin': (lhs, awal, lhs_teratas, awal_teratas)
+        jika set tersebut memuat TEPAT SATU item dengan titik sebelum 'symbol' dan
+        item itu penultimate (A -> alpha . symbol), atau None. Dihitung iteratif dan
+        di-memo; set 'origin' sudah final saat fungsi ini dipanggil.
+        """
+        rules = self.rules
+        path = []
+        entry = None
+        while True:
+            memo = memo_sets[origin]
+            if symbol in memo:
+                entry = memo[symbol]
+                break
+            items = waiting[origin].get(symbol)
+            if items is None or len(items) != 1:
+                memo[symbol] = None
+                break
+            rule_id, dot, start = items[0]
+            lhs, rhs = rules[rule_id]
+            if dot + 1 != len(rhs):
+                memo[symbol] = None
+                break
+            path.append((origin, symbol, lhs, start))
+            symbol, origin = lhs, start
+
+        for origin, symbol, lhs, start in reversed(path):
+            top = (entry[2], entry[3]) if entry is not None else (lhs, start)
+            entry = (lhs, start) + top
+            memo_sets[origin][symbol] = entry
+        return entry
+
+
+# Backend yang bisa dipilih lewat nama (CLI, batch, benchmark)
+BACKENDS = {
+    CYKBackend.name: CYKBackend,
+    EarleyBackend.name: EarleyBackend,
+}
+
+
+def get_backend(name, grammar, **options):
+    """
+    Membuat backend berdasarkan nama ("cyk" atau "earley").
+
+    Args:
+        name (str): Nama backend (lihat BACKENDS).
+        grammar (dict | CompiledGrammar | str): Aturan tata bahasa.
+        **options: Opsi backend, misal engine="bitset" untuk CYK, leo=False untuk Earley,
+                   atau fuzzy=True (keduanya).
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Backend parser '{name}' tidak dikenal (pilihan: {', '.join(BACKENDS)}).") from None
+    return backend_class(grammar, **options)
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    from cyk_parser import get_bali_grammar
+
+    my_grammar = compile_grammar(get_bali_grammar())
+    backends = [get_backend(name, my_grammar) for name in BACKENDS]
+
+    for path in ("dataset_positif.txt", "dataset_negatif.txt"):
+        with open(path, "r") as f:
+            sentences = [line.strip() for line in f if line.strip()]
+        elapsed = {backend.name: 0 for backend in backends}
+        mismatches = 0
+        for sentence in sentences:
+            results = [backend.parse_sentence(sentence) for backend in backends]
+            for backend, result in zip(backends, results):
+                elapsed[backend.name] += result.elapsed_us
+            if any((r.is_accepted, r.tree) != (results[0].is_accepted, results[0].tree) for r in results):
+                mismatches += 1
+                print(f"[BERBEDA] {sentence}")
+        timing = ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in elapsed.items())
+        print(f"{path}: {len(sentences)} kalimat, {mismatches} berbeda ({timing})")
@@ -0,0 +1,808 @@
+# =======================================================================================
+# Deskripsi: Probabilistic CYK (PCFG): probabilitas aturan grammar, pelatihan dari
+#            treebank atau inside-outside, dan chart Viterbi untuk pohon parse terbaik
+# =======================================================================================
+
+import json
+import math
+import time
+from array import array
+from collections import namedtuple
+
+from cyk_parser import compile_grammar, warn_unknown_token
+
+NEG_INF = float("-inf")
+
+# Satu potongan hasil parse parsial (lihat ViterbiChart.covering_spans()).
+#   start, end : posisi token awal dan akhir (inklusif)
+#   symbol     : simbol terbaik untuk span ini (None jika token tidak dikenal)
+#   logprob    : log-probabilitas derivasi simbol tersebut
+#   tree       : pohon parse span (nested tuple) atau None
+CoveringSpan = namedtuple("CoveringSpan", ["start", "end", "symbol", "logprob", "tree"])
+
+# Hasil beam_parse(): seperti ParseResult, ditambah status kelengkapan chart.
+#   complete : False jika anggaran waktu/langkah habis sebelum chart selesai
+#   logprob  : log-probabilitas pohon terbaik (-inf jika tidak diterima)
+#   spans    : potongan terbesar yang menutup seluruh kalimat (list CoveringSpan);
+#              untuk kalimat yang diterima berisi satu span penuh
+BeamParseResult = namedtuple(
+    "BeamParseResult",
+    ["sentence", "tokens", "is_accepted", "complete", "logprob", "tree", "spans", "elapsed_us"],
+)
+
+
+class PCFGModelError(ValueError):
+    """File model PCFG tidak valid atau dibuat untuk grammar yang berbeda."""
+
+
+class PCFG:
+    """
+    Grammar beserta probabilitas setiap aturannya, P(A -> rhs | A).
+
+    Aturan diambil dari grammar terkompilasi (aturan biner, unit, dan terminal)
+    dan diberi id berurutan sesuai urutan di grammar. Probabilitas disimpan di
+    list 'prob' (indeks = id aturan); versi log dipakai oleh chart Viterbi.
+
+    Args:
+        grammar (dict | CompiledGrammar): Aturan tata bahasa.
+        probabilities (dict): Opsional, (LHS, tuple RHS) -> probabilitas.
+                              Aturan yang tidak disebut memakai distribusi
+                              seragam per LHS; hasilnya dinormalisasi per LHS.
+    """
+
+    def __init__(self, grammar, probabilities=None):
+        compiled = compile_grammar(grammar)
+        self.compiled = compiled
+        self.rules = []        # id -> (LHS, tuple RHS)
+        self.rule_ids = {}     # (LHS, tuple RHS) -> id
+        self.rules_of = {}     # LHS -> list id aturan
+        for lhs, alternatives in compiled.rules.items():
+            for rhs in alternatives:
+                key = (lhs, tuple(rhs))
+                if key in self.rule_ids:
+                    continue  # Aturan ganda dihitung sekali
+                self.rule_ids[key] = len(self.rules)
+                self.rules_of.setdefault(lhs, []).append(len(self.rules))
+                self.rules.append(key)
+
+        prob = [0.0] * len(self.rules)
+        for lhs, ids in self.rules_of.items():
+            for rule_id in ids:
+                value = None if probabilities is None else probabilities.get(self.rules[rule_id])
+                prob[rule_id] = 1.0 / len(ids) if value is None else float(value)
+        self.set_probabilities(prob)
+
+    def set_probabilities(self, prob):
+        """Memasang probabilitas baru (list per id aturan), dinormalisasi per LHS."""
+        prob = list(prob)
+        for ids in self.rules_of.values():
+            total = sum(prob[rule_id] for rule_id in ids)
+            for rule_id in ids:
+                prob[rule_id] = prob[rule_id] / total if total > 0 else 1.0 / len(ids)
+        self.prob = prob
+        self._build_tables()
+
+    def probability(self, lhs, rhs):
+        """P(lhs -> rhs); 0.0 jika aturan tidak ada di grammar."""
+        rule_id = self.rule_ids.get((lhs, tuple(rhs)))
+        return 0.0 if rule_id is None else self.prob[rule_id]
+
+    def _build_tables(self):
+        """Indeks aturan dalam bentuk bit simbol, untuk chart Viterbi & inside-outside."""
+        compiled = self.compiled
+        symbol_ids = compiled.symbol_ids
+        prob = self.prob
+
+        def log(p):
+            return math.log(p) if p > 0 else NEG_INF
+
+        # Kata -> list (a, p, log p, id aturan) untuk aturan terminal A -> 'kata'
+        self.terminal_rules = {}
+        # Bit simbol kiri b -> list (c, a, p, log p, id) untuk aturan biner A -> B C
+        self.binary_by_left = [[] for _ in compiled.symbols]
+        # Aturan unit dikelompokkan per LHS: a -> list (b, p, log p, id)
+        units = {}
+        for rule_id, (lhs, rhs) in enumerate(self.rules):
+            p = prob[rule_id]
+            a = symbol_ids[lhs]
+            if len(rhs) == 2:
+                b, c = symbol_ids[rhs[0]], symbol_ids[rhs[1]]
+                self.binary_by_left[b].append((c, a, p, log(p), rule_id))
+            elif rhs[0] in symbol_ids:
+                units.setdefault(a, []).append((symbol_ids[rhs[0]], p, log(p), rule_id))
+            else:
+                self.terminal_rules.setdefault(rhs[0], []).append((a, p, log(p), rule_id))
+
+        # Urutan topologis aturan unit (anak sebelum induk): simbol dengan lebih
+        # sedikit keturunan unit selalu diproses lebih dulu.
+        descendants = {sym: 0 for sym in compiled.symbols}
+        for sym, ancestors in compiled.unary_closure.items():
+            for ancestor in ancestors:
+                descendants[ancestor] += 1
+        order = sorted(units, key=lambda a: descendants[compiled.symbols[a]])
+        self.unit_order = [(a, units[a]) for a in order]
+
+    def to_dict(self):
+        """Model dalam bentuk dictionary yang bisa ditulis sebagai JSON."""
+        return {
+            "fingerprint": self.compiled.fingerprint,
+            "start_symbol": self.compiled.start_symbol,
+            "rules": [[lhs, list(rhs), self.prob[rule_id]] for rule_id, (lhs, rhs) in enumerate(self.rules)],
+        }
+
+    def save(self, path):
+        """Menyimpan probabilitas aturan ke file JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path, grammar):
+        """
+        Memuat model dari file JSON hasil save() untuk 'grammar'.
+
+        Raises:
+            PCFGModelError: Jika file tidak valid atau dibuat dari grammar yang berbeda.
+        """
+        compiled = compile_grammar(grammar)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            fingerprint = data["fingerprint"]
+            probabilities = {(lhs, tuple(rhs)): p for lhs, rhs, p in data["rules"]}
+        except (ValueError, KeyError, TypeError) as exc:
+            raise PCFGModelError(f"File model PCFG '{path}' tidak valid: {exc}") from None
+        if fingerprint != compiled.fingerprint:
+            raise PCFGModelError(
+                f"Model PCFG '{path}' dilatih untuk grammar lain. Latih ulang dengan 'train-pcfg'."
+            )
+        return cls(compiled, probabilities)
+
+
+# =======================================================================================
+# CHART VITERBI
+# =======================================================================================
+
+class ViterbiChart:
+    """
+    Chart CYK probabilistik: untuk setiap (sel, simbol) hanya disimpan SATU
+    entri terbaik, yaitu log-probabilitas tertinggi beserta back-pointer-nya.
+
+    Nilai disimpan per baris panjang span d = j - i, masing-masing array datar
+    berukuran (jumlah sel di baris x jumlah simbol):
+        score[d][idx] : log-probabilitas terbaik (-inf jika simbol tidak ada)
+        rule[d][idx]  : id aturan pembentuk entri terbaik (-1 jika tidak ada)
+        split[d][idx] : titik potong k untuk aturan biner
+        live[d][i]    : simbol yang hidup di sel (i, i + d)
+    dengan idx = i * jumlah_simbol + bit simbol. Memori tetap O(n^2 x simbol)
+    berapa pun jumlah pohon parse yang mungkin; baris yang belum dikerjakan
+    (anggaran habis) bernilai None dan tidak pernah dialokasikan.
+
+    Dengan beam, simbol yang dibuang dari sel diberi score -inf tetapi
+    back-pointer-nya dibiarkan, karena masih bisa menjadi anak aturan unit
+    dari simbol lain di sel yang sama.
+
+    complete bernilai False jika pengisian dihentikan oleh anggaran waktu/langkah;
+    sel yang belum diisi dianggap kosong.
+    """
+
+    def __init__(self, model, tokens, score, rule, split, live, complete=True):
+        self.model = model
+        self.compiled = model.compiled
+        self.tokens = tokens
+        self.score = score
+        self.rule = rule
+        self.split = split
+        self.live = live
+        self.complete = complete
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _filled_rows(self):
+        """Jumlah baris (panjang span 1, 2, ...) yang sudah mulai diisi."""
+        rows = 0
+        while rows < len(self.live) and self.live[rows] is not None:
+            rows += 1
+        return rows
+
+    def logprob(self, symbol=None, i=0, j=None):
+        """Log-probabilitas derivasi terbaik 'symbol' (default simbol awal) untuk tokens[i .. j]."""
+        if not self.tokens:
+            return NEG_INF
+        j = len(self.tokens) - 1 if j is None else j
+        row = self.score[j - i]
+        if row is None:
+            return NEG_INF
+        return row[i * len(self.compiled.symbols) + self.compiled.symbol_ids[symbol or self.compiled.start_symbol]]
+
+    def best_tree(self, symbol=None, i=0, j=None):
+        """
+        Pohon parse dengan probabilitas tertinggi (nested tuple, format sama
+        dengan get_parse_tree_structure()) untuk 'symbol' di tokens[i .. j]
+        (default: simbol awal di seluruh kalimat), atau None jika tidak ada.
+        Disusun secara iteratif dari back-pointer.
+        """
+        n = len(self.tokens)
+        symbol = symbol or self.compiled.start_symbol
+        j = n - 1 if j is None else j
+        if n == 0 or self.logprob(symbol, i, j) == NEG_INF:
+            return None
+
+        symbols = self.compiled.symbols
+        symbol_ids = self.compiled.symbol_ids
+        rules = self.model.rules
+        nsym = len(symbols)
+
+        def children(node):
+            a, start, end = node
+            idx = start * nsym + a
+            lhs, rhs = rules[self.rule[end - start][idx]]
+            if len(rhs) == 2:
+                k = self.split[end - start][idx]
+                return (symbol_ids[rhs[0]], start, k), (symbol_ids[rhs[1]], k + 1, end)
+            if rhs[0] in symbol_ids:
+                return ((symbol_ids[rhs[0]], start, end),)  # Aturan unit
+            return ()  # Daun: A -> 'kata'
+
+        root = (symbol_ids[symbol], i, j)
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(reversed(children(node)))
+        built = {}
+        for node in reversed(order):
+            kids = children(node)
+            if not kids:
+                built[node] = (symbols[node[0]], self.tokens[node[1]])
+            else:
+                built[node] = (symbols[node[0]],) + tuple(built[child] for child in kids)
+        tree = built[root]
+
+        if self.compiled.cnf_origin is not None:
+            from cnf_converter import debinarize_tree
+            tree = debinarize_tree(tree, self.compiled.cnf_origin)
+        return tree
+
+    def _best_symbol(self, i, j):
+        """(simbol, logprob) terbaik di sel (i, j): simbol awal didahulukan, lalu score tertinggi."""
+        live_row = self.live[j - i]
+        live = live_row[i] if live_row is not None else None
+        if not live:
+            return None, NEG_INF
+        scores = self.score[j - i]
+        base = i * len(self.compiled.symbols)
+        start = self.compiled.symbol_ids[self.compiled.start_symbol]
+        a = start if start in live else max(live, key=lambda x: scores[base + x])
+        return self.compiled.symbols[a], scores[base + a]
+
+    def covering_spans(self):
+        """
+        Hasil parsial terbaik: potongan span terisi yang menutup seluruh kalimat
+        dengan JUMLAH POTONGAN sesedikit mungkin (span terbesar), lalu total
+        log-probabilitas tertinggi. Token yang tidak dikenal menjadi potongan
+        sendiri dengan symbol None.
+
+        Hanya span sepanjang baris yang sudah diisi yang diperiksa, sehingga
+        biayanya sebanding dengan bagian chart yang sempat dikerjakan.
+
+        Returns:
+            list CoveringSpan urut dari kiri ke kanan.
+        """
+        n = len(self.tokens)
+        if n == 0:
+            return []
+        max_length = max(self._filled_rows(), 1)
+        # best[e] = (jumlah potongan, -total logprob, awal potongan terakhir) untuk tokens[0 .. e-1]
+        best = [(0, 0.0, None)] + [None] * n
+        choice = {}
+        for end in range(1, n + 1):
+            for start in range(end - 1, max(end - max_length, 0) - 1, -1):
+                if best[start] is None:
+                    continue
+                symbol, logprob = self._best_symbol(start, end - 1)
+                if symbol is None and end - start > 1:
+                    continue
+                penalty = -logprob if symbol is not None else 0.0
+                candidate = (best[start][0] + 1, best[start][1] + penalty, start)
+                if best[end] is None or candidate[:2] < best[end][:2]:
+                    best[end] = candidate
+                    choice[end] = (symbol, logprob)
+
+        spans = []
+        end = n
+        while end > 0:
+            start = best[end][2]
+            symbol, logprob = choice[end]
+            tree = self.best_tree(symbol, start, end - 1) if symbol is not None else None
+            spans.append(CoveringSpan(start, end - 1, symbol, logprob, tree))
+            end = start
+        spans.reverse()
+        return spans
+
+
+def fill_viterbi_chart(tokens, model, beam_width=None, time_budget=None, max_steps=None,
+                       fuzzy=False, oov_penalty=3.0):
+    """
+    Mengisi chart Viterbi untuk token yang SUDAH dipreprocessing.
+
+    Per sel: aturan biner dikombinasikan untuk setiap titik potong (k terbesar
+    dulu; nilai seri mempertahankan entri yang lebih dulu), lalu aturan unit
+    diterapkan sekali dalam urutan topologis. Perhitungan memakai penjumlahan
+    log-probabilitas sehingga tidak terjadi underflow pada kalimat panjang.
+
+    Args opsional (mode terbatas untuk input sangat panjang):
+        beam_width (int): Setiap sel hanya menyimpan paling banyak sekian simbol
+                          dengan score tertinggi. Hasilnya tidak lagi dijamin
+                          optimal (kalimat valid bisa saja tidak ditemukan).
+        time_budget (float): Batas waktu dalam detik, dihitung sejak fungsi
+                             dipanggil (termasuk alokasi chart dan diagonal).
+        max_steps (int): Batas jumlah kombinasi (sel, titik potong) yang dikerjakan.
+    Jika anggaran habis, pengisian berhenti di sel berjalan dan chart.complete
+    bernilai False; gunakan chart.covering_spans() untuk hasil parsial.
+
+    Args opsional (token tak dikenal):
+        fuzzy (bool): Token tak dikenal diisi aturan terminal SEMUA kata lexicon
+                      dalam jarak edit 1-2 (lihat fuzzy_lexicon.py), masing-masing
+                      dengan log-probabilitas dikurangi jarak * oov_penalty.
+        oov_penalty (float): Penalti log-probabilitas per satu jarak edit.
+
+    Returns:
+        is_accepted (bool), chart (ViterbiChart).
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    compiled = model.compiled
+    n = len(tokens)
+    nsym = len(compiled.symbols)
+
+    # Baris dialokasikan saat mulai dikerjakan: chart yang terpotong anggaran
+    # tidak membayar alokasi O(n^2 x simbol) untuk baris yang tidak pernah diisi
+    score = [None] * n
+    rule = [None] * n
+    split = [None] * n
+    live = [None] * n  # Simbol yang hidup per sel (agar tidak memindai semua simbol)
+    if n == 0:
+        return False, ViterbiChart(model, tokens, score, rule, split, live)
+
+    def start_row(length):
+        width = (n - length + 1) * nsym
+        score[length - 1] = array("d", [NEG_INF]) * width
+        rule[length - 1] = array("l", [-1]) * width
+        split[length - 1] = array("l", [-1]) * width
+        live[length - 1] = [None] * (n - length + 1)
+        return score[length - 1], rule[length - 1], split[length - 1], live[length - 1]
+
+    binary_by_left = model.binary_by_left
+    unit_order = model.unit_order
+    steps = 0
+
+    def close_units(row_score, row_rule, row_split, base):
+        for a, units in unit_order:
+            idx = base + a
+            best = row_score[idx]
+            for b, _, lp, rule_id in units:
+                s = row_score[base + b] + lp
+                if s > best:
+                    best = s
+                    row_score[idx] = s
+                    row_rule[idx] = rule_id
+                    row_split[idx] = -1
+
+    def finish_cell(row_score, base):
+        """Daftar simbol hidup di sel; dengan beam hanya beam_width simbol terbaik yang dipertahankan."""
+        alive = [a for a in range(nsym) if row_score[base + a] > NEG_INF]
+        if beam_width is not None and len(alive) > beam_width:
+            alive.sort(key=lambda a: row_score[base + a], reverse=True)
+            for a in alive[beam_width:]:
+                row_score[base + a] = NEG_INF
+            alive = sorted(alive[:beam_width])
+        return alive
+
+    # --- TAHAP 1: DIAGONAL (diisi lebih dulu, agar hasil parsial minimal per token) ---
+    row_score, row_rule, row_split, row_live = start_row(1)
+    for i, word in enumerate(tokens):
+        # Pencarian fuzzy per token tidak gratis: anggaran waktu juga diperiksa di sini
+        if deadline is not None and time.perf_counter() > deadline:
+            return False, ViterbiChart(model, tokens, score, rule, split, live, complete=False)
+        base = i * nsym
+        entries = model.terminal_rules.get(word, ())
+        if not entries and fuzzy:
+            # Kandidat lebih jauh tetap ikut, tetapi dengan penalti lebih besar
+            entries = [
+                (a, p, lp - distance * oov_penalty, rule_id)
+                for candidate, distance in compiled.fuzzy_lexicon.lookup(word)
+                for a, p, lp, rule_id in model.terminal_rules.get(candidate, ())
+            ]
+        if not entries:
+            warn_unknown_token(word)
+        for a, _, lp, rule_id in entries:
+            if lp > row_score[base + a]:
+                row_score[base + a] = lp
+                row_rule[base + a] = rule_id
+        close_units(row_score, row_rule, row_split, base)
+        row_live[i] = finish_cell(row_score, base)
+
+    # --- TAHAP 2: KOMBINASI BOTTOM-UP ---
+    for length in range(2, n + 1):
+        # Alokasi baris baru juga memakan waktu: periksa anggaran sebelumnya
+        if deadline is not None and time.perf_counter() > deadline:
+            return False, ViterbiChart(model, tokens, score, rule, split, live, complete=False)
+        row_score, row_rule, row_split, row_live = start_row(length)
+        for i in range(n - length + 1):
+            # Anggaran diperiksa sekali per sel, bukan per kombinasi
+            if (deadline is not None and time.perf_counter() > deadline) or (
+                max_steps is not None and steps >= max_steps
+            ):
+                return False, ViterbiChart(model, tokens, score, rule, split, live, complete=False)
+            j = i + length - 1
+            base = i * nsym
+            for k in range(j - 1, i - 1, -1):
+                left_live = live[k - i][i]
+                if not left_live:
+                    continue
+                if not live[j - k - 1][k + 1]:
+                    continue
+                steps += 1
+                left_score = score[k - i]
+                right_score_row = score[j - k - 1]
+                left_base = i * nsym
+                right_base = (k + 1) * nsym
+                for b in left_live:
+                    left_value = left_score[left_base + b]
+                    for c, a, _, lp, rule_id in binary_by_left[b]:
+                        right_score = right_score_row[right_base + c]
+                        if right_score == NEG_INF:
+                            continue
+                        s = left_value + right_score + lp
+                        idx = base + a
+                        if s > row_score[idx]:
+                            row_score[idx] = s
+                            row_rule[idx] = rule_id
+                            row_split[idx] = k
+            close_units(row_score, row_rule, row_split, base)
+            row_live[i] = finish_cell(row_score, base)
+
+    chart = ViterbiChart(model, tokens, score, rule, split, live)
+    return chart.logprob() > NEG_INF, chart
+
+
+def viterbi_parse(sentence, model, **options):
+    """
+    Parsing probabilistik satu kalimat.
+
+    Args:
+        sentence (str): Kalimat input.
+        model (PCFG): Grammar beserta probabilitas aturannya.
+        **options: beam_width, time_budget, max_steps, fuzzy, oov_penalty
+                   (lihat fill_viterbi_chart()).
+
+    Returns:
+        is_accepted (bool), chart (ViterbiChart), tokens (list).
+        Pohon terbaik: chart.best_tree(); log-probabilitasnya: chart.logprob().
+    """
+    tokens = model.compiled.tokenizer.tokenize(sentence)
+    is_accepted, chart = fill_viterbi_chart(tokens, model, **options)
+    return is_accepted, chart, tokens
+
+
+def beam_parse(sentence, model, beam_width=8, time_budget=None, max_steps=None, fuzzy=False):
+    """
+    Mode parsing terbatas untuk input sangat panjang (misal paragraf gabungan
+    klausa), dengan latensi terburuk yang dapat diprediksi:
+        - setiap sel menyimpan paling banyak 'beam_width' simbol terbaik;
+        - pengisian berhenti saat 'time_budget' (detik) atau 'max_steps' habis.
+    Jika kalimat tidak diterima (atau anggaran habis), hasilnya berisi potongan
+    span terbesar yang menutup seluruh input (best-effort).
+
+    Args:
+        sentence (str): Kalimat/paragraf input.
+        model (PCFG): Model probabilistik. Tanpa model terlatih, PCFG(grammar)
+                      (probabilitas seragam per LHS) dipakai sebagai heuristik:
+                      derivasi dengan pilihan aturan lebih sedikit diutamakan.
+                      Buat model sekali lalu pakai ulang untuk banyak kalimat.
+        fuzzy (bool): Pulihkan token tak dikenal (salah ketik/OCR) lewat kata
+                      lexicon terdekat (lihat fill_viterbi_chart()).
+
+    Returns:
+        BeamParseResult
+    """
+    started = time.perf_counter()
+    tokens = model.compiled.tokenizer.tokenize(sentence)
+    is_accepted, chart = fill_viterbi_chart(
+        tokens, model, beam_width=beam_width, time_budget=time_budget, max_steps=max_steps, fuzzy=fuzzy,
+    )
+    if is_accepted:
+        tree = chart.best_tree()
+        logprob = chart.logprob()
+        spans = [CoveringSpan(0, len(tokens) - 1, model.compiled.start_symbol, logprob, tree)]
+    else:
+        tree = None
+        logprob = NEG_INF
+        spans = chart.covering_spans()
+    elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+    return BeamParseResult(sentence, tokens, is_accepted, chart.complete, logprob, tree, spans, elapsed_us)
+
+
+# =======================================================================================
+# PELATIHAN
+# =======================================================================================
+
+def count_tree_rules(tree, model, counts=None):
+    """
+    Menghitung pemakaian setiap aturan di satu pohon parse (nested tuple).
+    Pohon harus memakai aturan grammar model apa adanya (seperti hasil
+    get_parse_tree_structure() untuk grammar yang bukan hasil konversi CNF).
+
+    Raises:
+        ValueError: Jika pohon memakai aturan yang tidak ada di grammar.
+    """
+    if counts is None:
+        counts = [0.0] * len(model.rules)
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node[1], str):
+            rhs = (node[1],)
+        else:
+            rhs = tuple(child[0] for child in node[1:])
+            stack.extend(node[1:])
+        rule_id = model.rule_ids.get((node[0], rhs))
+        if rule_id is None:
+            raise ValueError(f"Aturan {node[0]} -> {' '.join(rhs)} tidak ada di grammar.")
+        counts[rule_id] += 1
+    return counts
+
+
+def train_from_treebank(trees, grammar, smoothing=0.1):
+    """
+    Estimasi probabilitas aturan dari treebank (maximum likelihood dengan
+    add-alpha smoothing): P(A -> rhs) = (jumlah(A -> rhs) + alpha) / (jumlah(A) + alpha * |aturan A|).
+    Smoothing menjaga aturan yang tidak muncul di treebank tetap mungkin dipakai.
+
+    Args:
+        trees (iterable): Pohon parse (nested tuple), misal dari read_treebank().
+        grammar (dict | CompiledGrammar | PCFG): Grammar yang dilatih.
+        smoothing (float): Pseudo-count alpha untuk setiap aturan.
+
+    Returns:
+        PCFG
+    """
+    model = grammar if isinstance(grammar, PCFG) else PCFG(grammar)
+    counts = [0.0] * len(model.rules)
+    for tree in trees:
+        count_tree_rules(tree, model, counts)
+    return PCFG(model.compiled, {
+        model.rules[rule_id]: count + smoothing for rule_id, count in enumerate(counts)
+    })
+
+
+def _inside_outside(model, tokens, counts):
+    """
+    Satu langkah E (expectation) untuk satu kalimat: menambahkan ekspektasi
+    pemakaian setiap aturan ke 'counts'. Mengembalikan probabilitas kalimat
+    (0.0 jika kalimat tidak dapat diturunkan atau underflow).
+    """
+    compiled = model.compiled
+    n = len(tokens)
+    nsym = len(compiled.symbols)
+    if n == 0:
+        return 0.0
+    start = compiled.symbol_ids[compiled.start_symbol]
+    binary_by_left = model.binary_by_left
+    unit_order = model.unit_order
+
+    # --- INSIDE: inside[(i, j)][A] = P(A =>* tokens[i .. j]) ---
+    inside = {}
+    live = {}
+    for length in range(1, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cell = [0.0] * nsym
+            if length == 1:
+                for a, p, _, _ in model.terminal_rules.get(tokens[i], ()):
+                    cell[a] += p
+            else:
+                for k in range(i, j):
+                    left, right = inside[(i, k)], inside[(k + 1, j)]
+                    for b in live[(i, k)]:
+                        for c, a, p, _, _ in binary_by_left[b]:
+                            if right[c]:
+                                cell[a] += p * left[b] * right[c]
+            for a, units in unit_order:
+                for b, p, _, _ in units:
+                    cell[a] += p * cell[b]
+            inside[(i, j)] = cell
+            live[(i, j)] = [a for a in range(nsym) if cell[a]]
+
+    total = inside[(0, n - 1)][start]
+    if total <= 0.0:
+        return 0.0
+
+    # --- OUTSIDE (span panjang ke pendek) + ekspektasi pemakaian aturan ---
+    outside = {(i, j): [0.0] * nsym for (i, j) in inside}
+    outside[(0, n - 1)][start] = 1.0
+    for length in range(n, 0, -1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            out = outside[(i, j)]
+            cell = inside[(i, j)]
+            # Aturan unit: induk sebelum anak (kebalikan urutan topologis)
+            for a, units in reversed(unit_order):
+                if out[a]:
+                    for b, p, _, rule_id in units:
+                        if cell[b]:
+                            out[b] += p * out[a]
+                            counts[rule_id] += p * out[a] * cell[b] / total
+            if length == 1:
+                for a, p, _, rule_id in model.terminal_rules.get(tokens[i], ()):
+                    if out[a]:
+                        counts[rule_id] += p * out[a] / total
+                continue
+            for k in range(i, j):
+                left, right = inside[(i, k)], inside[(k + 1, j)]
+                left_out, right_out = outside[(i, k)], outside[(k + 1, j)]
+                for b in live[(i, k)]:
+                    for c, a, p, _, rule_id in binary_by_left[b]:
+                        if right[c] and out[a]:
+                            weight = p * out[a]
+                            left_out[b] += weight * right[c]
+                            right_out[c] += weight * left[b]
+                            counts[rule_id] += weight * left[b] * right[c] / total
+    return total
+
+
+def train_inside_outside(sentences, grammar, iterations=10, smoothing=0.01, tolerance=1e-4):
+    """
+    Estimasi probabilitas aturan tanpa treebank dengan algoritma inside-outside
+    (EM): setiap iterasi menghitung ekspektasi pemakaian aturan atas semua
+    derivasi kalimat valid, lalu menormalisasinya per LHS.
+
+    Perhitungan inside/outside memakai probabilitas biasa (bukan log), cukup
+    untuk kalimat sepanjang data latih; kalimat yang tidak bisa diturunkan
+    (atau underflow) dilewati.
+
+    Args:
+        sentences (iterable): Kalimat latih (misal isi dataset_positif.txt).
+        grammar (dict | CompiledGrammar | PCFG): Grammar awal; PCFG dipakai
+            sebagai titik awal, selain itu dimulai dari distribusi seragam.
+        iterations (int): Jumlah iterasi EM maksimum.
+        smoothing (float): Pseudo-count per aturan saat normalisasi.
+        tolerance (float): Berhenti jika kenaikan log-likelihood lebih kecil dari ini.
+
+    Returns:
+        (PCFG, list): Model terlatih dan log-likelihood korpus per iterasi.
+    """
+    model = grammar if isinstance(grammar, PCFG) else PCFG(grammar)
+    tokenize = model.compiled.tokenizer.tokenize
+    corpus = [tokenize(sentence) for sentence in sentences]
+
+    history = []
+    for _ in range(iterations):
+        counts = [0.0] * len(model.rules)
+        log_likelihood = 0.0
+        for tokens in corpus:
+            total = _inside_outside(model, tokens, counts)
+            if total > 0.0:
+                log_likelihood += math.log(total)
+        history.append(log_likelihood)
+        model = PCFG(model.compiled, {
+            model.rules[rule_id]: count + smoothing for rule_id, count in enumerate(counts)
+        })
+        if len(history) > 1 and history[-1] - history[-2] < tolerance:
+            break
+    return model, history
+
+
+# =======================================================================================
+# TREEBANK (format kurung, satu pohon per baris)
+# =======================================================================================
+
+def format_bracketed(tree):
+    """Pohon nested tuple -> string berkurung, misal '(K (P jegeg) (S tiang))'."""
+    parts = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+            continue
+        if isinstance(node[1], str):
+            parts.append(f"({node[0]} {node[1]})")
+            continue
+        parts.append(f"({node[0]} ")
+        stack.append(")")
+        for position, child in enumerate(reversed(node[1:])):
+            if position:
+                stack.append(" ")
+            stack.append(child)
+    return "".join(parts)
+
+
+def parse_bracketed(text):
+    """
+    String berkurung -> pohon nested tuple (kebalikan format_bracketed()).
+
+    Raises:
+        ValueError: Jika kurung tidak seimbang atau node tidak punya label.
+    """
+    tokens = text.replace("(", " ( ").replace(")", " ) ").split()
+    stack = []
+    tree = None
+    for position, token in enumerate(tokens):
+        if token == "(":
+            if tree is not None or position + 1 >= len(tokens) or tokens[position + 1] in "()":
+                raise ValueError(f"Pohon berkurung tidak valid: {text.strip()}")
+            stack.append([])
+        elif token == ")":
+            if not stack or len(stack[-1]) < 2:
+                raise ValueError(f"Pohon berkurung tidak valid: {text.strip()}")
+            node = tuple(stack.pop())
+            if stack:
+                stack[-1].append(node)
+            else:
+                tree = node
+        elif stack:
+            stack[-1].append(token)
+        else:
+            raise ValueError(f"Pohon berkurung tidak valid: {text.strip()}")
+    if stack or tree is None:
+        raise ValueError(f"Pohon berkurung tidak valid: {text.strip()}")
+    return tree
+
+
+def read_treebank(path):
+    """Membaca treebank: satu pohon berkurung per baris, '#' untuk komentar."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                yield parse_bracketed(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{line_no}: {exc}") from None
+
+
+# ==========================================
+# BLOK UTAMA (MAIN) UNTUK PENGUJIAN LANGSUNG
+# ==========================================
+if __name__ == "__main__":
+    from cyk_parser import get_bali_grammar, cyk_parse, get_parse_tree_structure
+
+    my_grammar = compile_grammar(get_bali_grammar())
+    with open('dataset_positif.txt', 'r') as f:
+        data_positif = [line.strip() for line in f if line.strip()]
+
+    model, history = train_inside_outside(data_positif, my_grammar, iterations=20)
+    print("Log-likelihood per iterasi:", " -> ".join(f"{ll:.2f}" for ll in history))
+
+    changed = 0
+    for kalimat in data_positif:
+        is_accepted, chart, tokens = viterbi_parse(kalimat, model)
+        greedy = get_parse_tree_structure(my_grammar, cyk_parse(kalimat, my_grammar)[1], tokens)
+        if chart.best_tree() != greedy:
+            changed += 1
+            print(f"\n{kalimat}  (log P = {chart.logprob():.3f})")
+            print(f"  Viterbi : {format_bracketed(chart.best_tree())}")
+            print(f"  Greedy  : {format_bracketed(greedy)}")
+    print(f"\n{changed} dari {len(data_positif)} kalimat mendapat pohon berbeda dari 'Greedy Left'.")
+
+    # Mode beam + anggaran waktu: seluruh korpus digabung menjadi satu input panjang
+    paragraf = " ".join(data_positif[:20])
+    result = beam_parse(paragraf, model, beam_width=8, time_budget=0.05)
+    print(f"\nBeam parse {len(result.tokens)} token: selesai={result.complete}, "
+          f"{len(result.spans)} potongan, {result.elapsed_us / 1000:.1f} ms")
+    for span in result.spans:
+        print(f"  [{span.start}..{span.end}] {span.symbol}")
+
+    # Anggaran waktu berlaku untuk seluruh beam_parse, termasuk alokasi chart dan
+    # potongan span, juga pada input yang jauh lebih panjang
+    paragraf = " ".join(data_positif * 3)
+    for anggaran in (0.02, 0.05):
+        started = time.perf_counter()
+        result = beam_parse(paragraf, model, beam_width=8, time_budget=anggaran)
+        elapsed = time.perf_counter() - started
+        print(f"Beam parse {len(result.tokens)} token, anggaran {anggaran * 1000:.0f} ms: "
+              f"{elapsed * 1000:.1f} ms, {len(result.spans)} potongan")
+        assert elapsed < anggaran * 3, (anggaran, elapsed)